@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+
+"""
+Fake uptime kuma server for kumaone benchmarks
+
+Implements the socketIO events and the status page API that kumaone uses, keeps all objects in memory and
+answers after a configurable artificial latency. The server runs in a background thread of the calling process.
+"""
+
+# Import builtin python libraries
+import hashlib
+import itertools
+import json
+from socketserver import ThreadingMixIn
+import threading
+import time
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+# Import external python libraries
+import socketio
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class _ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class FakeKumaServer:
+    """
+    In-memory uptime kuma server. Like uptime kuma, it sends the changed list to the client before answering
+    a change. kumaone waits for that list after a change, so it is sent after every change.
+    """
+
+    def __init__(self, latency=0.0, token="benchmark-token"):
+        self.latency = latency
+        self.token = token
+        self.monitors = {}
+        self.notifications = {}
+        self.status_pages = {}
+        self.changes = 0
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        # The wsgiref server can't upgrade to websockets, clients stay on long-polling.
+        self.sio = socketio.Server(async_mode="threading", allow_upgrades=False, logger=False, engineio_logger=False)
+        self.app = socketio.WSGIApp(self.sio, wsgi_app=self._http_app)
+        self.server = None
+        self.thread = None
+        self._register_events()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def start(self):
+        """
+        Starts serving on a free local port
+
+        :return: (str) Server URL
+        """
+
+        self.server = make_server(
+            "127.0.0.1", 0, self.app, server_class=_ThreadingWSGIServer, handler_class=_QuietRequestHandler
+        )
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.url
+
+    def stop(self):
+        """
+        Stops serving
+
+        :return: None
+        """
+
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _get_monitor_list(self):
+        return {str(monitor_id): monitor for monitor_id, monitor in self.monitors.items()}
+
+    def _get_notification_list(self):
+        return list(self.notifications.values())
+
+    def _get_status_page_list(self):
+        return {str(status_page["id"]): status_page for status_page in self.status_pages.values()}
+
+    def _send_lists(self, sid=None):
+        self.sio.emit("monitorList", self._get_monitor_list(), to=sid)
+        self.sio.emit("notificationList", self._get_notification_list(), to=sid)
+        self.sio.emit("statusPageList", self._get_status_page_list(), to=sid)
+
+    def _changed(self, sid=None, event=None, get_data=None):
+        # Called with the lock held, so the list is sent before the answer of the change.
+        self.changes += 1
+        self.sio.emit(event, get_data(), to=sid)
+
+    def _login(self, sid=None):
+        self._send_lists(sid=sid)
+
+    def _register_events(self):
+        sio = self.sio
+
+        @sio.on("login")
+        def login(sid, data):
+            self._wait()
+            self._login(sid=sid)
+            return {"ok": True, "token": self.token}
+
+        @sio.on("loginByToken")
+        def login_by_token(sid, token):
+            self._wait()
+            if token != self.token:
+                return {"ok": False, "msg": "Invalid token."}
+            self._login(sid=sid)
+            return {"ok": True}
+
+        @sio.on("add")
+        def add(sid, data):
+            self._wait()
+            with self.lock:
+                monitor_id = next(self.ids)
+                self.monitors[monitor_id] = {**data, "id": monitor_id, "active": True}
+                self._changed(sid=sid, event="monitorList", get_data=self._get_monitor_list)
+            return {"ok": True, "msg": "Added Successfully.", "monitorID": monitor_id}
+
+        @sio.on("editMonitor")
+        def edit_monitor(sid, data):
+            self._wait()
+            with self.lock:
+                if data.get("id") not in self.monitors:
+                    return {"ok": False, "msg": "Monitor not found."}
+                self.monitors[data["id"]] = {**self.monitors[data["id"]], **data}
+                self._changed(sid=sid, event="monitorList", get_data=self._get_monitor_list)
+            return {"ok": True, "msg": "Saved Successfully.", "monitorID": data["id"]}
+
+        @sio.on("deleteMonitor")
+        def delete_monitor(sid, monitor_id):
+            self._wait()
+            with self.lock:
+                if self.monitors.pop(monitor_id, None) is None:
+                    return {"ok": False, "msg": "Monitor not found."}
+                self._changed(sid=sid, event="monitorList", get_data=self._get_monitor_list)
+            return {"ok": True, "msg": "Deleted Successfully."}
+
+        @sio.on("addNotification")
+        def add_notification(sid, notification, notification_id):
+            self._wait()
+            with self.lock:
+                notification_id = notification_id or next(self.ids)
+                self.notifications[notification_id] = {
+                    "id": notification_id,
+                    "name": notification["name"],
+                    "active": True,
+                    "userId": 1,
+                    "isDefault": bool(notification.get("isDefault")),
+                    "config": json.dumps(notification),
+                }
+                self._changed(sid=sid, event="notificationList", get_data=self._get_notification_list)
+            return {"ok": True, "msg": "Saved", "id": notification_id}
+
+        @sio.on("deleteNotification")
+        def delete_notification(sid, notification_id):
+            self._wait()
+            with self.lock:
+                if self.notifications.pop(notification_id, None) is None:
+                    return {"ok": False, "msg": "Notification not found."}
+                self._changed(sid=sid, event="notificationList", get_data=self._get_notification_list)
+            return {"ok": True, "msg": "Deleted"}
+
+        @sio.on("getStatusPage")
+        def get_status_page(sid, slug):
+            self._wait()
+            status_page = self.status_pages.get(slug)
+            if status_page is None:
+                return {"ok": False, "msg": "Status page not found."}
+            return {"ok": True, "config": dict(status_page)}
+
+        @sio.on("addStatusPage")
+        def add_status_page(sid, title, slug):
+            self._wait()
+            with self.lock:
+                if slug in self.status_pages:
+                    return {"ok": False, "msg": "Slug is already taken."}
+                self.status_pages[slug] = {"id": next(self.ids), "slug": slug, "title": title, "publicGroupList": []}
+            return {"ok": True, "msg": "successAdded"}
+
+        @sio.on("saveStatusPage")
+        def save_status_page(sid, slug, config, image_data_url, public_group_list):
+            self._wait()
+            with self.lock:
+                if slug not in self.status_pages:
+                    return {"ok": False, "msg": "Status page not found."}
+                self.status_pages[slug] = {
+                    **self.status_pages[slug],
+                    **config,
+                    "id": self.status_pages[slug]["id"],
+                    "publicGroupList": public_group_list,
+                }
+            return {"ok": True, "publicGroupList": public_group_list}
+
+        @sio.on("deleteStatusPage")
+        def delete_status_page(sid, slug):
+            self._wait()
+            with self.lock:
+                if self.status_pages.pop(slug, None) is None:
+                    return {"ok": False, "msg": "Status page not found."}
+            return {"ok": True}
+
+    def _http_app(self, environ, start_response):
+        self._wait()
+        path = environ.get("PATH_INFO", "")
+        status_page = None
+        if path.startswith("/api/status-page/"):
+            status_page = self.status_pages.get(path[len("/api/status-page/") :])
+        if status_page is None:
+            start_response("404 Not Found", [("Content-Type", "application/json")])
+            return [json.dumps({"ok": False, "msg": "Not found."}).encode()]
+        config = {key: value for key, value in status_page.items() if key != "publicGroupList"}
+        body = {
+            "config": config,
+            "incident": None,
+            "publicGroupList": status_page["publicGroupList"],
+            "maintenanceList": [],
+        }
+        body = json.dumps(body).encode()
+        # Like uptime kuma (express), answer with an ETag and '304 Not Modified' if the client has the same body.
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+        if environ.get("HTTP_IF_NONE_MATCH") == etag:
+            start_response("304 Not Modified", [("ETag", etag)])
+            return [b""]
+        start_response("200 OK", [("Content-Type", "application/json"), ("ETag", etag)])
+        return [body]
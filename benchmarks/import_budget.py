@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+Import budget check for kumaone
+
+Runs light commands in fresh interpreters and fails if they import the networking stack or other heavy
+dependencies, or if importing the CLI takes longer than the budget. Run it from the repository root:
+
+    python benchmarks/import_budget.py --budget 200
+"""
+
+# Import builtin python libraries
+import argparse
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+repository_root = Path(__file__).resolve().parent.parent
+
+# Modules that must only be imported when a command needs them
+heavy_modules = ["socketio", "engineio", "aiohttp", "requests", "validators", "yaml", "numpy", "pyarrow"]
+
+# Scenario name, CLI arguments, extra environment and heavy modules that are allowed
+scenarios = [
+    ("version", ["--version"], {}, []),
+    ("info", ["info"], {}, ["yaml"]),
+    ("help", ["--help"], {}, []),
+    ("monitor help", ["monitor", "--help"], {}, []),
+    (
+        "complete commands",
+        [],
+        {"_KUMAONE_COMPLETE": "complete_bash", "COMP_WORDS": "kumaone ", "COMP_CWORD": "1"},
+        [],
+    ),
+    (
+        "complete monitor options",
+        [],
+        {"_KUMAONE_COMPLETE": "complete_bash", "COMP_WORDS": "kumaone monitor add --", "COMP_CWORD": "3"},
+        [],
+    ),
+]
+
+driver = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from src.kumaone.main import app
+import_time = time.perf_counter() - start
+try:
+    app(args=sys.argv[2:], prog_name="kumaone")
+except SystemExit:
+    pass
+with open(sys.argv[1], "w") as report:
+    json.dump({"import_ms": import_time * 1000, "modules": sorted(sys.modules)}, report)
+"""
+
+
+def _run_scenario(arguments=None, environment=None):
+    """
+    Runs kumaone in a fresh interpreter
+
+    :param arguments: (list) CLI arguments.
+    :param environment: (dict) Extra environment variables.
+    :return: (dict) CLI import time in milliseconds and imported modules
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_directory:
+        report_file = Path(tmp_directory).joinpath("report.json")
+        subprocess.run(
+            [sys.executable, "-c", driver, str(report_file), *arguments],
+            cwd=repository_root,
+            env={**os.environ, **environment},
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        with open(report_file, "r") as report:
+            return json.load(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import time budget of kumaone CLI commands.")
+    parser.add_argument("--budget", type=float, default=200, help="Maximum CLI import time in milliseconds.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per scenario, the fastest one is used.")
+    args = parser.parse_args()
+
+    failures = []
+    for name, arguments, environment, allowed_modules in scenarios:
+        reports = [_run_scenario(arguments=arguments, environment=environment) for _ in range(args.repeat)]
+        import_ms = min(report["import_ms"] for report in reports)
+        imported_modules = {module.split(".")[0] for module in reports[0]["modules"]}
+        unexpected_modules = [
+            module for module in heavy_modules if module in imported_modules and module not in allowed_modules
+        ]
+        print(f"{name:<26} {import_ms:8.1f} ms  {', '.join(unexpected_modules) or 'ok'}")
+        if unexpected_modules:
+            failures.append(f"'{name}' imported {', '.join(unexpected_modules)}")
+        if import_ms > args.budget:
+            failures.append(f"'{name}' took {import_ms:.1f} ms to import the CLI, budget is {args.budget:g} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
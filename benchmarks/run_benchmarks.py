@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+
+"""
+Benchmarks for kumaone
+
+Runs 'add_monitor', 'add_status_page', 'add_notification' and 'delete_monitor' against an in-process fake
+uptime kuma server and measures their throughput and the latency of every socketIO call. Results are written as
+json and can be compared with an earlier run. Run it from the repository root:
+
+    python benchmarks/run_benchmarks.py --sizes 100 1000 --latency 2
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/baseline.json
+"""
+
+# Import builtin python libraries
+import argparse
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+import json
+import os
+from pathlib import Path
+import platform
+import sys
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+# Import external python libraries
+import yaml
+
+repository_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(repository_root))
+
+# Import custom (local) python packages
+from fake_kuma import FakeKumaServer  # noqa: E402
+from src.kumaone.__about__ import __version__ as kumaone_version  # noqa: E402
+from src.kumaone import connection, settings  # noqa: E402
+from src.kumaone.operations import operations  # noqa: E402
+from src.kumaone.registry import rebuild_monitor_registry  # noqa: E402
+from src.kumaone.utils import log_manager  # noqa: E402
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+benchmark_names = ["add_monitor", "add_status_page", "add_notification", "delete_monitor"]
+monitors_per_group = 50
+monitors_per_file = 500
+monitors_per_status_page = 5
+
+
+class _CallTimer:
+    """
+    Measures the time between sending a socketIO call and receiving its answer. 'call' sends through 'emit',
+    so wrapping 'emit' covers both.
+    """
+
+    def __init__(self, client=None):
+        self.client = client
+        self.latencies = []
+        self.lock = threading.Lock()
+
+    def _record(self, started_at):
+        with self.lock:
+            self.latencies.append(time.perf_counter() - started_at)
+
+    def install(self):
+        emit = self.client.emit
+
+        def _timed_emit(event, *args, callback=None, **kwargs):
+            if callback is None:
+                return emit(event, *args, **kwargs)
+            started_at = time.perf_counter()
+
+            def _timed_callback(*callback_args):
+                self._record(started_at)
+                return callback(*callback_args)
+
+            return emit(event, *args, callback=_timed_callback, **kwargs)
+
+        self.client.emit = _timed_emit
+
+    def uninstall(self):
+        del self.client.emit
+
+    def reset(self):
+        with self.lock:
+            self.latencies = []
+
+
+def _get_percentile(values=None, percentile=None):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(percentile / 100 * (len(values) - 1))))]
+
+
+def _write_data_files(data_directory=None, size=None):
+    """
+    Writes monitor, status page and notification data files with 'size' objects each
+
+    :param data_directory: (Path) Output directory.
+    :param size: (int) Number of objects of every kind.
+    :return: (dict) Data path by benchmark name
+    """
+
+    monitor_directory = data_directory.joinpath("monitors")
+    status_page_directory = data_directory.joinpath("status_pages")
+    monitor_directory.mkdir()
+    status_page_directory.mkdir()
+    monitor_names = [f"bench-monitor-{index}" for index in range(size)]
+    for file_index, file_start in enumerate(range(0, size, monitors_per_file)):
+        monitors = {}
+        for index in range(file_start, min(file_start + monitors_per_file, size)):
+            group = f"bench-group-{index // monitors_per_group}"
+            monitors.setdefault(group, []).append(
+                {"name": monitor_names[index], "type": "http", "url": f"https://{index}.bench.example.com"}
+            )
+        with open(monitor_directory.joinpath(f"monitors-{file_index}.yaml"), "w") as data_file:
+            yaml.safe_dump({"monitors": monitors}, data_file)
+    status_pages = [
+        {
+            "title": f"Bench status {index}",
+            "slug": f"bench-status-{index}",
+            "description": "Benchmark status page.",
+            "publicGroupList": [
+                {
+                    "name": "Services",
+                    "weight": 1,
+                    "monitorList": [
+                        monitor_names[(index * monitors_per_status_page + offset) % size]
+                        for offset in range(monitors_per_status_page)
+                    ],
+                }
+            ],
+        }
+        for index in range(size)
+    ]
+    with open(status_page_directory.joinpath("status_pages.yaml"), "w") as data_file:
+        yaml.safe_dump({"status_pages": status_pages}, data_file)
+    notifications = [
+        {
+            "webhook": {
+                "name": f"Bench notification {index}",
+                "type": "webhook",
+                "isDefault": False,
+                "applyExisting": False,
+                "webhookURL": f"https://{index}.hooks.example.com",
+                "webhookContentType": "application/json",
+            }
+        }
+        for index in range(size)
+    ]
+    notification_file = data_directory.joinpath("notifications.yaml")
+    with open(notification_file, "w") as data_file:
+        yaml.safe_dump({"notifications": notifications}, data_file)
+    return {
+        "add_monitor": monitor_directory,
+        "delete_monitor": monitor_directory,
+        "add_status_page": status_page_directory,
+        "add_notification": notification_file,
+    }
+
+
+def _reset_client_state():
+    # Every size runs against a new server, nothing of the previous server may be reused.
+    for event in settings.event_data:
+        settings.event_data[event] = None
+    rebuild_monitor_registry({})
+
+
+def _run_benchmark(name=None, data_path=None, url=None, window=None, logger=None):
+    if name == "add_monitor":
+        operations["monitor.add"](logger=logger, data_path=str(data_path), window=window, use_cache=False)
+    elif name == "delete_monitor":
+        operations["monitor.delete"](logger=logger, data_path=str(data_path))
+    elif name == "add_status_page":
+        operations["status_page.add"](logger=logger, data_path=str(data_path), url=url, save=True)
+    elif name == "add_notification":
+        operations["notification.add"](logger=logger, data_path=str(data_path))
+
+
+def run_benchmarks(sizes=None, names=None, latency=0.0, window=1):
+    """
+    Runs the benchmarks
+
+    :param sizes: (list) Numbers of objects.
+    :param names: (list) Benchmark names, in 'benchmark_names' order.
+    :param latency: (float) Artificial server latency in seconds.
+    :param window: (int) Number of monitor creations in flight.
+    :return: (list) Benchmark results
+    """
+
+    logger = log_manager(log_level="NOTSET")
+    timer = _CallTimer(client=connection.sio)
+    results = []
+    for size in sizes:
+        server = FakeKumaServer(latency=latency)
+        url = server.start()
+        config_data = SimpleNamespace(url=url, user="bench", password="bench")
+        with tempfile.TemporaryDirectory() as tmp_directory, open(os.devnull, "w") as devnull:
+            data_paths = _write_data_files(data_directory=Path(tmp_directory), size=size)
+            _reset_client_state()
+            with redirect_stdout(devnull):
+                connection.connect_login(config_data=config_data)
+            timer.install()
+            try:
+                for name in names:
+                    timer.reset()
+                    started_at = time.perf_counter()
+                    with redirect_stdout(devnull):
+                        _run_benchmark(name=name, data_path=data_paths[name], url=url, window=window, logger=logger)
+                    seconds = time.perf_counter() - started_at
+                    latencies = [latency_seconds * 1000 for latency_seconds in timer.latencies]
+                    result = {
+                        "benchmark": name,
+                        "size": size,
+                        "seconds": round(seconds, 4),
+                        "throughput": round(size / seconds, 2),
+                        "calls": len(latencies),
+                        "latency_ms": {
+                            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+                            "p50": _get_percentile(latencies, 50),
+                            "p95": _get_percentile(latencies, 95),
+                            "p99": _get_percentile(latencies, 99),
+                        },
+                    }
+                    results.append(result)
+                    print(
+                        f"{name:<18} {size:>7} {seconds:>9.2f} s {result['throughput']:>10.1f}/s "
+                        f"{len(latencies):>7} calls  p50 {result['latency_ms']['p50'] or 0:.2f} ms  "
+                        f"p95 {result['latency_ms']['p95'] or 0:.2f} ms"
+                    )
+            finally:
+                timer.uninstall()
+                with redirect_stdout(devnull):
+                    connection.disconnect()
+                server.stop()
+    return results
+
+
+def compare_results(results=None, baseline_file=None, tolerance=None):
+    """
+    Compares throughput with an earlier run
+
+    :param results: (list) Benchmark results.
+    :param baseline_file: (Path) Results file of an earlier run.
+    :param tolerance: (float) Allowed throughput loss, e.g. 0.1 for 10%.
+    :return: (list) Regressions
+    """
+
+    with open(baseline_file, "r") as baseline:
+        baseline_results = {(item["benchmark"], item["size"]): item for item in json.load(baseline)["results"]}
+    regressions = []
+    print(f"\nCompared with {baseline_file}:")
+    for result in results:
+        baseline_result = baseline_results.get((result["benchmark"], result["size"]))
+        if baseline_result is None:
+            continue
+        change = result["throughput"] / baseline_result["throughput"] - 1
+        print(f"{result['benchmark']:<18} {result['size']:>7} {change:>+8.1%}")
+        if change < -tolerance:
+            regressions.append(f"{result['benchmark']} ({result['size']}) throughput changed by {change:+.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark kumaone against a fake uptime kuma server.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Numbers of objects.")
+    parser.add_argument("--benchmarks", nargs="+", choices=benchmark_names, default=benchmark_names)
+    parser.add_argument("--latency", type=float, default=0, help="Artificial server latency in milliseconds.")
+    parser.add_argument("--window", type=int, default=1, help="Number of monitor creations in flight.")
+    parser.add_argument("--output", type=Path, help="Results file. Defaults to 'benchmarks/results/<time>.json'.")
+    parser.add_argument("--compare", type=Path, help="Results file of an earlier run to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed throughput loss when comparing.")
+    args = parser.parse_args()
+
+    # Tokens and caches of the benchmark client must not touch the user's files.
+    with tempfile.TemporaryDirectory() as cache_directory:
+        settings.token_cache_file = Path(cache_directory).joinpath("tokens.json")
+        settings.state_cache_file = Path(cache_directory).joinpath("state.db")
+        settings.apply_cache_file = Path(cache_directory).joinpath("apply-cache.json")
+        settings.http_cache_file = Path(cache_directory).joinpath("http-cache.db")
+        settings.agent_socket_file = Path(cache_directory).joinpath("agent.sock")
+        results = run_benchmarks(
+            sizes=args.sizes,
+            names=[name for name in benchmark_names if name in args.benchmarks],
+            latency=args.latency / 1000,
+            window=args.window,
+        )
+
+    started_at = datetime.now(timezone.utc)
+    output = args.output or repository_root.joinpath(f"benchmarks/results/{started_at:%Y%m%dT%H%M%SZ}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as results_file:
+        json.dump(
+            {
+                "kumaone": kumaone_version,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "created_at": started_at.isoformat(),
+                "options": {
+                    "latency_ms": args.latency,
+                    "window": args.window,
+                },
+                "results": results,
+            },
+            results_file,
+            indent=4,
+        )
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare_results(results=results, baseline_file=args.compare, tolerance=args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
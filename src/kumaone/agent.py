@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+
+"""Agent module for kumaone"""
+
+# Import builtin python libraries
+from contextlib import redirect_stderr, redirect_stdout
+import json
+import os
+from pathlib import Path
+import socket
+import socketserver
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+# Import external python libraries
+from rich.console import Console
+
+# Import custom (local) python packages
+from . import ioevents
+from .registry import rebuild_monitor_registry
+from . import settings
+from .state_cache import cached_events, load_cached_event_data
+from .utils import log_manager
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+
+class _TextWriter:
+    """
+    Minimal text wrapper around the binary socket writer.
+    """
+
+    def __init__(self, binary_file=None):
+        self.binary_file = binary_file
+
+    def write(self, text):
+        self.binary_file.write(text.encode())
+
+    def flush(self):
+        self.binary_file.flush()
+
+
+class _AgentOutput:
+    """
+    File like object that streams operation output back to the agent client.
+    """
+
+    def __init__(self, connection_file=None, isatty=False):
+        self.connection_file = connection_file
+        self._isatty = isatty
+
+    def write(self, text):
+        if text:
+            self.connection_file.write(json.dumps({"output": text}) + "\n")
+            self.connection_file.flush()
+        return len(text)
+
+    def flush(self):
+        self.connection_file.flush()
+
+    def isatty(self):
+        return self._isatty
+
+
+class _AgentRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Handles a single forwarded operation. Requests are served one at a time over the shared connection.
+    """
+
+    def handle(self):
+        from .operations import operations
+
+        request = json.loads(self.rfile.readline())
+        connection_file = _TextWriter(self.wfile)
+        response = {"exit_code": 0}
+        if request["operation"] == "agent.status":
+            response["status"] = {
+                "url": self.server.config_data.url,
+                "user": self.server.config_data.user,
+                "pid": os.getpid(),
+                "uptime": round(time.time() - self.server.started_at),
+            }
+        elif request["operation"] == "agent.stop":
+            self.server.stop_requested = True
+        elif (request.get("url"), request.get("user")) != (self.server.config_data.url, self.server.config_data.user):
+            response = {"exit_code": None, "error": "Agent is connected to a different uptime kuma server."}
+        elif request["operation"] not in operations:
+            response = {"exit_code": 1, "error": f"Unknown operation '{request['operation']}'."}
+        else:
+            output = _AgentOutput(connection_file=connection_file, isatty=request.get("isatty", False))
+            with redirect_stdout(output), redirect_stderr(output):
+                try:
+                    logger = log_manager(log_level=request.get("log_level"))
+                    operations[request["operation"]](logger=logger, **request.get("kwargs", {}))
+                except SystemExit as err:
+                    response["exit_code"] = err.code if isinstance(err.code, int) else 1
+                except Exception as err:
+                    console.print(f":x:  Error: {err}", style="logging.level.error")
+                    response["exit_code"] = 1
+        connection_file.write(json.dumps(response) + "\n")
+        connection_file.flush()
+
+
+def _send_agent_request(request=None, timeout=None):
+    """
+    Sends a request to a running agent and streams its output to stdout
+
+    :param request: (dict) Agent request.
+    :param timeout: (float) Connection timeout in seconds.
+    :return: (dict) Agent response or None if no agent is running
+    """
+
+    try:
+        agent_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        agent_socket.settimeout(timeout)
+        agent_socket.connect(str(settings.agent_socket_file))
+    except (AttributeError, OSError):
+        return None
+    agent_socket.settimeout(None)
+    with agent_socket, agent_socket.makefile("rw") as agent_file:
+        agent_file.write(json.dumps(request) + "\n")
+        agent_file.flush()
+        for line in agent_file:
+            message = json.loads(line)
+            if "output" in message:
+                sys.stdout.write(message["output"])
+                sys.stdout.flush()
+            else:
+                return message
+    return None
+
+
+def _forward_to_agent(operation=None, config_data=None, log_level=None, **kwargs):
+    """
+    Forwards an operation to a running agent
+
+    :param operation: (str) Operation name.
+    :param config_data: (dict) Uptime kuma server configs
+    :param log_level: (str) Log level
+    :return: (int) Exit code of the operation or None if the operation was not handled by an agent
+    """
+
+    request = {
+        "operation": operation,
+        "url": config_data.url,
+        "user": config_data.user,
+        "log_level": log_level,
+        "isatty": sys.stdout.isatty(),
+        "kwargs": kwargs,
+    }
+    response = _send_agent_request(request=request, timeout=settings.agent_connect_timeout)
+    if response is None or response.get("exit_code") is None:
+        return None
+    if response.get("error"):
+        console.print(f":x:  Agent error: {response['error']}", style="logging.level.error")
+    return response["exit_code"]
+
+
+def _load_cached_state(config_data=None):
+    """
+    Loads the last cached monitor, status page and notification lists of a server instead of connecting to it
+
+    :param config_data: (dict) Uptime kuma server configs
+    :return: None
+    """
+
+    from .event_handlers import _set_event_data
+
+    server_key = f"{config_data.user}@{config_data.url}"
+    cached_event_data = load_cached_event_data(server_key=server_key)
+    if any(event not in cached_event_data for event in cached_events):
+        console.print(
+            f":x:  No cached data for {config_data.url}. Run the command once without '--cached'.",
+            style="logging.level.error",
+        )
+        sys.exit(1)
+    for event, (data, _) in cached_event_data.items():
+        if event == ioevents.monitor_list:
+            rebuild_monitor_registry(data)
+        _set_event_data(event, data)
+    updated_at = datetime.fromtimestamp(min(updated_at for _, updated_at in cached_event_data.values()))
+    console.print(
+        f":floppy_disk: Using cached data of {config_data.url} from {updated_at:%Y-%m-%d %H:%M:%S}.",
+        style="logging.level.info",
+    )
+
+
+def run_operation(operation=None, config_data=None, log_level=None, logger=None, cached=False, **kwargs):
+    """
+    Runs an operation on a running kumaone agent if possible, otherwise on a new server connection
+
+    :param operation: (str) Operation name, one of 'operations.operations'.
+    :param config_data: (dict) Uptime kuma server configs
+    :param log_level: (str) Log level
+    :param logger: (object) Logger object
+    :param cached: (bool) Run a read-only operation on the local state cache, without connecting.
+    :return: None
+    """
+
+    # Operations and the connection pull in the networking stack, they are only imported once a command runs.
+    from .operations import operations
+
+    if cached:
+        _load_cached_state(config_data=config_data)
+        operations[operation](logger=logger, **kwargs)
+        return
+    from .connection import connect_login, disconnect
+    from .recorder import record_file_env, replay_file_env
+
+    # Recorded and replayed runs have to use their own connection.
+    recorded_run = os.environ.get(record_file_env) or os.environ.get(replay_file_env)
+    if settings.agent_socket_file.exists() and not recorded_run:
+        exit_code = _forward_to_agent(operation=operation, config_data=config_data, log_level=log_level, **kwargs)
+        if exit_code is not None:
+            if exit_code:
+                sys.exit(exit_code)
+            return
+    connect_login(config_data=config_data)
+    operations[operation](logger=logger, **kwargs)
+    disconnect()
+
+
+def serve_agent(config_data=None, logger=None):
+    """
+    Runs the agent in the foreground. Holds one logged-in connection and serves forwarded operations on a unix socket.
+
+    :param config_data: (dict) Uptime kuma server configs
+    :param logger: (object) Logger object
+    :return: None
+    """
+
+    from . import connection
+    from .connection import connect_login, disconnect
+
+    agent_socket_file = Path(settings.agent_socket_file)
+    if _send_agent_request(request={"operation": "agent.status"}, timeout=settings.agent_connect_timeout):
+        console.print(f":robot: kumaone agent is already running.", style="logging.level.info")
+        sys.exit(1)
+    agent_socket_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    agent_socket_file.unlink(missing_ok=True)
+
+    connect_login(config_data=config_data)
+
+    def _relogin():
+        # Uptime kuma requires a login for every new socket connection, e.g. after a reconnect.
+        if not connection._login_by_token(config_data=config_data):
+            connection.sio.call("login", data={"username": config_data.user, "password": config_data.password})
+
+    connection.sio.on("connect", lambda: connection.sio.start_background_task(_relogin))
+
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(str(agent_socket_file), _AgentRequestHandler)
+    finally:
+        os.umask(old_umask)
+    server.config_data = config_data
+    server.started_at = time.time()
+    server.stop_requested = False
+    console.print(f":robot: kumaone agent is listening on {agent_socket_file}", style="logging.level.info")
+    logger.info(f"Agent pid: {os.getpid()}")
+    try:
+        while not server.stop_requested:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        agent_socket_file.unlink(missing_ok=True)
+        disconnect()
+
+
+def start_agent(config_file=None, log_level=None):
+    """
+    Starts the agent as a background process
+
+    :param config_file: (Path) Uptime kuma configuration file path.
+    :param log_level: (str) Log level
+    :return: None
+    """
+
+    if _send_agent_request(request={"operation": "agent.status"}, timeout=settings.agent_connect_timeout):
+        console.print(f":robot: kumaone agent is already running.", style="logging.level.info")
+        return
+    agent_log_file = Path(settings.agent_socket_file).with_suffix(".log")
+    agent_log_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    command = [sys.executable, "-m", "src.kumaone.main", "agent", "run", "--log-level", log_level]
+    if config_file:
+        command += ["--config", str(config_file)]
+    with open(agent_log_file, "a") as agent_log:
+        subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=agent_log, stderr=agent_log, start_new_session=True)
+    timestamp = time.time()
+    while time.time() - timestamp < settings.event_timeout:
+        status = _send_agent_request(request={"operation": "agent.status"}, timeout=settings.agent_connect_timeout)
+        if status:
+            console.print(f":robot: kumaone agent started. (pid: {status['status']['pid']})", style="green")
+            return
+        time.sleep(0.1)
+    console.print(f":x:  kumaone agent didn't start. Please check {agent_log_file}", style="logging.level.error")
+    sys.exit(1)
+
+
+def stop_agent():
+    """
+    Stops a running agent
+
+    :return: None
+    """
+
+    if _send_agent_request(request={"operation": "agent.stop"}, timeout=settings.agent_connect_timeout):
+        console.print(f":firecracker: kumaone agent stopped.", style="logging.level.info")
+    else:
+        console.print(f":lollipop: kumaone agent is not running.", style="logging.level.info")
+
+
+def agent_status():
+    """
+    Shows status of the agent
+
+    :return: None
+    """
+
+    response = _send_agent_request(request={"operation": "agent.status"}, timeout=settings.agent_connect_timeout)
+    if response:
+        status = response["status"]
+        console.print(
+            f":robot: kumaone agent is running. (pid: {status['pid']}, server: {status['url']}, "
+            f"user: {status['user']}, uptime: {status['uptime']}s)",
+            style="green",
+        )
+    else:
+        console.print(f":lollipop: kumaone agent is not running.", style="logging.level.info")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+"""Apply module for kumaone"""
+
+# Import builtin python libraries
+import sys
+
+# Import external python libraries
+from rich.console import Console
+from rich.table import Table
+
+# Import custom (local) python packages
+from .event_handlers import get_event_data
+from . import ioevents
+from .payload_handler import _get_monitor_payload
+from .registry import forget_monitor, get_monitor_by_name, get_monitor_depth, register_monitor
+from .settings import get_missing_arguments
+from .snapshots import thaw
+from .utils import _read_data_file, _sio_call, _sio_call_pipelined
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+
+def _normalize_field(key=None, value=None):
+    """
+    Normalizes a monitor field, so that yaml input and server data can be compared
+
+    :param key: (str) Monitor field name.
+    :param value: (any) Monitor field value.
+    :return: (any) Normalized value
+    """
+
+    if key == "notificationIDList":
+        return sorted(str(notification_id) for notification_id, enabled in (value or {}).items() if enabled)
+    if value == "" or value == [] or value == {}:
+        return None
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize_field(value=item) for item in value]
+    return value
+
+
+def _get_monitor_changes(payload=None, live_monitor=None):
+    """
+    Compares a monitor payload with the live monitor. Fields the server doesn't report are not compared.
+
+    :param payload: (dict) Desired monitor payload.
+    :param live_monitor: (dict) Monitor data from 'monitorList' event.
+    :return: (dict) Changed fields with (live value, desired value) tuples
+    """
+
+    changes = {}
+    for key, value in payload.items():
+        if key not in live_monitor:
+            continue
+        if _normalize_field(key, value) != _normalize_field(key, live_monitor[key]):
+            changes[key] = (live_monitor[key], value)
+    return changes
+
+
+def _load_desired_monitors(monitor_data_files=None):
+    """
+    Loads desired monitor groups and process monitors from monitor data files
+
+    :param monitor_data_files: (list) Data file path(s)
+    :return: (tuple) Group names and process monitor input data by name
+    """
+
+    groups = []
+    process_monitors = {}
+    for monitor_file in monitor_data_files:
+        monitors = _read_data_file(monitor_file)["monitors"]
+        for group, group_monitors in monitors.items():
+            if group != "default" and group not in groups:
+                groups.append(group)
+            for input_data in group_monitors:
+                if not isinstance(input_data, dict):
+                    console.print(
+                        f":gloves: Monitor process data malformed, please check input.", style="logging.level.error"
+                    )
+                    sys.exit(1)
+                process_monitors[input_data["name"]] = {**input_data, "group": None if group == "default" else group}
+    return groups, process_monitors
+
+
+def _get_monitor_plan(groups=None, process_monitors=None, prune=False):
+    """
+    Computes create/update/delete plan of desired monitors against current 'monitorList'
+
+    :param groups: (list) Desired group names.
+    :param process_monitors: (dict) Desired process monitor input data by name.
+    :param prune: (bool) Delete monitors that are not part of the desired monitors.
+    :return: (dict) Plan with 'create', 'update' and 'delete' lists
+    """
+
+    plan = {"create": [], "update": [], "delete": []}
+    desired = [(group, None, _get_monitor_payload(type="group", name=group)) for group in groups]
+    for name, input_data in process_monitors.items():
+        monitor_data = {key: value for key, value in input_data.items() if key != "group"}
+        payload = _get_monitor_payload(**monitor_data)
+        missing_arguments = get_missing_arguments(payload)
+        if missing_arguments:
+            flat_missing_arguments = ", ".join([f"'{item}'" for item in missing_arguments])
+            console.print(
+                f":nut_and_bolt: Missing arguments for monitor process '{name}'. Missing {flat_missing_arguments} key(s).",
+                style="logging.level.error",
+            )
+            sys.exit(1)
+        desired.append((name, input_data["group"], payload))
+
+    for name, group, payload in desired:
+        live_monitor = get_monitor_by_name(name)
+        if group is not None:
+            live_group = get_monitor_by_name(group)
+            payload["parent"] = live_group["id"] if live_group is not None else None
+        if live_monitor is None:
+            plan["create"].append({"name": name, "group": group, "payload": payload})
+            continue
+        if group is not None and payload["parent"] is None:
+            # Parent group will be created first, so the monitor has to be moved into it.
+            changes = {"parent": (live_monitor.get("parent"), group)}
+            changes.update(_get_monitor_changes({k: v for k, v in payload.items() if k != "parent"}, live_monitor))
+        else:
+            changes = _get_monitor_changes(payload, live_monitor)
+        if changes:
+            plan["update"].append(
+                {"name": name, "group": group, "id": live_monitor["id"], "payload": payload, "changes": changes}
+            )
+
+    if prune:
+        desired_names = {name for name, _, _ in desired}
+        live_monitors = get_event_data(ioevents.monitor_list).values()
+        for live_monitor in live_monitors:
+            if live_monitor["name"] not in desired_names:
+                plan["delete"].append({"name": live_monitor["name"], "id": live_monitor["id"]})
+        # Delete the deepest monitors first, so every group is empty when it's deleted.
+        plan["delete"].sort(key=lambda item: get_monitor_depth(item["id"]), reverse=True)
+    return plan
+
+
+def _show_monitor_plan(plan=None):
+    """
+    Shows monitor plan
+
+    :param plan: (dict) Monitor plan.
+    :return: None
+    """
+
+    table = Table("action", "name", "changes")
+    for item in plan["create"]:
+        table.add_row("[green]create[/green]", item["name"], "")
+    for item in plan["update"]:
+        changes = ", ".join(f"{key}: {old!r} -> {new!r}" for key, (old, new) in item["changes"].items())
+        table.add_row("[yellow]update[/yellow]", item["name"], changes)
+    for item in plan["delete"]:
+        table.add_row("[red]delete[/red]", item["name"], "")
+    if table.rows:
+        console.print(table)
+    console.print(
+        f":clipboard: Plan: {len(plan['create'])} to create, {len(plan['update'])} to update, "
+        f"{len(plan['delete'])} to delete.",
+        style="logging.level.info",
+    )
+
+
+def _resolve_planned_parent(item=None):
+    """
+    Sets the parent of a planned monitor whose group is created in the same run
+
+    :param item: (dict) Create or update item of a monitor plan.
+    :return: (bool) True if the parent is known, False if the group couldn't be created
+    """
+
+    if item["group"] is None or item["payload"]["parent"] is not None:
+        return True
+    group_monitor = get_monitor_by_name(item["group"])
+    if group_monitor is None:
+        console.print(
+            f":red_circle: Error! Monitor group '{item['group']}' couldn't be created, skipped '{item['name']}'.",
+            style="logging.level.error",
+        )
+        return False
+    item["payload"]["parent"] = group_monitor["id"]
+    return True
+
+
+def _apply_monitor_plan(plan=None, window=1):
+    """
+    Executes monitor plan. Groups are created before process monitors.
+
+    :param plan: (dict) Monitor plan.
+    :param window: (int) Maximum number of 'add' calls in flight.
+    :return: (bool) True if every change was applied, False otherwise
+    """
+
+    success = True
+    group_creations = [item for item in plan["create"] if item["payload"]["type"] == "group"]
+    process_monitor_creations = [item for item in plan["create"] if item["payload"]["type"] != "group"]
+    for stage in [group_creations, process_monitor_creations]:
+        # Monitors of a group that couldn't be created are skipped, they would be created at the root otherwise.
+        resolved_stage = [item for item in stage if _resolve_planned_parent(item=item)]
+        if len(resolved_stage) != len(stage):
+            success = False
+        stage = resolved_stage
+        responses = _sio_call_pipelined("add", [item["payload"] for item in stage], window=window)
+        for item, response in zip(stage, responses):
+            if response["ok"]:
+                register_monitor(
+                    monitor_id=response["monitorID"],
+                    name=item["name"],
+                    monitor_type=item["payload"]["type"],
+                    parent=item["payload"]["parent"],
+                )
+                console.print(f":hatching_chick: Monitor '{item['name']}' has been created.", style="logging.level.info")
+            else:
+                success = False
+                console.print(f":red_circle: Error! {response.get('msg')}", style="logging.level.error")
+
+    for item in plan["update"]:
+        if not _resolve_planned_parent(item=item):
+            success = False
+            continue
+        monitor_data = thaw(get_monitor_by_name(item["name"]))
+        monitor_data.update(item["payload"])
+        monitor_data["id"] = item["id"]
+        response = _sio_call("editMonitor", monitor_data)
+        if response["ok"]:
+            console.print(f":pencil: Monitor '{item['name']}' has been updated.", style="logging.level.info")
+        else:
+            success = False
+            console.print(f":red_circle: Error! {response.get('msg')}", style="logging.level.error")
+
+    for item in plan["delete"]:
+        response = _sio_call("deleteMonitor", item["id"])
+        if response["ok"]:
+            forget_monitor(item["id"])
+            console.print(f":ghost: Monitor '{item['name']}' has been deleted.", style="logging.level.info")
+        else:
+            success = False
+            console.print(f":red_circle: Error! {response.get('msg')}", style="logging.level.error")
+    return success
+
+
+def apply_monitors(monitor_data_files=None, logger=None, prune=False, dry_run=False, window=1):
+    """
+    Makes uptime kuma monitors match monitor data files. Only the difference is sent to the server.
+
+    :param monitor_data_files: (list) Data file path(s)
+    :param logger: (object) Logger object
+    :param prune: (bool) Delete monitors that are not part of the monitor data files.
+    :param dry_run: (bool) Only show the plan.
+    :param window: (int) Maximum number of 'add' calls in flight.
+    :return: None
+    """
+
+    groups, process_monitors = _load_desired_monitors(monitor_data_files=monitor_data_files)
+    get_event_data(ioevents.monitor_list)
+    plan = _get_monitor_plan(groups=groups, process_monitors=process_monitors, prune=prune)
+    logger.debug(plan)
+    _show_monitor_plan(plan=plan)
+    if dry_run or not any(plan.values()):
+        return
+    if not _apply_monitor_plan(plan=plan, window=window):
+        sys.exit(1)
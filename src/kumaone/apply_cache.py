@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+"""Apply cache module for kumaone"""
+
+# Import builtin python libraries
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Import external python libraries
+from rich.console import Console
+
+# Import custom (local) python packages
+from . import ioevents
+from . import settings
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+# Successfully applied monitor files of the current server, keyed by file content hash. The signature of the file
+# they were read from tells if another process, like 'monitor clear-cache' next to a running agent, changed it.
+apply_cache = {"server_key": None, "signature": None, "files": {}}
+
+
+def _get_apply_cache_signature():
+    """
+    Get signature of the apply cache file
+
+    :return: (tuple) Modification time and size of the file or None if it doesn't exist
+    """
+
+    try:
+        apply_cache_stat = os.stat(settings.apply_cache_file)
+    except OSError:
+        return None
+    return apply_cache_stat.st_mtime_ns, apply_cache_stat.st_size
+
+
+def _read_apply_cache_file():
+    """
+    Reads the apply cache file
+
+    :return: (dict) Applied files by server key
+    """
+
+    try:
+        with open(settings.apply_cache_file, "r") as apply_cache_file:
+            return json.load(apply_cache_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_apply_cache_file(servers=None):
+    """
+    Writes the apply cache file atomically
+
+    :param servers: (dict) Applied files by server key
+    :return: None
+    """
+
+    apply_cache_file = Path(settings.apply_cache_file)
+    try:
+        apply_cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_apply_cache_file = apply_cache_file.with_suffix(".tmp")
+        with open(tmp_apply_cache_file, "w") as apply_cache_data:
+            json.dump(servers, apply_cache_data)
+        os.replace(tmp_apply_cache_file, apply_cache_file)
+    except OSError as err:
+        console.print(f":orange_circle: Could not update apply cache. Error: {err}", style="logging.level.warning")
+
+
+def _get_payload_fingerprint(payload=None):
+    """
+    Get fingerprint of a monitor payload
+
+    :param payload: (dict) Monitor payload.
+    :return: (str) sha256 hex digest of the payload
+    """
+
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def load_apply_cache():
+    """
+    Loads applied files of the logged-in server. The file is read again when it was changed since it was loaded.
+
+    :return: (dict) Applied files by file content hash
+    """
+
+    signature = _get_apply_cache_signature()
+    if apply_cache["server_key"] != settings.server_key or apply_cache["signature"] != signature:
+        apply_cache["server_key"] = settings.server_key
+        apply_cache["signature"] = signature
+        apply_cache["files"] = _read_apply_cache_file().get(settings.server_key, {})
+    return apply_cache["files"]
+
+
+def get_monitor_fingerprint(monitor=None, fields=None):
+    """
+    Get fingerprint of fields of a live monitor, normalized like 'apply' compares monitors
+
+    :param monitor: (dict) Monitor data from 'monitorList' event.
+    :param fields: (list) Monitor field names.
+    :return: (str) sha256 hex digest of the normalized fields
+    """
+
+    # 'apply' pulls in the socket.io client, the CLI imports this module for 'monitor clear-cache' alone
+    from .apply import _normalize_field
+
+    return _get_payload_fingerprint({field: _normalize_field(field, monitor.get(field)) for field in fields})
+
+
+def get_applied_file(file_hash=None):
+    """
+    Get the cached apply record of a monitor file, if every recorded monitor still exists on the server and wasn't
+    changed there since the file was applied
+
+    :param file_hash: (str) File content hash.
+    :return: (dict) Applied file record or None if the file has to be applied again
+    """
+
+    from .event_handlers import get_event_data
+
+    applied_file = load_apply_cache().get(file_hash)
+    if applied_file is None:
+        return None
+    monitor_list = get_event_data(ioevents.monitor_list)
+    for monitor_name, monitor_record in applied_file["monitors"].items():
+        monitor = monitor_list.get(str(monitor_record["id"]))
+        if monitor is None or monitor["name"] != monitor_name or "fields" not in monitor_record:
+            return None
+        if get_monitor_fingerprint(monitor=monitor, fields=monitor_record["fields"]) != monitor_record["fingerprint"]:
+            return None
+    return applied_file
+
+
+def record_applied_file(file_hash=None, data_file=None, monitors=None):
+    """
+    Records a successfully applied monitor file. Older records of the same file path are replaced.
+
+    :param file_hash: (str) File content hash.
+    :param data_file: (Path) Monitor file path.
+    :param monitors: (dict) Monitor ID, compared fields and their fingerprint by monitor name.
+    :return: None
+    """
+
+    if settings.server_key is None:
+        return
+    applied_files = load_apply_cache()
+    for cached_hash in [key for key, value in applied_files.items() if value["path"] == str(data_file)]:
+        applied_files.pop(cached_hash)
+    applied_files[file_hash] = {"path": str(data_file), "monitors": monitors}
+    servers = _read_apply_cache_file()
+    servers[settings.server_key] = applied_files
+    _write_apply_cache_file(servers=servers)
+    apply_cache["signature"] = _get_apply_cache_signature()
+
+
+def clear_apply_cache(server_key=None):
+    """
+    Removes cached apply records of an uptime kuma server, so that every monitor file is applied again
+
+    :param server_key: (str) 'user@url' of the uptime kuma server.
+    :return: (int) Number of removed records
+    """
+
+    servers = _read_apply_cache_file()
+    removed_records = len(servers.pop(server_key, {}))
+    _write_apply_cache_file(servers=servers)
+    if apply_cache["server_key"] == server_key:
+        apply_cache["server_key"] = None
+    return removed_records
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+"""Asyncio client module for kumaone"""
+
+# Import builtin python libraries
+import asyncio
+import json
+
+# Import external python libraries
+import socketio
+from socketio.exceptions import TimeoutError
+
+# Import custom (local) python packages
+from . import ioevents
+from .payload_handler import _get_monitor_payload, _get_status_page_data_payload
+from .registry import _build_monitor_indexes
+from . import settings
+from .settings import get_missing_arguments
+from .snapshots import freeze
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+list_events = [ioevents.monitor_list, ioevents.notification_list, ioevents.status_page_list]
+push_events = [
+    ioevents.avg_ping,
+    ioevents.cert_info,
+    ioevents.heartbeat,
+    ioevents.heartbeat_list,
+    ioevents.important_heartbeat_list,
+    ioevents.info,
+    ioevents.uptime,
+]
+
+
+class AsyncKumaClient:
+    """
+    Asyncio uptime kuma client built on 'socketio.AsyncClient'. Requires 'aiohttp' (pip install kumaone[async]).
+
+    Usage::
+
+        async with AsyncKumaClient(url, user=user, password=password) as kuma:
+            monitors = await kuma.get_monitors()
+            async for event, data in kuma.events(ioevents.heartbeat):
+                ...
+    """
+
+    def __init__(self, url=None, user=None, password=None, headers=None, timeout=None):
+        self.url = url
+        self.user = user
+        self.password = password
+        self.headers = headers
+        self.timeout = settings.event_timeout if timeout is None else timeout
+        self.sio = socketio.AsyncClient(logger=False, engineio_logger=False)
+        self._event_data = {event: None for event in list_events}
+        self._event_conditions = {}
+        self._subscribers = {}
+        self._monitor_indexes = _build_monitor_indexes()
+        for event in list_events + push_events:
+            self.sio.on(event, self._get_event_handler(event))
+
+    async def __aenter__(self):
+        await self.connect()
+        await self.login()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.disconnect()
+
+    def _get_event_handler(self, event):
+        async def _handler(*args):
+            data = args[0] if len(args) == 1 else args
+            if event in self._event_data:
+                data = freeze(data)
+                if event == ioevents.monitor_list:
+                    self._monitor_indexes = _build_monitor_indexes(data)
+                condition = self._get_event_condition(event)
+                async with condition:
+                    self._event_data[event] = data
+                    condition.notify_all()
+            for queue in self._subscribers.get(event, ()):
+                queue.put_nowait((event, data))
+
+        return _handler
+
+    def _get_event_condition(self, event):
+        if event not in self._event_conditions:
+            self._event_conditions[event] = asyncio.Condition()
+        return self._event_conditions[event]
+
+    async def connect(self):
+        """
+        Connects to uptime kuma server
+
+        :return: None
+        """
+
+        await self.sio.connect(self.url, headers=self.headers or {}, wait_timeout=self.timeout)
+
+    async def login(self):
+        """
+        Logs in to uptime kuma server
+
+        :return: (dict) 'login' event response
+        """
+
+        response = await self.call("login", {"username": self.user, "password": self.password})
+        if not response.get("ok"):
+            raise PermissionError(f"Login failed. {response.get('msg')}")
+        return response
+
+    async def disconnect(self):
+        """
+        Disconnects from uptime kuma server
+
+        :return: None
+        """
+
+        await self.sio.disconnect()
+
+    async def call(self, event=None, data=None):
+        """
+        Calls socketIO event and waits for its response
+
+        :param event: (str) Event name.
+        :param data: (any) Event related data.
+        :return: (any) Event response
+        """
+
+        return await self.sio.call(event, data=data, timeout=self.timeout)
+
+    async def get_event_data(self, event=None):
+        """
+        Get event data, waiting for the first broadcast of the event if necessary
+
+        :param event: (str) SocketIO event name.
+        :return: (any) Read-only snapshot of the event data
+        """
+
+        condition = self._get_event_condition(event)
+        async with condition:
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: self._event_data[event] is not None), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError("Event response timed out.") from None
+        return self._event_data[event]
+
+    async def events(self, *event_names):
+        """
+        Iterates over server push events as they arrive
+
+        :param event_names: (str) SocketIO event names to subscribe to.
+        :return: (tuple) Event name and event data
+        """
+
+        queue = asyncio.Queue()
+        for event in event_names:
+            self._subscribers.setdefault(event, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            for event in event_names:
+                self._subscribers[event].discard(queue)
+
+    # Monitors
+    async def get_monitors(self):
+        """
+        Get all monitor groups and processes
+
+        :return: (list) Monitors
+        """
+
+        return list((await self.get_event_data(ioevents.monitor_list)).values())
+
+    async def get_monitor(self, monitor_id=None, monitor_name=None):
+        """
+        Get a monitor by id or name
+
+        :param monitor_id: (int) Monitor ID.
+        :param monitor_name: (str) Monitor name.
+        :return: (dict) Monitor data or None if the monitor doesn't exist
+        """
+
+        await self.get_event_data(ioevents.monitor_list)
+        if monitor_name is not None:
+            return self._monitor_indexes["by_name"].get(monitor_name)
+        return self._monitor_indexes["by_id"].get(monitor_id)
+
+    async def add_monitor(self, **monitor_data):
+        """
+        Adds a monitor, keyword arguments are the same as the monitor yaml input
+
+        :return: (dict) 'add' event response
+        """
+
+        payload = _get_monitor_payload(**monitor_data)
+        missing_arguments = get_missing_arguments(payload)
+        if missing_arguments:
+            raise ValueError(f"Missing arguments for monitor '{payload['name']}'. Missing {missing_arguments} key(s).")
+        response = await self.call("add", payload)
+        if response.get("ok"):
+            monitor = {"id": response["monitorID"], "name": payload["name"], "type": payload["type"]}
+            self._monitor_indexes["by_id"][monitor["id"]] = monitor
+            self._monitor_indexes["by_name"][monitor["name"]] = monitor
+        return response
+
+    async def add_monitors(self, monitors=None, concurrency=8):
+        """
+        Adds monitor groups and their process monitors concurrently. Existing monitors are skipped, a name listed more
+        than once is added once. Process monitors of a group that couldn't be created are not added, their response
+        is a failed response naming the group.
+
+        :param monitors: (dict) Process monitor input data lists by group name, same as the 'monitors' yaml key.
+        :param concurrency: (int) Maximum number of 'add' calls in flight.
+        :return: (dict) 'add' event responses by monitor name
+        """
+
+        slots = asyncio.Semaphore(concurrency)
+        responses = {}
+        reserved_names = set()
+
+        async def _add(**monitor_data):
+            # Names are reserved before the first await, so two tasks never add the same name.
+            if monitor_data["name"] in reserved_names:
+                return
+            reserved_names.add(monitor_data["name"])
+            if await self.get_monitor(monitor_name=monitor_data["name"]) is None:
+                async with slots:
+                    responses[monitor_data["name"]] = await self.add_monitor(**monitor_data)
+
+        await asyncio.gather(*[_add(type="group", name=group) for group in monitors if group != "default"])
+        process_monitors = []
+        for group, group_monitors in monitors.items():
+            parent = await self.get_monitor(monitor_name=group) if group != "default" else None
+            if group != "default" and parent is None:
+                group_response = responses.get(group, {})
+                for monitor_data in group_monitors:
+                    responses[monitor_data["name"]] = {
+                        "ok": False,
+                        "msg": f"Monitor group '{group}' couldn't be created. {group_response.get('msg', '')}".strip(),
+                    }
+                continue
+            for monitor_data in group_monitors:
+                if parent is not None:
+                    monitor_data = {**monitor_data, "parent": parent["id"]}
+                process_monitors.append(_add(**monitor_data))
+        await asyncio.gather(*process_monitors)
+        return responses
+
+    async def delete_monitor(self, monitor_id=None):
+        """
+        Deletes a monitor
+
+        :param monitor_id: (int) Monitor ID.
+        :return: (dict) 'deleteMonitor' event response
+        """
+
+        return await self.call("deleteMonitor", monitor_id)
+
+    # Notifications
+    async def get_notifications(self):
+        """
+        Get all notification providers with their decoded config
+
+        :return: (list) Notification providers
+        """
+
+        notifications = []
+        for notification in await self.get_event_data(ioevents.notification_list):
+            flat_notification = notification.copy()
+            flat_notification.update(json.loads(flat_notification.pop("config")))
+            notifications.append(flat_notification)
+        return notifications
+
+    async def add_notification(self, payload=None):
+        """
+        Adds a notification provider
+
+        :param payload: (dict) Notification provider data.
+        :return: (dict) 'addNotification' event response
+        """
+
+        return await self.call("addNotification", (payload, None))
+
+    async def delete_notification(self, notification_id=None):
+        """
+        Deletes a notification provider
+
+        :param notification_id: (int) Notification provider ID.
+        :return: (dict) 'deleteNotification' event response
+        """
+
+        return await self.call("deleteNotification", notification_id)
+
+    # Status pages
+    async def get_status_pages(self):
+        """
+        Get all status pages
+
+        :return: (list) Status pages
+        """
+
+        return list((await self.get_event_data(ioevents.status_page_list)).values())
+
+    async def get_status_page(self, slug=None):
+        """
+        Get a status page by slug
+
+        :param slug: (str) Status page slug.
+        :return: (dict) 'getStatusPage' event response
+        """
+
+        return await self.call("getStatusPage", slug)
+
+    async def add_status_page(self, title=None, slug=None):
+        """
+        Adds a status page
+
+        :param title: (str) Status page title.
+        :param slug: (str) Status page slug.
+        :return: (dict) 'addStatusPage' event response
+        """
+
+        return await self.call("addStatusPage", (title, slug))
+
+    async def save_status_page(self, **status_page_data):
+        """
+        Saves a status page, keyword arguments are the same as the status page yaml input
+
+        :return: (dict) 'saveStatusPage' event response
+        """
+
+        return await self.call("saveStatusPage", _get_status_page_data_payload(**status_page_data))
+
+    async def delete_status_page(self, slug=None):
+        """
+        Deletes a status page
+
+        :param slug: (str) Status page slug.
+        :return: (dict) 'deleteStatusPage' event response
+        """
+
+        return await self.call("deleteStatusPage", slug)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+"""Heartbeat export module for kumaone"""
+
+# Import builtin python libraries
+import csv
+import json
+import math
+import os
+from pathlib import Path
+import sys
+import time
+
+# Import external python libraries
+from rich.console import Console
+
+# Import custom (local) python packages
+from .event_handlers import get_event_data
+from .heartbeats import _parse_heartbeat_time
+from . import ioevents
+from .registry import get_monitor_by_id
+from .utils import _sio_call_pipelined
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+export_columns = ["monitor_id", "monitor_name", "time", "status", "ping", "duration", "important", "msg"]
+
+
+def _get_export_state_file(output=None):
+    return Path(f"{output}.state.json")
+
+
+def _read_export_state(output=None):
+    """
+    Reads last exported heartbeat time of every monitor
+
+    :param output: (Path) Export output path.
+    :return: (dict) Last exported heartbeat time by monitor ID
+    """
+
+    try:
+        with open(_get_export_state_file(output=output), "r") as export_state:
+            return json.load(export_state)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_export_state(output=None, state=None):
+    """
+    Writes last exported heartbeat time of every monitor atomically
+
+    :param output: (Path) Export output path.
+    :param state: (dict) Last exported heartbeat time by monitor ID
+    :return: None
+    """
+
+    export_state_file = _get_export_state_file(output=output)
+    tmp_export_state_file = export_state_file.with_suffix(".tmp")
+    with open(tmp_export_state_file, "w") as export_state:
+        json.dump(state, export_state)
+    os.replace(tmp_export_state_file, export_state_file)
+
+
+class _CsvBeatWriter:
+    """
+    Appends heartbeat rows to a csv file.
+    """
+
+    def __init__(self, output=None):
+        new_file = not Path(output).exists() or Path(output).stat().st_size == 0
+        self.output_file = open(output, "a", newline="")
+        self.writer = csv.DictWriter(self.output_file, fieldnames=export_columns, extrasaction="ignore")
+        if new_file:
+            self.writer.writeheader()
+
+    def write(self, rows=None):
+        self.writer.writerows(rows)
+        # Rows have to be on disk before the export state is updated.
+        self.output_file.flush()
+        os.fsync(self.output_file.fileno())
+
+    def close(self):
+        self.output_file.close()
+
+
+class _ParquetBeatWriter:
+    """
+    Writes heartbeat rows to a new parquet file in the output directory. Every run creates a new file, because
+    parquet files can't be appended to.
+    """
+
+    def __init__(self, output=None):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            console.print(
+                f":x:  Parquet export requires pyarrow. Install it with 'pip install kumaone\\[parquet]'.",
+                style="logging.level.error",
+            )
+            sys.exit(1)
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema(
+            [
+                ("monitor_id", pyarrow.int64()),
+                ("monitor_name", pyarrow.string()),
+                ("time", pyarrow.string()),
+                ("status", pyarrow.int8()),
+                ("ping", pyarrow.float64()),
+                ("duration", pyarrow.float64()),
+                ("important", pyarrow.bool_()),
+                ("msg", pyarrow.string()),
+            ]
+        )
+        Path(output).mkdir(parents=True, exist_ok=True)
+        self.output_file = Path(output).joinpath(f"beats-{time.strftime('%Y%m%dT%H%M%S')}.parquet")
+        self.writer = pyarrow.parquet.ParquetWriter(self.output_file, self.schema)
+
+    def write(self, rows=None):
+        if rows:
+            self.writer.write_table(self.pyarrow.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self):
+        # Files are only readable after closing, the export state is written afterwards.
+        self.writer.close()
+
+
+def _get_beat_rows(monitor_id=None, beats=None, last_exported_time=None):
+    """
+    Converts heartbeats of a monitor to export rows, skipping already exported heartbeats
+
+    :param monitor_id: (int) Monitor ID.
+    :param beats: (list) Heartbeats.
+    :param last_exported_time: (str) Time of the last exported heartbeat of the monitor.
+    :return: (list) Export rows, oldest first
+    """
+
+    monitor_name = (get_monitor_by_id(monitor_id) or {}).get("name")
+    rows = []
+    for beat in sorted(beats, key=lambda item: item["time"]):
+        # Heartbeat times are 'YYYY-MM-DD HH:mm:ss.SSS' strings, so they compare in time order.
+        if last_exported_time is not None and beat["time"] <= last_exported_time:
+            continue
+        rows.append(
+            {
+                "monitor_id": monitor_id,
+                "monitor_name": monitor_name,
+                "time": beat["time"],
+                "status": beat["status"],
+                "ping": beat.get("ping"),
+                "duration": beat.get("duration"),
+                "important": bool(beat.get("important")),
+                "msg": beat.get("msg"),
+            }
+        )
+    return rows
+
+
+def export_beats(output=None, output_format="csv", monitor_ids=None, hours=24, window=8, logger=None):
+    """
+    Exports heartbeat history of monitors. Monitors are fetched 'window' at a time and written right away, so memory
+    use doesn't grow with the number of monitors. Heartbeats exported by an earlier run are not exported again.
+
+    :param output: (Path) Output csv file or parquet directory.
+    :param output_format: (str) 'csv' or 'parquet'.
+    :param monitor_ids: (list) Monitor IDs. Defaults to all process monitors.
+    :param hours: (float) Period in hours.
+    :param window: (int) Number of monitors fetched concurrently.
+    :param logger: (object) Logger object
+    :return: None
+    """
+
+    if not monitor_ids:
+        monitor_ids = [
+            monitor["id"] for monitor in get_event_data(ioevents.monitor_list).values() if monitor["type"] != "group"
+        ]
+    export_state = _read_export_state(output=output)
+    beat_writer = _ParquetBeatWriter(output=output) if output_format == "parquet" else _CsvBeatWriter(output=output)
+    exported_rows = 0
+    try:
+        for batch_start in range(0, len(monitor_ids), window):
+            batch = monitor_ids[batch_start : batch_start + window]
+            periods = []
+            for monitor_id in batch:
+                last_exported_time = export_state.get(str(monitor_id))
+                hours_since = (
+                    math.nan
+                    if last_exported_time is None
+                    else (time.time() - _parse_heartbeat_time(last_exported_time)) / 3600
+                )
+                if math.isnan(hours_since):
+                    # Nothing exported yet or the exported time can't be parsed, fetch the whole period.
+                    periods.append(hours)
+                else:
+                    periods.append(min(hours, max(math.ceil(hours_since) + 1, 1)))
+            responses = _sio_call_pipelined(
+                "getMonitorBeats", [(monitor_id, period) for monitor_id, period in zip(batch, periods)], window=window
+            )
+            for monitor_id, response in zip(batch, responses):
+                if not (isinstance(response, dict) and response.get("ok")):
+                    message = response.get("msg") if isinstance(response, dict) else response
+                    console.print(
+                        f":orange_circle: Couldn't get heartbeats of monitor '{monitor_id}'. {message}",
+                        style="logging.level.warning",
+                    )
+                    continue
+                rows = _get_beat_rows(
+                    monitor_id=monitor_id,
+                    beats=response["data"],
+                    last_exported_time=export_state.get(str(monitor_id)),
+                )
+                beat_writer.write(rows=rows)
+                exported_rows += len(rows)
+                if rows:
+                    # Written rows are part of the state right away, an error later in the batch must not make the
+                    # next run export them again.
+                    export_state[str(monitor_id)] = rows[-1]["time"]
+                logger.debug(f"Exported {len(rows)} heartbeats of monitor {monitor_id}.")
+            if output_format == "csv":
+                _write_export_state(output=output, state=export_state)
+    finally:
+        beat_writer.close()
+        _write_export_state(output=output, state=export_state)
+    console.print(
+        f":floppy_disk: Exported {exported_rows} heartbeats of {len(monitor_ids)} monitors to '{output}'.",
+        style="logging.level.info",
+    )
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+
+"""Agent module for kumaone"""
+
+# Import builtin python libraries
+from pathlib import Path
+from typing import Optional
+
+# Import external python libraries
+from rich.console import Console
+import typer
+from typing_extensions import Annotated
+
+# Import custom (local) python packages
+from src.kumaone.agent import agent_status, serve_agent, start_agent, stop_agent
+from src.kumaone.configs import check_config
+from src.kumaone.utils import log_manager
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+# Create typer app and turn off debug mode by default
+app = typer.Typer()
+state = {"log_level": "NOTSET"}
+console = Console()
+
+
+@app.command(name="start", help="Start kumaone agent in the background.")
+def agent_start(
+    config_file: Annotated[
+        Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
+    ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
+):
+    """
+    Start kumaone agent in the background.
+
+    :return: None
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+
+    start_agent(config_file=Path(config_file).resolve() if config_file else None, log_level=log_level)
+
+
+@app.command(name="run", help="Run kumaone agent in the foreground.")
+def agent_run(
+    config_file: Annotated[
+        Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
+    ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
+):
+    """
+    Run kumaone agent in the foreground.
+
+    :return: None
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+        logger = log_manager(log_level=log_level)
+
+    config_data = check_config(config_path=config_file, logger=logger)
+    serve_agent(config_data=config_data, logger=logger)
+
+
+@app.command(name="stop", help="Stop kumaone agent.")
+def agent_stop(log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET"):
+    """
+    Stop kumaone agent.
+
+    :return: None
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+
+    stop_agent()
+
+
+@app.command(name="status", help="Show kumaone agent status.")
+def agent_show_status(log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET"):
+    """
+    Show kumaone agent status.
+
+    :return: None
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+
+    agent_status()
+
+
+@app.callback()
+def agent_mission_control(log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET"):
+    """
+    Kumaone agent. Keeps one logged-in uptime kuma connection open for faster commands.
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+
+
+if __name__ == "__main__":
+    app()
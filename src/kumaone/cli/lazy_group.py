@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+
+
+"""Lazy command group module for kumaone"""
+
+# Import builtin python libraries
+from importlib import import_module
+
+# Import external python libraries
+import typer
+from typer.core import TyperGroup
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+
+class LazyGroup(TyperGroup):
+    """
+    Typer command group that imports sub-command modules only when one of their commands is looked up, e.g. when
+    it is dispatched, completed or listed in the help. Sub-command modules are set in 'lazy_subcommands' as
+    command name to module path, every module has to provide a typer 'app'.
+    """
+
+    lazy_subcommands = {}
+
+    def list_commands(self, ctx):
+        commands = super().list_commands(ctx)
+        return commands + [name for name in self.lazy_subcommands if name not in commands]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            command = typer.main.get_group(import_module(self.lazy_subcommands[cmd_name]).app)
+            command.name = cmd_name
+            self.commands[cmd_name] = command
+        return super().get_command(ctx, cmd_name)
+
+    def resolve_command(self, ctx, args):
+        if args and not args[0].startswith("-") and args[0] not in self.list_commands(ctx):
+            # Unknown command, load all sub-commands so that typo suggestions include them.
+            for cmd_name in self.lazy_subcommands:
+                self.get_command(ctx, cmd_name)
+        return super().resolve_command(ctx, args)
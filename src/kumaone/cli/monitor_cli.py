@@ -5,7 +5,7 @@
 
 # Import builtin python libraries
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 # Import external python libraries
 from rich.console import Console
@@ -13,10 +13,10 @@ from typing_extensions import Annotated
 import typer
 
 # Import custom (local) python packages
+from src.kumaone.agent import run_operation
+from src.kumaone.apply_cache import clear_apply_cache
 from src.kumaone.configs import check_config
-from src.kumaone.connection import connect_login, disconnect
-from src.kumaone.monitors import add_monitor, delete_monitor, list_monitors
-from src.kumaone.utils import _check_data_path, log_manager, _mutual_exclusivity_check
+from src.kumaone.utils import log_manager, _mutual_exclusivity_check
 
 # Source code meta data
 __author__ = "Dalwar Hossain"
@@ -34,6 +34,23 @@ def monitor_add(
     config_file: Annotated[
         Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
     ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    window: Annotated[
+        int,
+        typer.Option(
+            ..., "--window", "-w", min=1, help="Number of monitor creations in flight. Above 1 enables pipelined mode."
+        ),
+    ] = 1,
+    include: Annotated[
+        Optional[List[str]],
+        typer.Option(..., "--include", help="Only use files matching this glob, relative to the monitor directory."),
+    ] = None,
+    exclude: Annotated[
+        Optional[List[str]],
+        typer.Option(..., "--exclude", help="Skip files matching this glob, relative to the monitor directory."),
+    ] = None,
+    cache: Annotated[
+        bool, typer.Option(help="Skip monitor files that were added before and didn't change since.")
+    ] = True,
     log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
 ):
     """
@@ -47,10 +64,17 @@ def monitor_add(
         logger = log_manager(log_level=log_level)
 
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
-    monitor_file_paths = _check_data_path(data_path=monitors, logger=logger, key_to_check_for="monitors")
-    add_monitor(monitor_data_files=monitor_file_paths, logger=logger)
-    disconnect()
+    run_operation(
+        "monitor.add",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        data_path=str(Path(monitors).resolve()),
+        window=window,
+        include=include,
+        exclude=exclude,
+        use_cache=cache,
+    )
 
 
 @app.command(name="delete", help="Delete one or more monitor(s).")
@@ -66,6 +90,14 @@ def monitor_delete(
         ),
     ] = None,
     monitor_id: Annotated[int, typer.Option(..., "--id", "-i", help="Uptime kuma monitor ID.")] = None,
+    include: Annotated[
+        Optional[List[str]],
+        typer.Option(..., "--include", help="Only use files matching this glob, relative to the monitor directory."),
+    ] = None,
+    exclude: Annotated[
+        Optional[List[str]],
+        typer.Option(..., "--exclude", help="Skip files matching this glob, relative to the monitor directory."),
+    ] = None,
     config_file: Annotated[
         Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
     ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
@@ -81,22 +113,24 @@ def monitor_delete(
         state["log_level"] = log_level
         logger = log_manager(log_level=log_level)
 
-    config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
     if monitors is None and monitor_name is None and monitor_id is None:
         raise typer.BadParameter(
             "At least one of the parameter '--monitor'/'-m' OR '--name'/'-n' OR '--id'/'-i' is required."
         )
     if monitor_name is not None and monitor_id is not None:
         raise typer.BadParameter(message="Only one of '--name' and '--id' parameter is allowed.")
-    if monitors:
-        monitor_file_paths = _check_data_path(data_path=monitors, logger=logger, key_to_check_for="monitors")
-        delete_monitor(monitor_data_files=monitor_file_paths, logger=logger)
-    elif monitor_id:
-        delete_monitor(monitor_id=monitor_id, logger=logger)
-    elif monitor_name:
-        delete_monitor(monitor_name=monitor_name, logger=logger)
-    disconnect()
+    config_data = check_config(config_path=config_file, logger=logger)
+    run_operation(
+        "monitor.delete",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        data_path=str(Path(monitors).resolve()) if monitors else None,
+        monitor_name=monitor_name,
+        monitor_id=monitor_id,
+        include=include,
+        exclude=exclude,
+    )
 
 
 @app.command(name="list", help="List all monitor groups and processes.")
@@ -107,6 +141,9 @@ def monitor_list(
     groups: Annotated[bool, typer.Option(help="Show only monitoring groups.")] = False,
     processes: Annotated[bool, typer.Option(help="Show only monitoring processes.")] = False,
     verbose: Annotated[bool, typer.Option(help="Show verbose output.")] = False,
+    cached: Annotated[
+        bool, typer.Option(help="Use the local state cache instead of connecting to the server.")
+    ] = False,
     log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
 ):
     """
@@ -122,14 +159,24 @@ def monitor_list(
     if groups and processes:
         raise typer.BadParameter(message="'--groups' and '--processes' can not be used together.")
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
-    list_monitors(show_groups=groups, show_processes=processes, verbose=verbose, logger=logger)
-    disconnect()
+    run_operation(
+        "monitor.list",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        cached=cached,
+        groups=groups,
+        processes=processes,
+        verbose=verbose,
+    )
 
 
 @app.command(name="show", help="Show details of a single process monitor by ID.")
 def monitor_show(
     monitor_id: Annotated[int, typer.Option(..., "--id", "-i", help="Uptime kuma monitor ID.")],
+    cached: Annotated[
+        bool, typer.Option(help="Use the local state cache instead of connecting to the server.")
+    ] = False,
     config_file: Annotated[
         Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
     ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
@@ -146,11 +193,152 @@ def monitor_show(
         logger = log_manager(log_level=log_level)
 
     config_data = check_config(config_path=config_file, logger=logger)
+    run_operation(
+        "monitor.show",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        cached=cached,
+        monitor_id=monitor_id,
+    )
+
+
+@app.command(name="stats", help="Show uptime, latency percentiles, incidents and MTTR of process monitors.")
+def monitor_stats(
+    monitor_ids: Annotated[
+        Optional[List[int]], typer.Option(..., "--id", "-i", help="Uptime kuma monitor ID. Defaults to all monitors.")
+    ] = None,
+    hours: Annotated[float, typer.Option(..., "--hours", min=0, help="Period in hours.")] = 24,
+    window: Annotated[
+        int, typer.Option(..., "--window", "-w", min=1, help="Number of heartbeat requests in flight.")
+    ] = 8,
+    config_file: Annotated[
+        Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
+    ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
+):
+    """
+    Shows monitor statistics
+
+    :return: None
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+        logger = log_manager(log_level=log_level)
+
+    config_data = check_config(config_path=config_file, logger=logger)
+    run_operation(
+        "monitor.stats",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        monitor_ids=monitor_ids,
+        hours=hours,
+        window=window,
+    )
+
+
+@app.command(name="export-beats", help="Export heartbeat history of process monitors to csv or parquet.")
+def monitor_export_beats(
+    output: Annotated[Path, typer.Option(..., "--output", "-o", help="Output csv file or parquet directory.")],
+    output_format: Annotated[
+        str, typer.Option(..., "--format", "-f", help="Output format, 'csv' or 'parquet'.")
+    ] = "csv",
+    monitor_ids: Annotated[
+        Optional[List[int]], typer.Option(..., "--id", "-i", help="Uptime kuma monitor ID. Defaults to all monitors.")
+    ] = None,
+    hours: Annotated[float, typer.Option(..., "--hours", min=0, help="Period in hours.")] = 24,
+    window: Annotated[
+        int, typer.Option(..., "--window", "-w", min=1, help="Number of monitors fetched concurrently.")
+    ] = 8,
+    config_file: Annotated[
+        Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
+    ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
+):
+    """
+    Exports heartbeat history of uptime kuma monitors
+
+    :return: None
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+        logger = log_manager(log_level=log_level)
+
+    if output_format not in ["csv", "parquet"]:
+        raise typer.BadParameter(message="'--format' must be 'csv' or 'parquet'.")
+    config_data = check_config(config_path=config_file, logger=logger)
+    run_operation(
+        "monitor.export_beats",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        output=str(Path(output).resolve()),
+        output_format=output_format,
+        monitor_ids=monitor_ids,
+        hours=hours,
+        window=window,
+    )
+
+
+@app.command(name="watch", help="Show a live view of process monitor status, ping and uptime.")
+def monitor_watch(
+    group: Annotated[
+        Optional[str], typer.Option(..., "--group", "-g", help="Only show monitors of this group.")
+    ] = None,
+    monitor_type: Annotated[
+        Optional[str], typer.Option(..., "--type", "-t", help="Only show monitors of this type.")
+    ] = None,
+    refresh_rate: Annotated[float, typer.Option(..., "--refresh-rate", min=0.1, help="Redraws per second.")] = 4,
+    config_file: Annotated[
+        Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
+    ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
+):
+    """
+    Watches uptime kuma monitors until interrupted with Ctrl+C
+
+    :return: None
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+        logger = log_manager(log_level=log_level)
+
+    config_data = check_config(config_path=config_file, logger=logger)
+    from src.kumaone.connection import connect_login, disconnect
+    from src.kumaone.watch import watch_monitors
+
+    # Watching runs until interrupted, so it always uses its own connection instead of a kumaone agent.
     connect_login(config_data=config_data)
-    list_monitors(monitor_id=monitor_id, logger=logger)
+    watch_monitors(group=group, monitor_type=monitor_type, refresh_rate=refresh_rate, logger=logger)
     disconnect()
 
 
+@app.command(name="clear-cache", help="Forget which monitor files were added, so that all files are checked again.")
+def monitor_clear_cache(
+    config_file: Annotated[
+        Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
+    ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
+):
+    """
+    Clears the monitor apply cache of the configured uptime kuma server
+
+    :return: None
+    """
+
+    if log_level:
+        state["log_level"] = log_level
+        logger = log_manager(log_level=log_level)
+
+    config_data = check_config(config_path=config_file, logger=logger)
+    removed_records = clear_apply_cache(server_key=f"{config_data.user}@{config_data.url}")
+    console.print(f":broom: {removed_records} cached monitor file(s) removed.", style="logging.level.info")
+
+
 @app.callback()
 def monitor_mission_control(log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET"):
     """
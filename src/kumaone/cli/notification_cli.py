@@ -13,9 +13,8 @@ import typer
 from typing_extensions import Annotated
 
 # Import custom (local) python packages
+from src.kumaone.agent import run_operation
 from src.kumaone.configs import check_config
-from src.kumaone.connection import connect_login, disconnect
-from src.kumaone.notifications import add_notification, delete_notification, list_notifications, list_notification_providers, list_notification_provider_args
 from src.kumaone.utils import log_manager, _mutual_exclusivity_check
 
 # Source code meta data
@@ -54,12 +53,25 @@ def notification_add(
         raise typer.BadParameter("Only one parameter is allowed.")
 
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
     if interactive:
-        add_notification(interactive=interactive, verbose=verbose, logger=logger)
+        run_operation(
+            "notification.add",
+            config_data=config_data,
+            log_level=log_level,
+            logger=logger,
+            interactive=interactive,
+            verbose=verbose,
+        )
     elif notifications:
-        add_notification(notifications_file_path=notifications, interactive=interactive, verbose=verbose, logger=logger)
-    disconnect()
+        run_operation(
+            "notification.add",
+            config_data=config_data,
+            log_level=log_level,
+            logger=logger,
+            data_path=str(Path(notifications).resolve()),
+            interactive=interactive,
+            verbose=verbose,
+        )
 
 
 @app.command(name="list", help="List all uptime kuma notification providers.")
@@ -68,6 +80,9 @@ def notification_list(
         Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
     ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
     verbose: Annotated[bool, typer.Option(help="Show verbose output.")] = False,
+    cached: Annotated[
+        bool, typer.Option(help="Use the local state cache instead of connecting to the server.")
+    ] = False,
     log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
 ):
     """
@@ -81,9 +96,14 @@ def notification_list(
         logger = log_manager(log_level=log_level)
 
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
-    list_notifications(verbose=verbose, logger=logger)
-    disconnect()
+    run_operation(
+        "notification.list",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        cached=cached,
+        verbose=verbose,
+    )
 
 
 @app.command(name="show", help="Show details of an uptime kuma notification provider.")
@@ -104,6 +124,9 @@ def notification_show(
         Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
     ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
     verbose: Annotated[bool, typer.Option(help="Show verbose output.")] = False,
+    cached: Annotated[
+        bool, typer.Option(help="Use the local state cache instead of connecting to the server.")
+    ] = False,
     log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
 ):
     """
@@ -118,11 +141,16 @@ def notification_show(
     if notification_title is None and notification_id is None:
         raise typer.BadParameter("At least on of '--name' / '-n' or '--id' / '-i' parameter is required.")
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
-    list_notifications(
-        verbose=verbose, notification_title=notification_title, notification_id=notification_id, logger=logger
+    run_operation(
+        "notification.show",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        cached=cached,
+        notification_title=notification_title,
+        notification_id=notification_id,
+        verbose=verbose,
     )
-    disconnect()
 
 
 @app.command(name="providers", help="Show all supported uptime kuma notification providers.")
@@ -143,6 +171,9 @@ def notification_list_providers(
         state["log_level"] = log_level
         logger = log_manager(log_level=log_level)
     config_data = check_config(config_path=config_file, logger=logger)
+    from src.kumaone.connection import connect_login, disconnect
+    from src.kumaone.notifications import list_notification_providers
+
     connect_login(config_data=config_data)
     list_notification_providers(verbose=verbose, logger=logger)
     disconnect()
@@ -174,6 +205,9 @@ def notification_show_args(
     if notificaton_type is None:
         raise typer.BadParameter("Notification type '--type' / '-n' parameter is required.")
     config_data = check_config(config_path=config_file, logger=logger)
+    from src.kumaone.connection import connect_login, disconnect
+    from src.kumaone.notifications import list_notification_provider_args
+
     connect_login(config_data=config_data)
     list_notification_provider_args(
         verbose=verbose, notification_type=notificaton_type, logger=logger
@@ -211,14 +245,25 @@ def notification_delete(
         raise typer.BadParameter(message="At least one of '--notifications' / '--name' parameter is required.")
 
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
     if notification_title:
-        delete_notification(notification_title=notification_title, verbose=verbose, logger=logger)
+        run_operation(
+            "notification.delete",
+            config_data=config_data,
+            log_level=log_level,
+            logger=logger,
+            notification_title=notification_title,
+            verbose=verbose,
+        )
     elif notifications:
-        delete_notification(
-            notifications_file_path=notifications, notification_title=notification_title, verbose=verbose, logger=logger
+        run_operation(
+            "notification.delete",
+            config_data=config_data,
+            log_level=log_level,
+            logger=logger,
+            data_path=str(Path(notifications).resolve()),
+            notification_title=notification_title,
+            verbose=verbose,
         )
-    disconnect()
 
 
 @app.callback()
@@ -14,10 +14,9 @@ import typer
 from typing_extensions import Annotated
 
 # Import custom (local) python packages
+from src.kumaone.agent import run_operation
 from src.kumaone.configs import check_config
-from src.kumaone.connection import connect_login, disconnect
-from src.kumaone.status_pages import add_status_page, delete_status_page, get_satus_page, list_status_pages
-from src.kumaone.utils import _check_data_path, log_manager, _mutual_exclusivity_check
+from src.kumaone.utils import log_manager, _mutual_exclusivity_check
 
 # Source code meta data
 __author__ = "Dalwar Hossain"
@@ -91,15 +90,20 @@ def status_page_add(
         exit(1)
 
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
     if status_page_config == "inline":
-        add_status_page(status_page_title=title, status_page_slug=slug, logger=logger)
+        run_operation(
+            "status_page.add", config_data=config_data, log_level=log_level, logger=logger, title=title, slug=slug
+        )
     elif status_page_config == "from_file":
-        status_page_file_paths = _check_data_path(
-            data_path=status_pages, logger=logger, key_to_check_for="status_pages"
+        run_operation(
+            "status_page.add",
+            config_data=config_data,
+            log_level=log_level,
+            logger=logger,
+            data_path=str(Path(status_pages).resolve()),
+            url=config_data.url,
+            save=save,
         )
-        add_status_page(status_page_data_files=status_page_file_paths, logger=logger, url=config_data.url, save=save)
-    disconnect()
 
 
 @app.command(name="delete", help="Delete one or more uptime kuma status page(s).")
@@ -134,15 +138,16 @@ def status_page_delete(
         status_page_config = "inline"
 
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
     if status_page_config == "inline":
-        delete_status_page(status_page_slug=slug, logger=logger)
+        run_operation("status_page.delete", config_data=config_data, log_level=log_level, logger=logger, slug=slug)
     elif status_page_config == "from_file":
-        status_page_file_paths = _check_data_path(
-            data_path=status_pages, logger=logger, key_to_check_for="status_pages"
+        run_operation(
+            "status_page.delete",
+            config_data=config_data,
+            log_level=log_level,
+            logger=logger,
+            data_path=str(Path(status_pages).resolve()),
         )
-        delete_status_page(status_page_data_files=status_page_file_paths, logger=logger)
-    disconnect()
 
 
 @app.command(name="list", help="List all uptime kuma status pages.")
@@ -151,6 +156,9 @@ def status_page_list(
         Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
     ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
     verbose: Annotated[bool, typer.Option(help="Show verbose output.")] = False,
+    cached: Annotated[
+        bool, typer.Option(help="Use the local state cache instead of connecting to the server.")
+    ] = False,
     log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
 ):
     """
@@ -164,17 +172,31 @@ def status_page_list(
         logger = log_manager(log_level=log_level)
 
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
-    list_status_pages(verbose=verbose, logger=logger)
-    disconnect()
+    run_operation(
+        "status_page.list",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        cached=cached,
+        verbose=verbose,
+    )
 
 
 @app.command(name="show", help="Show a status page details.")
 def status_page_show(
-    slug: Annotated[str, typer.Option(..., "--slug", "-s", help="Slug of the status page.")],
+    slug: Annotated[
+        str, typer.Option(..., "--slug", "-s", help="Slug of the status page. Exclusive to '--all'")
+    ] = None,
+    all_pages: Annotated[
+        bool, typer.Option(..., "--all", "-a", help="Show every status page, fetched concurrently.")
+    ] = False,
+    window: Annotated[
+        int, typer.Option(..., "--window", "-w", min=1, help="Number of status pages fetched concurrently.")
+    ] = 8,
     config_file: Annotated[
         Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
     ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    verbose: Annotated[bool, typer.Option(help="Show details of every status page with '--all'.")] = False,
     log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
 ):
     """
@@ -186,11 +208,29 @@ def status_page_show(
     if log_level:
         state["log_level"] = log_level
         logger = log_manager(log_level=log_level)
+    if (slug is None) == (not all_pages):
+        raise typer.BadParameter(message="Exactly one of the parameters '--slug' / '-s' OR '--all' / '-a' is required.")
 
     config_data = check_config(config_path=config_file, logger=logger)
-    connect_login(config_data=config_data)
-    get_satus_page(slug=slug, logger=logger, url=config_data.url, show_details=True)
-    disconnect()
+    if all_pages:
+        run_operation(
+            "status_page.show_all",
+            config_data=config_data,
+            log_level=log_level,
+            logger=logger,
+            url=config_data.url,
+            window=window,
+            verbose=verbose,
+        )
+    else:
+        run_operation(
+            "status_page.show",
+            config_data=config_data,
+            log_level=log_level,
+            logger=logger,
+            slug=slug,
+            url=config_data.url,
+        )
 
 
 @app.callback()
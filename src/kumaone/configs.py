@@ -6,12 +6,10 @@
 from pathlib import Path
 import sys
 from types import SimpleNamespace
-import yaml
 
 # Import external python libraries
 from rich.console import Console
 from rich.prompt import Prompt
-import validators
 
 # Import custom (local) python packages
 from src.kumaone.utils import log_manager
@@ -39,9 +37,11 @@ def __write_config_file(data_to_write=None, file_path=None):
     :return: (file) Creates a file in file system.
     """
 
+    from src.kumaone.yaml_handler import dump_yaml
+
     try:
         with open(file_path, "w") as kuma_config:
-            yaml.safe_dump(data_to_write, kuma_config)
+            dump_yaml(data_to_write, kuma_config)
             return True
     except Exception as err:
         console.print(f":x: {err} Exception occurred.", style="logging.level.error")
@@ -59,6 +59,9 @@ def check_config(config_path=None, log_level=None, logger=None, get_url=False):
     :return: (object) Python SimpleNamespace object with the config
     """
 
+    # yaml is imported on first use, so that commands that only print help or the version stay fast to start.
+    from src.kumaone.yaml_handler import load_yaml
+
     if logger is None:
         logger = log_manager(log_level=log_level)
     else:
@@ -82,7 +85,7 @@ def check_config(config_path=None, log_level=None, logger=None, get_url=False):
         if Path.exists(config_file):
             if Path.is_file(config_file):
                 with open(config_file, "r") as kuma_config:
-                    config_data = yaml.safe_load(kuma_config)
+                    config_data = load_yaml(kuma_config)
                     logger.info(f"Config file {config_file} found!")
                     logger.debug(f"{config_data}")
                 console.print(f":partying_face: Uptime kuma config file found at: {config_file}", style="green")
@@ -106,6 +109,8 @@ def create_config(config_path=None, log_level=None):
     :return: (file) Cerates a file with configuration
     """
 
+    import validators
+
     logger = log_manager(log_level=log_level)
 
     logger.info(f"Provided location: {config_path}")
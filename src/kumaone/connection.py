@@ -3,6 +3,9 @@
 """Connection module for kumaone"""
 
 # Import builtin python libraries
+import json
+import os
+from pathlib import Path
 import sys
 
 # Import builtin python libraries
@@ -10,26 +13,32 @@ from types import SimpleNamespace
 
 # Import external python libraries
 from rich.console import Console
-
-import socketio
 from socketio.exceptions import TimeoutError
 
 # Import custom (local) python packages
 from .event_handlers import (
     connect_event,
     disconnect_event,
+    heartbeat_event,
+    heartbeat_list_event,
+    important_heartbeat_list_event,
     monitor_list_event,
     notification_list_event,
     status_page_list_event,
 )
 from . import ioevents
+from .recorder import ReplayClient, get_client
+from . import settings
+from .state_cache import flush_event_data
 
 # Source code meta data
 __author__ = "Dalwar Hossain"
 __email__ = "dalwar23@pm.me"
 
 console = Console()
-sio = socketio.Client(logger=False, engineio_logger=False)
+# Recording and replay are enabled with environment variables, see 'recorder.get_client()'.
+sio = get_client(logger=False, engineio_logger=False)
+replaying = isinstance(sio, ReplayClient)
 monitor_list_data = None
 
 
@@ -47,9 +56,9 @@ def _register_event_handlers():
     sio.on(ioevents.connect, connect_event)
     sio.on(ioevents.disconnect, disconnect_event)
     # sio.on(ioevents.docker_host_list, docker_host_list_event)
-    # sio.on(ioevents.heartbeat, heartbeat_event)
-    # sio.on(ioevents.heartbeat_list, heartbeat_list_event)
-    # sio.on(ioevents.important_heartbeat_list, important_heartbeat_list_event)
+    sio.on(ioevents.heartbeat, heartbeat_event)
+    sio.on(ioevents.heartbeat_list, heartbeat_list_event)
+    sio.on(ioevents.important_heartbeat_list, important_heartbeat_list_event)
     # sio.on(ioevents.info, info_events)
     # sio.on(ioevents.init_server_timezone, init_server_timezone_event)
     # sio.on(ioevents.maintenance_list, maintenance_list_event)
@@ -60,6 +69,69 @@ def _register_event_handlers():
     # sio.on(ioevents.uptime, uptime_event)
 
 
+def _read_cached_token(config_data=None):
+    """
+    Reads the cached login token for an uptime kuma server and user
+
+    :param config_data: (dict) Uptime kuma server configs
+    :return: (str) Cached token or None if there is no token
+    """
+
+    try:
+        with open(settings.token_cache_file, "r") as token_cache:
+            return json.load(token_cache).get(f"{config_data.user}@{config_data.url}")
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cached_token(config_data=None, token=None):
+    """
+    Writes (or removes, if token is None) the login token for an uptime kuma server and user.
+    The token cache is only readable by the current user.
+
+    :param config_data: (dict) Uptime kuma server configs
+    :param token: (str) Login token
+    :return: None
+    """
+
+    token_cache_file = Path(settings.token_cache_file)
+    try:
+        with open(token_cache_file, "r") as token_cache:
+            tokens = json.load(token_cache)
+    except (OSError, ValueError):
+        tokens = {}
+    if token is None:
+        tokens.pop(f"{config_data.user}@{config_data.url}", None)
+    else:
+        tokens[f"{config_data.user}@{config_data.url}"] = token
+    try:
+        token_cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_token_cache_file = token_cache_file.with_suffix(".tmp")
+        with os.fdopen(os.open(tmp_token_cache_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as token_cache:
+            json.dump(tokens, token_cache)
+        os.replace(tmp_token_cache_file, token_cache_file)
+    except OSError as err:
+        console.print(f":orange_circle: Could not update token cache. Error: {err}", style="logging.level.warning")
+
+
+def _login_by_token(config_data=None):
+    """
+    Logs in with the cached token. A rejected token is removed from the cache.
+
+    :param config_data: (dict) Uptime kuma server configs
+    :return: (bool) True if login was successful, False otherwise
+    """
+
+    token = _read_cached_token(config_data=config_data)
+    if token is None:
+        return False
+    login_response = sio.call("loginByToken", token)
+    if isinstance(login_response, dict) and login_response.get("ok"):
+        return True
+    _write_cached_token(config_data=config_data, token=None)
+    return False
+
+
 def connect_login(config_data=None, headers=None):
     """
     Connects to uptime kuma server
@@ -69,6 +141,10 @@ def connect_login(config_data=None, headers=None):
     :return: (event) Connection event to uptime kuma server
     """
 
+    if getattr(config_data, "event_timeout", None):
+        settings.event_timeout = config_data.event_timeout
+    # A replayed session must not change the token, state and apply caches of the recorded server.
+    settings.server_key = None if replaying else f"{config_data.user}@{config_data.url}"
     try:
         # console.print(Rule(title="Connect", style="purple"))
         _register_event_handlers()
@@ -79,10 +155,15 @@ def connect_login(config_data=None, headers=None):
     except Exception as err:
         connect_error(err)
     try:
+        if _login_by_token(config_data=config_data):
+            console.print(f":locked_with_key: Successfully logged in with cached token.", style="green")
+            return
         login_data = {"username": config_data.user, "password": config_data.password}
         login_response = sio.call("login", data=login_data)
         if isinstance(login_response, dict) and "ok" in login_response:
             console.print(f":locked_with_key: Successfully logged in.", style="green")
+            if login_response["ok"] and login_response.get("token") and not replaying:
+                _write_cached_token(config_data=config_data, token=login_response["token"])
             login_response = SimpleNamespace(**login_response)
     except Exception as err:
         console.print(f":x:  Error: {err}", style="logging.level.error")
@@ -99,6 +180,7 @@ def disconnect():
     # console.print(Rule(title="Disconnect", style="purple"))
     try:
         sio.disconnect()
+        flush_event_data()
         console.print(f":firecracker: Disconnected from server.", style="logging.level.info")
     except Exception as err:
         console.print(f":x:  Could not disconnect from server. Error: {err}", style="logging.level.error")
@@ -4,62 +4,119 @@
 
 # Import builtin python libraries
 from contextlib import contextmanager
-from copy import deepcopy
-import time
+import threading
 
 # Import external python libraries
 from rich.console import Console
-from socketio.exceptions import TimeoutError
 
 # Import custom (local) python packages
+from .heartbeats import add_heartbeats
 from . import ioevents
-from .settings import event_data, monitor_events
+from .registry import rebuild_monitor_registry
+from . import settings
+from .settings import event_data
+from .snapshots import freeze
+from .state_cache import persist_event_data
 
 # Source code meta data
 __author__ = "Dalwar Hossain"
 __email__ = "dalwar23@pm.me"
 
 console = Console()
+event_conditions = {event: threading.Condition() for event in event_data}
+# Number of times the data of an event has been received, to wait for a broadcast that follows a call
+event_generations = {event: 0 for event in event_data}
 
 
-@contextmanager
-def wait_for_event(event):
+def _set_event_data(event, data):
     """
-    Waits for event
+    Stores event data as a read-only snapshot and wakes up everyone waiting for it
 
     :param event: (str) SocketIO event name.
+    :param data: (any) Event data.
     :return: None
     """
 
+    snapshot = freeze(data)
+    with event_conditions[event]:
+        event_data[event] = snapshot
+        event_generations[event] += 1
+        event_conditions[event].notify_all()
+
+
+class EventWaiter:
+    """
+    Waiter of 'wait_for_event'. A call that failed doesn't change anything on the server and isn't followed by a
+    broadcast, 'cancel()' the waiter then.
+    """
+
+    def __init__(self, event=None, generation=None):
+        self.event = event
+        self.generation = generation
+        self.expected = True
+
+    def cancel(self):
+        self.expected = False
+
+
+@contextmanager
+def wait_for_event(event, timeout=None):
+    """
+    Waits for the next broadcast of an event after the calls of the block. The broadcast and the answer of a call are
+    handled on different threads, so the answer may arrive before the broadcast is stored.
+
+    :param event: (str) SocketIO event name.
+    :param timeout: (float) Seconds to wait for the event. Defaults to 'settings.event_timeout'.
+    :return: (EventWaiter) Waiter object
+    """
+
+    with event_conditions[event]:
+        waiter = EventWaiter(event=event, generation=event_generations[event])
     try:
-        yield
+        yield waiter
     except:
         raise
     else:
-        timestamp = time.time()
-        while event_data[event] is None:
-            if time.time() - timestamp > 30:
-                raise TimeoutError("Event response timed out.")
-            time.sleep(0.01)
+        if waiter.expected:
+            _wait_for_event_data(event, timeout=timeout, after_generation=waiter.generation)
+
+
+def _wait_for_event_data(event, timeout=None, after_generation=None):
+    """
+    Waits until the first data for an event, or data after a generation, has been received
+
+    :param event: (str) SocketIO event name.
+    :param timeout: (float) Seconds to wait for the event. Defaults to 'settings.event_timeout'.
+    :param after_generation: (int) Wait for data received after this generation, see 'event_generations'.
+    :return: None
+    """
+
+    if timeout is None:
+        timeout = settings.event_timeout
+    condition = event_conditions[event]
+    with condition:
+        if after_generation is None:
+            received = condition.wait_for(lambda: event_data[event] is not None, timeout=timeout)
+        else:
+            received = condition.wait_for(lambda: event_generations[event] > after_generation, timeout=timeout)
+        if not received:
+            # Read-only '--cached' runs use the event data without the socketIO client, it's only imported here.
+            from socketio.exceptions import TimeoutError
+
+            raise TimeoutError("Event response timed out.")
 
 
-def get_event_data(event):
+def get_event_data(event, timeout=None):
     """
-    Get event data
+    Get event data. The data is a shared read-only snapshot, use 'copy()' or 'snapshots.thaw()' to modify it.
 
     :param event: (event) socketIO event
+    :param timeout: (float) Seconds to wait for the event. Defaults to 'settings.event_timeout'.
     :return: (dict) socketIO event data
     """
 
-    timestamp = time.time()
-    while event_data[event] is None:
-        if time.time() - timestamp > 30:
-            raise TimeoutError("Event response timed out.")
-        if event_data[event] == {} and event in monitor_events:
-            return []
-        time.sleep(0.01)
-    time.sleep(0.2)
-    return deepcopy(event_data[event].copy())
+    _wait_for_event_data(event, timeout=timeout)
+    return event_data[event]
 
 
 def connect_event():
@@ -90,7 +147,10 @@ def monitor_list_event(data):
     :return: None
     """
 
-    event_data[ioevents.monitor_list] = data
+    data = freeze(data)
+    rebuild_monitor_registry(data)
+    _set_event_data(ioevents.monitor_list, data)
+    persist_event_data(ioevents.monitor_list, data)
 
 
 def status_page_list_event(data):
@@ -101,7 +161,8 @@ def status_page_list_event(data):
     :return: None
     """
 
-    event_data[ioevents.status_page_list] = data
+    _set_event_data(ioevents.status_page_list, data)
+    persist_event_data(ioevents.status_page_list, data)
 
 
 def notification_list_event(data):
@@ -112,4 +173,44 @@ def notification_list_event(data):
     :return: None
     """
 
-    event_data[ioevents.notification_list] = data
+    _set_event_data(ioevents.notification_list, data)
+    persist_event_data(ioevents.notification_list, data)
+
+
+def heartbeat_event(data):
+    """
+    Stores a live heartbeat
+
+    :param data: (dict) Event data.
+    :return: None
+    """
+
+    add_heartbeats(monitor_id=data["monitorID"], heartbeats=[data])
+    if data.get("important"):
+        add_heartbeats(monitor_id=data["monitorID"], heartbeats=[data], important=True)
+
+
+def heartbeat_list_event(monitor_id, data, overwrite=False):
+    """
+    Stores recent heartbeats of a monitor
+
+    :param monitor_id: (int) Monitor ID.
+    :param data: (list) Heartbeats, oldest first.
+    :param overwrite: (bool) Replace stored heartbeats of the monitor.
+    :return: None
+    """
+
+    add_heartbeats(monitor_id=monitor_id, heartbeats=data, overwrite=overwrite)
+
+
+def important_heartbeat_list_event(monitor_id, data, overwrite=False):
+    """
+    Stores important (status change) heartbeats of a monitor
+
+    :param monitor_id: (int) Monitor ID.
+    :param data: (list) Important heartbeats, newest first.
+    :param overwrite: (bool) Replace stored important heartbeats of the monitor.
+    :return: None
+    """
+
+    add_heartbeats(monitor_id=monitor_id, heartbeats=list(reversed(data)), overwrite=overwrite, important=True)
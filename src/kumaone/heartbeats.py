@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+"""Heartbeats module for kumaone"""
+
+# Import builtin python libraries
+from array import array
+from datetime import datetime, timezone
+import math
+import threading
+
+# Import custom (local) python packages
+from . import settings
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+heartbeat_buffers = {}
+important_heartbeat_buffers = {}
+heartbeat_lock = threading.Lock()
+heartbeat_subscribers = []
+
+
+class HeartbeatBuffer:
+    """
+    Fixed size ring buffer of heartbeats of a single monitor. Status, ping (ms) and time (epoch seconds) are kept in
+    typed arrays, missing pings are stored as NaN.
+    """
+
+    __slots__ = ("size", "count", "position", "status", "ping", "time")
+
+    def __init__(self, size=None):
+        self.size = size
+        self.count = 0
+        self.position = 0
+        self.status = array("b", bytes(size))
+        self.ping = array("f", [math.nan]) * size
+        self.time = array("d", [0.0]) * size
+
+    def append(self, status=None, ping=None, time=None):
+        """
+        Appends a heartbeat, overwriting the oldest one if the buffer is full
+
+        :param status: (int) Heartbeat status, one of 'settings.monitor_status_mapping' values.
+        :param ping: (float) Response time in milliseconds.
+        :param time: (float) Heartbeat time in epoch seconds.
+        :return: None
+        """
+
+        self.status[self.position] = status
+        self.ping[self.position] = math.nan if ping is None else ping
+        self.time[self.position] = time
+        self.position = (self.position + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def clear(self):
+        """
+        Removes all heartbeats
+
+        :return: None
+        """
+
+        self.count = 0
+        self.position = 0
+
+    def _ordered(self, column=None):
+        start = (self.position - self.count) % self.size
+        if start + self.count <= self.size:
+            return column[start : start + self.count]
+        return column[start:] + column[: self.position]
+
+    def arrays(self):
+        """
+        Get heartbeats as typed arrays, oldest first
+
+        :return: (tuple) Status, ping and time arrays
+        """
+
+        return self._ordered(self.status), self._ordered(self.ping), self._ordered(self.time)
+
+    def __len__(self):
+        return self.count
+
+
+def _parse_heartbeat_time(value=None):
+    """
+    Parses uptime kuma heartbeat time. Times without timezone are UTC.
+
+    :param value: (str) Heartbeat time, e.g. '2024-01-31 12:00:00.123'.
+    :return: (float) Epoch seconds
+    """
+
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.replace("T", " ").rstrip("Z")
+    for time_format in ["%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"]:
+        try:
+            return datetime.strptime(value, time_format).replace(tzinfo=timezone.utc).timestamp()
+        except ValueError:
+            continue
+    return math.nan
+
+
+def _get_heartbeat_buffer(buffers=None, monitor_id=None):
+    monitor_id = int(monitor_id)
+    if monitor_id not in buffers:
+        buffers[monitor_id] = HeartbeatBuffer(size=settings.heartbeat_buffer_size)
+    return buffers[monitor_id]
+
+
+def add_heartbeats(monitor_id=None, heartbeats=None, overwrite=False, important=False):
+    """
+    Stores heartbeats of a monitor
+
+    :param monitor_id: (int) Monitor ID.
+    :param heartbeats: (list) Heartbeat dictionaries, oldest first.
+    :param overwrite: (bool) Remove stored heartbeats of the monitor first.
+    :param important: (bool) Heartbeats are important (status change) heartbeats.
+    :return: None
+    """
+
+    buffers = important_heartbeat_buffers if important else heartbeat_buffers
+    with heartbeat_lock:
+        heartbeat_buffer = _get_heartbeat_buffer(buffers=buffers, monitor_id=monitor_id)
+        if overwrite:
+            heartbeat_buffer.clear()
+        for heartbeat in heartbeats:
+            heartbeat_buffer.append(
+                status=heartbeat["status"],
+                ping=heartbeat.get("ping"),
+                time=_parse_heartbeat_time(heartbeat["time"]),
+            )
+    if not important:
+        for subscriber in list(heartbeat_subscribers):
+            subscriber(int(monitor_id))
+
+
+def subscribe_heartbeats(callback=None):
+    """
+    Subscribes to stored heartbeats. The callback is called with the monitor ID from the socketIO event thread,
+    so it should return quickly.
+
+    :param callback: (callable) Function to call with the monitor ID.
+    :return: None
+    """
+
+    heartbeat_subscribers.append(callback)
+
+
+def unsubscribe_heartbeats(callback=None):
+    """
+    Removes a heartbeat subscriber
+
+    :param callback: (callable) Subscribed function.
+    :return: None
+    """
+
+    if callback in heartbeat_subscribers:
+        heartbeat_subscribers.remove(callback)
+
+
+def get_uptime(monitor_id=None):
+    """
+    Get uptime of a monitor over its stored heartbeats. Down heartbeats count as downtime.
+
+    :param monitor_id: (int) Monitor ID.
+    :return: (float) Uptime percentage or None if there is no heartbeat
+    """
+
+    with heartbeat_lock:
+        heartbeat_buffer = heartbeat_buffers.get(int(monitor_id))
+        if not heartbeat_buffer:
+            return None
+        status = heartbeat_buffer._ordered(heartbeat_buffer.status)
+    return 100.0 * (len(status) - status.count(settings.monitor_status_mapping["down"])) / len(status)
+
+
+def get_heartbeats(monitor_id=None, limit=None, since=None, important=False):
+    """
+    Get stored heartbeats of a monitor, oldest first
+
+    :param monitor_id: (int) Monitor ID.
+    :param limit: (int) Return only the latest heartbeats.
+    :param since: (float) Return only heartbeats at or after this time, in epoch seconds.
+    :param important: (bool) Get important (status change) heartbeats.
+    :return: (list) (time, status, ping) tuples, ping is None if unknown
+    """
+
+    buffers = important_heartbeat_buffers if important else heartbeat_buffers
+    with heartbeat_lock:
+        heartbeat_buffer = buffers.get(int(monitor_id))
+        if heartbeat_buffer is None:
+            return []
+        status, ping, time = heartbeat_buffer.arrays()
+    heartbeats = [
+        (beat_time, beat_status, None if math.isnan(beat_ping) else beat_ping)
+        for beat_time, beat_status, beat_ping in zip(time, status, ping)
+        if since is None or beat_time >= since
+    ]
+    return heartbeats[-limit:] if limit else heartbeats
+
+
+def get_latest_heartbeat(monitor_id=None):
+    """
+    Get latest heartbeat of a monitor
+
+    :param monitor_id: (int) Monitor ID.
+    :return: (tuple) (time, status, ping) or None if there is no heartbeat
+    """
+
+    with heartbeat_lock:
+        heartbeat_buffer = heartbeat_buffers.get(int(monitor_id))
+        if not heartbeat_buffer:
+            return None
+        position = heartbeat_buffer.position - 1
+        ping = heartbeat_buffer.ping[position]
+        return heartbeat_buffer.time[position], heartbeat_buffer.status[position], None if math.isnan(ping) else ping
+
+
+def get_heartbeat_monitor_ids():
+    """
+    Get IDs of monitors that have stored heartbeats
+
+    :return: (list) Monitor IDs
+    """
+
+    with heartbeat_lock:
+        return sorted(monitor_id for monitor_id, heartbeat_buffer in heartbeat_buffers.items() if heartbeat_buffer)
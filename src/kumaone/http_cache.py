@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+"""HTTP response cache module for kumaone"""
+
+# Import builtin python libraries
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+# Import external python libraries
+from rich.console import Console
+
+# Import custom (local) python packages
+from . import settings
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+http_cache_connection = {"connection": None, "file": None}
+http_cache_lock = threading.Lock()
+
+
+def _connect_http_cache():
+    """
+    Get the HTTP response cache database connection. The database is opened and its table is created once, the
+    connection is shared by all threads and used with 'http_cache_lock' held.
+
+    :return: (Connection) SQLite connection
+    """
+
+    http_cache_file = Path(settings.http_cache_file)
+    if http_cache_connection["connection"] is not None and http_cache_connection["file"] == http_cache_file:
+        return http_cache_connection["connection"]
+    if http_cache_connection["connection"] is not None:
+        http_cache_connection["connection"].close()
+        http_cache_connection["connection"] = None
+    http_cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    http_cache = sqlite3.connect(http_cache_file, timeout=settings.timeout, check_same_thread=False)
+    http_cache.execute(
+        "CREATE TABLE IF NOT EXISTS responses "
+        "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT NOT NULL, updated_at REAL NOT NULL)"
+    )
+    http_cache.commit()
+    http_cache_connection["connection"] = http_cache
+    http_cache_connection["file"] = http_cache_file
+    return http_cache
+
+
+def get_cached_response(url=None):
+    """
+    Get the cached response of a URL
+
+    :param url: (str) Request URL.
+    :return: (dict) 'etag', 'last_modified' and 'body' of the cached response or None if it isn't cached
+    """
+
+    try:
+        with http_cache_lock:
+            http_cache = _connect_http_cache()
+            row = http_cache.execute("SELECT etag, last_modified, body FROM responses WHERE url = ?", (url,)).fetchone()
+    except (OSError, sqlite3.Error) as err:
+        console.print(f":orange_circle: Could not read HTTP cache. Error: {err}", style="logging.level.warning")
+        return None
+    if row is None:
+        return None
+    return {"etag": row[0], "last_modified": row[1], "body": row[2]}
+
+
+def get_validator_headers(cached_response=None):
+    """
+    Get conditional request headers for a cached response
+
+    :param cached_response: (dict) Cached response, see 'get_cached_response()'.
+    :return: (dict) 'If-None-Match' and 'If-Modified-Since' headers
+    """
+
+    headers = {}
+    if cached_response is None:
+        return headers
+    if cached_response["etag"]:
+        headers["If-None-Match"] = cached_response["etag"]
+    if cached_response["last_modified"]:
+        headers["If-Modified-Since"] = cached_response["last_modified"]
+    return headers
+
+
+def store_response(url=None, etag=None, last_modified=None, body=None):
+    """
+    Stores a response in the HTTP cache. Responses without validators can't be revalidated and aren't stored.
+
+    :param url: (str) Request URL.
+    :param etag: (str) 'ETag' response header.
+    :param last_modified: (str) 'Last-Modified' response header.
+    :param body: (str) Response body.
+    :return: None
+    """
+
+    if not etag and not last_modified:
+        return
+    try:
+        with http_cache_lock:
+            http_cache = _connect_http_cache()
+            with http_cache:
+                http_cache.execute(
+                    "INSERT OR REPLACE INTO responses (url, etag, last_modified, body, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (url, etag, last_modified, body, time.time()),
+                )
+    except (OSError, sqlite3.Error) as err:
+        console.print(f":orange_circle: Could not update HTTP cache. Error: {err}", style="logging.level.warning")
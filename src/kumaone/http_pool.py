@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""HTTP connection pool module for kumaone"""
+
+# Import builtin python libraries
+from concurrent.futures import ThreadPoolExecutor
+import json
+import threading
+
+# Import custom (local) python packages
+from .http_cache import get_cached_response, get_validator_headers, store_response
+from . import settings
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Get the shared HTTP session. Connections are kept alive and reused, so requests to the same uptime kuma server
+    don't repeat the TCP and TLS handshakes. The session is created on first use.
+
+    :return: (object) requests.Session object
+    """
+
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=settings.http_pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+    return _session
+
+
+def get_json(url=None, timeout=None, use_cache=True):
+    """
+    Gets a json response over the shared HTTP session. Responses with an 'ETag' or 'Last-Modified' header are
+    stored in the HTTP cache and revalidated with a conditional request, an unchanged response is read from the cache.
+
+    :param url: (str) Request URL.
+    :param timeout: (float) Request timeout in seconds.
+    :param use_cache: (bool) Use the HTTP cache.
+    :return: (any) Decoded json response
+    """
+
+    cached_response = get_cached_response(url=url) if use_cache else None
+    response = get_session().get(url, timeout=timeout, headers=get_validator_headers(cached_response))
+    if response.status_code == 304 and cached_response is not None:
+        return json.loads(cached_response["body"])
+    data = response.json()
+    if use_cache and response.status_code == 200:
+        store_response(
+            url=url,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            body=response.text,
+        )
+    return data
+
+
+def run_concurrently(function=None, items=None, window=None):
+    """
+    Runs a function for every item with at most 'window' calls in flight. The window is limited to the size of the
+    connection pool, so no connection is opened and thrown away.
+
+    :param function: (callable) Function that takes one item.
+    :param items: (list) Items to run the function for.
+    :param window: (int) Number of calls in flight. Defaults to 'settings.http_pool_size'.
+    :return: (list) Results in the order of the items
+    """
+
+    items = list(items)
+    window = min(window or settings.http_pool_size, settings.http_pool_size, len(items))
+    if window <= 1:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=window) as executor:
+        return list(executor.map(function, items))
@@ -3,27 +3,39 @@
 """Main module for kumaone"""
 
 # Import builtin python libraries
+from pathlib import Path
 
 # Import external python libraries
 from rich.console import Console
 import typer
 from typing_extensions import Annotated
-from typing import Optional
+from typing import List, Optional
 
 # Import custom (local) python packages
-from src.kumaone.cli import config_cli, monitor_cli, notification_cli, status_page_cli
-from src.kumaone.utils import app_info, version_callback
+from src.kumaone.cli.lazy_group import LazyGroup
+from src.kumaone.utils import app_info, log_manager, version_callback
 
 # Source code meta data
 __author__ = "Dalwar Hossain"
 __email__ = "dalwar23@pm.me"
 
+
+class KumaoneGroup(LazyGroup):
+    """
+    Kumaone command group. Sub-command modules are imported only when they are used.
+    """
+
+    lazy_subcommands = {
+        "monitor": "src.kumaone.cli.monitor_cli",
+        "config": "src.kumaone.cli.config_cli",
+        "status-page": "src.kumaone.cli.status_page_cli",
+        "notification": "src.kumaone.cli.notification_cli",
+        "agent": "src.kumaone.cli.agent_cli",
+    }
+
+
 # Create typer app and turn off debug mode by default
-app = typer.Typer()
-app.add_typer(monitor_cli.app, name="monitor")
-app.add_typer(config_cli.app, name="config")
-app.add_typer(status_page_cli.app, name="status-page")
-app.add_typer(notification_cli.app, name="notification")
+app = typer.Typer(cls=KumaoneGroup)
 state = {"log_level": "NOTSET"}
 console = Console()
 
@@ -41,6 +53,55 @@ def info(log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSE
     app_info(log_level=log_level)
 
 
+@app.command(name="apply", help="Make uptime kuma monitors match monitor data. Creates, updates and deletes only the difference.")
+def apply(
+    monitors: Annotated[Path, typer.Option(..., "--monitors", "-m", help="Monitor(s) data.")],
+    config_file: Annotated[
+        Optional[Path], typer.Option(..., "--config", "-c", help="Uptime kuma configuration file path.")
+    ] = Path.home().joinpath(".config/kumaone/kuma.yaml"),
+    prune: Annotated[bool, typer.Option(help="Delete monitors that are not part of the monitor data.")] = False,
+    dry_run: Annotated[bool, typer.Option(help="Only show the plan.")] = False,
+    window: Annotated[
+        int, typer.Option(..., "--window", "-w", min=1, help="Number of monitor creations in flight.")
+    ] = 1,
+    include: Annotated[
+        Optional[List[str]],
+        typer.Option(..., "--include", help="Only use files matching this glob, relative to the monitor directory."),
+    ] = None,
+    exclude: Annotated[
+        Optional[List[str]],
+        typer.Option(..., "--exclude", help="Skip files matching this glob, relative to the monitor directory."),
+    ] = None,
+    log_level: Annotated[str, typer.Option(help="Set log level.")] = "NOTSET",
+):
+    """
+    Make uptime kuma monitors match monitor data
+
+    :return: None
+    """
+
+    from src.kumaone.agent import run_operation
+    from src.kumaone.configs import check_config
+
+    if log_level:
+        state["log_level"] = log_level
+        logger = log_manager(log_level=log_level)
+
+    config_data = check_config(config_path=config_file, logger=logger)
+    run_operation(
+        "apply",
+        config_data=config_data,
+        log_level=log_level,
+        logger=logger,
+        data_path=str(Path(monitors).resolve()),
+        prune=prune,
+        dry_run=dry_run,
+        window=window,
+        include=include,
+        exclude=exclude,
+    )
+
+
 @app.callback()
 def mission_control(
     version: Annotated[Optional[bool], typer.Option("--version", callback=version_callback, is_eager=True)] = None,
@@ -4,6 +4,7 @@
 
 # Import builtin python libraries
 import json
+from pathlib import Path
 import sys
 
 # Import external python libraries
@@ -11,14 +12,15 @@ from rich.columns import Columns
 from rich.console import Console
 from rich import print
 from rich.table import Table
-import yaml
 
 # Import custom (local) python packages
-from .event_handlers import get_event_data, wait_for_event
+from .apply_cache import get_applied_file, get_monitor_fingerprint, record_applied_file
+from .event_handlers import _wait_for_event_data, get_event_data, wait_for_event
 from . import ioevents
 from .payload_handler import _get_monitor_payload
+from .registry import forget_monitor, get_monitor_by_id, get_monitor_by_name, register_monitor
 from .settings import get_missing_arguments
-from .utils import _sio_call
+from .utils import _get_file_hash, _read_data_file, _sio_call, _sio_call_pipelined
 
 # Source code meta data
 __author__ = "Dalwar Hossain"
@@ -36,21 +38,17 @@ def _check_monitor(monitor_name_to_check=None, monitor_id_to_check=None):
     :return: (dict) Monitor info dictionary
     """
 
-    current_monitors = get_event_data(ioevents.monitor_list).values()
-    monitor_exists = False
-    monitor_info = {}
-    for item in current_monitors:
-        if monitor_name_to_check is not None:
-            if item["name"] == monitor_name_to_check:
-                m_id = item["id"]
-                monitor_exists = True
-                monitor_info = {"name": item["name"], "id": m_id, "exists": monitor_exists}
-        elif monitor_id_to_check is not None:
-            if item["id"] == monitor_id_to_check:
-                monitor_exists = True
-                monitor_info = {"name": item["name"], "id": item["id"], "exists": monitor_exists}
-    if not monitor_exists:
-        monitor_info = {"name": monitor_name_to_check, "id": None, "exists": monitor_exists}
+    _wait_for_event_data(ioevents.monitor_list)
+    if monitor_name_to_check is not None:
+        monitor = get_monitor_by_name(monitor_name_to_check)
+    elif monitor_id_to_check is not None:
+        monitor = get_monitor_by_id(monitor_id_to_check)
+    else:
+        monitor = None
+    if monitor is not None:
+        monitor_info = {"name": monitor["name"], "id": monitor["id"], "exists": True}
+    else:
+        monitor_info = {"name": monitor_name_to_check, "id": None, "exists": False}
     return monitor_info
 
 
@@ -69,10 +67,13 @@ def _get_or_create_monitor_group(group_name=None):
     else:
         # logger.info(f":blue_circle: Monitor group: '{group_name}' does not exist.", style="logging.level.info")
         monitor_group_data_payload = _get_monitor_payload(type="group", name=group_name)
-        with wait_for_event(ioevents.monitor_list):
+        with wait_for_event(ioevents.monitor_list) as monitor_list_waiter:
             add_event_response = _sio_call("add", monitor_group_data_payload)
+            if not add_event_response["ok"]:
+                monitor_list_waiter.cancel()
         if add_event_response["ok"]:
             monitor_group_info = {"name": group_name, "id": add_event_response["monitorID"]}
+            register_monitor(monitor_id=add_event_response["monitorID"], name=group_name, monitor_type="group")
             console.print(
                 f":hatching_chick: Monitor group '{group_name}' has been created.", style="logging.level.info"
             )
@@ -104,10 +105,18 @@ def _get_or_create_process_monitor(input_data=None):
         # print(process_monitor_data_payload)
         missing_arguments = get_missing_arguments(process_monitor_data_payload)
         if not missing_arguments:
-            with wait_for_event(ioevents.monitor_list):
+            with wait_for_event(ioevents.monitor_list) as monitor_list_waiter:
                 add_event_response = _sio_call("add", process_monitor_data_payload)
+                if not add_event_response["ok"]:
+                    monitor_list_waiter.cancel()
             if add_event_response["ok"]:
                 process_monitor_info = {"name": process_monitor_name, "id": add_event_response["monitorID"]}
+                register_monitor(
+                    monitor_id=add_event_response["monitorID"],
+                    name=process_monitor_name,
+                    monitor_type=process_monitor_data_payload["type"],
+                    parent=process_monitor_data_payload["parent"],
+                )
                 console.print(
                     f":hatching_chick: Monitor process for '{input_data['name']}' has been created.",
                     style="logging.level.info",
@@ -145,6 +154,7 @@ def _delete_process_monitor_or_group(input_data=None):
         delete_event_response = _sio_call("deleteMonitor", monitor_id)
         if isinstance(delete_event_response, dict):
             if delete_event_response["ok"]:
+                forget_monitor(monitor_id)
                 console.print(f":ghost: '{monitor_name}' monitor deletion successful!", style="logging.level.info")
             else:
                 console.print(f":crab: '{monitor_name}' monitor deletion unsuccessful!", style="logging.level.warning")
@@ -159,46 +169,195 @@ def _delete_process_monitor_or_group(input_data=None):
         )
 
 
-def add_monitor(monitor_data_files=None, logger=None):
+def _add_monitors_pipelined(monitors=None, window=None):
+    """
+    Creates monitor groups first and then their process monitors, keeping a bounded window of 'add' calls in flight
+
+    :param monitors: (dict) Process monitor input data lists by group name
+    :param window: (int) Maximum number of 'add' calls in flight
+    :return: (dict) Monitor ID by monitor name
+    """
+
+    monitor_ids = {}
+    group_info = {}
+    groups_to_create = []
+    for group in monitors.keys():
+        if group == "default":
+            group_info[group] = {"name": None, "id": None}
+            continue
+        monitor_group_check = _check_monitor(monitor_name_to_check=group)
+        if monitor_group_check["exists"]:
+            console.print(f":sunflower: Monitor group '{group}' already exists.", style="logging.level.info")
+            group_info[group] = {"name": group, "id": monitor_group_check["id"]}
+        else:
+            groups_to_create.append(group)
+    monitor_ids.update({group: info["id"] for group, info in group_info.items() if group != "default"})
+    group_payloads = [_get_monitor_payload(type="group", name=group) for group in groups_to_create]
+    for group, add_event_response in zip(groups_to_create, _sio_call_pipelined("add", group_payloads, window=window)):
+        if add_event_response["ok"]:
+            group_info[group] = {"name": group, "id": add_event_response["monitorID"]}
+            monitor_ids[group] = add_event_response["monitorID"]
+            register_monitor(monitor_id=add_event_response["monitorID"], name=group, monitor_type="group")
+            console.print(f":hatching_chick: Monitor group '{group}' has been created.", style="logging.level.info")
+        else:
+            console.print(f":red_circle: Error! {add_event_response.get('msg')}", style="logging.level.error")
+
+    process_monitor_payloads = []
+    queued_names = set()
+    for group, group_monitors in monitors.items():
+        if group not in group_info:
+            console.print(
+                f":potato: Group creation failed! Couldn't create group: '{group}'", style="logging.level.info"
+            )
+            continue
+        for input_data in group_monitors:
+            if not isinstance(input_data, dict):
+                console.print(f":gloves: Monitor process data malformed, please check input.", style="logging.level.error")
+                sys.exit(1)
+            process_monitor_name = input_data["name"]
+            process_monitor_check = _check_monitor(monitor_name_to_check=process_monitor_name)
+            if process_monitor_name in queued_names or process_monitor_check["exists"]:
+                console.print(
+                    f":sunflower: Monitor process '{process_monitor_name}' already exists.", style="logging.level.info"
+                )
+                monitor_ids.setdefault(process_monitor_name, process_monitor_check["id"])
+                continue
+            if group != "default":
+                input_data = {**input_data, "parent": group_info[group]["id"]}
+            process_monitor_data_payload = _get_monitor_payload(**input_data)
+            missing_arguments = get_missing_arguments(process_monitor_data_payload)
+            if missing_arguments:
+                flat_missing_arguments = ", ".join([f"'{item}'" for item in missing_arguments])
+                console.print(
+                    f":nut_and_bolt: Missing arguments for monitor process '{process_monitor_name}'. Missing {flat_missing_arguments} key(s).",
+                    style="logging.level.error",
+                )
+                sys.exit(1)
+            queued_names.add(process_monitor_name)
+            process_monitor_payloads.append(process_monitor_data_payload)
+    add_event_responses = _sio_call_pipelined("add", process_monitor_payloads, window=window)
+    for payload, add_event_response in zip(process_monitor_payloads, add_event_responses):
+        if add_event_response["ok"]:
+            monitor_ids[payload["name"]] = add_event_response["monitorID"]
+            register_monitor(
+                monitor_id=add_event_response["monitorID"],
+                name=payload["name"],
+                monitor_type=payload["type"],
+                parent=payload["parent"],
+            )
+            console.print(
+                f":hatching_chick: Monitor process for '{payload['name']}' has been created.",
+                style="logging.level.info",
+            )
+        else:
+            console.print(f":red_circle: Error! {add_event_response.get('msg')}", style="logging.level.error")
+    return monitor_ids
+
+
+def _add_monitors_serial(monitors=None):
+    """
+    Creates monitor groups and their process monitors one by one
+
+    :param monitors: (dict) Process monitor input data lists by group name
+    :return: (dict) Monitor ID by monitor name
+    """
+
+    monitor_ids = {}
+    groups = [group for group in monitors.keys()]
+    for group in groups:
+        print(f"-" * 38 + f" {group} ".upper() + f"-" * (40 - len(group)))
+        if group == "default":
+            monitor_group_info = {"name": None, "id": None}
+        else:
+            monitor_group_info = _get_or_create_monitor_group(group_name=group)
+            monitor_ids[group] = monitor_group_info["id"]
+        if monitor_group_info:
+            for input_data in monitors[group]:
+                if isinstance(input_data, dict):
+                    if group == "default":
+                        pass
+                    else:
+                        input_data = {**input_data, "parent": monitor_group_info["id"]}
+                    process_monitor_info = _get_or_create_process_monitor(input_data=input_data)
+                    if process_monitor_info:
+                        monitor_ids[input_data["name"]] = process_monitor_info["id"]
+                else:
+                    console.print(
+                        f":gloves: Monitor process data malformed, please check input.",
+                        style="logging.level.error",
+                    )
+                    sys.exit(1)
+        else:
+            console.print(
+                f":potato: Group creation failed! Couldn't create group: '{group}'", style="logging.level.info"
+            )
+            console.print(f":red_circle: Message: {monitor_group_info}", style="logging.level.error")
+    return monitor_ids
+
+
+def _get_applied_monitors(monitors=None, monitor_ids=None):
+    """
+    Get apply cache records of the monitors of a monitor file. The fields of the monitor payload are fingerprinted
+    as the server reports them, so that later changes on the server can be detected.
+
+    :param monitors: (dict) Process monitor input data lists by group name
+    :param monitor_ids: (dict) Monitor ID by monitor name
+    :return: (dict) Monitor ID, fields and fingerprint by monitor name or None if a monitor isn't listed yet
+    """
+
+    applied_monitors = {}
+    for group, group_monitors in monitors.items():
+        if group != "default":
+            applied_monitors[group] = {"type": "group", "name": group}
+        for input_data in group_monitors:
+            applied_monitors[input_data["name"]] = input_data
+    monitor_list = get_event_data(ioevents.monitor_list)
+    monitor_records = {}
+    for monitor_name, input_data in applied_monitors.items():
+        monitor = monitor_list.get(str(monitor_ids.get(monitor_name)))
+        if monitor is None:
+            return None
+        fields = sorted(field for field in _get_monitor_payload(**input_data) if field in monitor)
+        monitor_records[monitor_name] = {
+            "id": monitor["id"],
+            "fields": fields,
+            "fingerprint": get_monitor_fingerprint(monitor=monitor, fields=fields),
+        }
+    return monitor_records
+
+
+def add_monitor(monitor_data_files=None, logger=None, window=1, use_cache=False):
     """
     Adds one or more monitor(s)
 
     :param monitor_data_files: (list) Data file path(s)
     :param logger: (object) Logger object
+    :param window: (int) Number of 'add' calls kept in flight. Values above 1 enable pipelined creation.
+    :param use_cache: (bool) Skip monitor files that were applied before and didn't change since.
     :return: None
     """
 
     for monitor_file in monitor_data_files:
-        with open(monitor_file) as monitors_:
-            monitors = yaml.safe_load(monitors_)["monitors"]
-            groups = [group for group in monitors.keys()]
-            for group in groups:
-                print(f"-" * 38 + f" {group} ".upper() + f"-" * (40 - len(group)))
-                if group == "default":
-                    monitor_group_info = {"name": None, "id": None}
-                else:
-                    monitor_group_info = _get_or_create_monitor_group(group_name=group)
-                if monitor_group_info:
-                    for input_data in monitors[group]:
-                        if isinstance(input_data, dict):
-                            if group == "default":
-                                pass
-                            else:
-                                input_data.update({"parent": monitor_group_info["id"]})
-                            process_monitor_info = _get_or_create_process_monitor(input_data=input_data)
-                            if process_monitor_info:
-                                pass
-                        else:
-                            console.print(
-                                f":gloves: Monitor process data malformed, please check input.",
-                                style="logging.level.error",
-                            )
-                            sys.exit(1)
-                else:
-                    console.print(
-                        f":potato: Group creation failed! Couldn't create group: '{group}'", style="logging.level.info"
-                    )
-                    console.print(f":red_circle: Message: {monitor_group_info}", style="logging.level.error")
+        if use_cache:
+            file_hash = _get_file_hash(monitor_file)
+            _wait_for_event_data(ioevents.monitor_list)
+            if get_applied_file(file_hash=file_hash) is not None:
+                logger.info(f"{monitor_file} is unchanged since the last run.")
+                console.print(
+                    f":zzz: '{Path(monitor_file).name}' is unchanged since the last run. Skipping...",
+                    style="logging.level.info",
+                )
+                continue
+        monitors = _read_data_file(monitor_file)["monitors"]
+        if window > 1:
+            print(f"-" * 38 + f" {Path(monitor_file).name} " + f"-" * (40 - len(Path(monitor_file).name)))
+            monitor_ids = _add_monitors_pipelined(monitors=monitors, window=window)
+        else:
+            monitor_ids = _add_monitors_serial(monitors=monitors)
+        if use_cache:
+            applied_monitors = _get_applied_monitors(monitors=monitors, monitor_ids=monitor_ids)
+            if applied_monitors is not None:
+                record_applied_file(file_hash=file_hash, data_file=monitor_file, monitors=applied_monitors)
     print("-" * 80)
 
 
@@ -219,20 +378,19 @@ def delete_monitor(monitor_data_files=None, monitor_name=None, monitor_id=None,
         _delete_process_monitor_or_group(input_data={"id": monitor_id})
     elif monitor_data_files:
         for monitor_file in monitor_data_files:
-            with open(monitor_file, "r") as monitors_:
-                monitors = yaml.safe_load(monitors_)["monitors"]
-                groups = [group for group in monitors.keys()]
-                for group in groups:
-                    print(f"-" * 38 + f" {group} ".upper() + f"-" * (40 - len(group)))
-                    for process_monitor_data in monitors[group]:
-                        if isinstance(process_monitor_data, dict):
-                            _delete_process_monitor_or_group(input_data=process_monitor_data)
-                        else:
-                            console.print(
-                                f":gloves: Monitor process data malformed, please check input.",
-                                style="logging.level.error",
-                            )
-                    _delete_process_monitor_or_group(input_data={"name": group})
+            monitors = _read_data_file(monitor_file)["monitors"]
+            groups = [group for group in monitors.keys()]
+            for group in groups:
+                print(f"-" * 38 + f" {group} ".upper() + f"-" * (40 - len(group)))
+                for process_monitor_data in monitors[group]:
+                    if isinstance(process_monitor_data, dict):
+                        _delete_process_monitor_or_group(input_data=process_monitor_data)
+                    else:
+                        console.print(
+                            f":gloves: Monitor process data malformed, please check input.",
+                            style="logging.level.error",
+                        )
+                _delete_process_monitor_or_group(input_data={"name": group})
         print("-" * 80)
 
 
@@ -252,11 +410,11 @@ def list_monitors(monitor_id=None, show_groups=None, show_processes=None, verbos
     logger.debug(json.dumps(response, indent=4))
 
     if monitor_id:
-        for item in response:
-            if item["id"] == monitor_id:
-                console.print(f":cupcake: Details about monitor '{item['name']}'")
-                console.print(json.dumps(item, indent=4, sort_keys=True), style="logging.level.info")
-                return True
+        item = get_monitor_by_id(monitor_id)
+        if item is not None:
+            console.print(f":cupcake: Details about monitor '{item['name']}'")
+            console.print(json.dumps(item, indent=4, sort_keys=True), style="logging.level.info")
+            return True
         console.print(f":four_leaf_clover: Monitor with ID {monitor_id} does not exist.", style="logging.level.error")
     else:
         table = Table("id", "name")
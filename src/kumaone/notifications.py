@@ -5,7 +5,6 @@
 # Import builtin python libraries
 import json
 from pathlib import Path
-import yaml
 
 # Import external python libraries
 from rich.console import Console
@@ -16,6 +15,7 @@ from .event_handlers import get_event_data, wait_for_event
 from .notification_settings import notification_types, notification_providers
 from . import ioevents
 from .utils import _sio_call
+from .yaml_handler import load_yaml
 
 # Source code meta data
 __author__ = "Dalwar Hossain"
@@ -23,24 +23,48 @@ __email__ = "dalwar23@pm.me"
 
 console = Console()
 
+# Flattened notifications of the last notification list, see '_get_notification_index()'
+notification_index = {"source": None, "items": [], "by_name": {}, "by_id": {}}
 
-def _get_notification_by_name_or_id(response=None, notification_title=None, notification_id=None, logger=None):
+
+def _get_notification_index():
+    """
+    Get the notification index of the last notification list. Notification configs are JSON encoded, every
+    notification list is decoded once and the flattened notifications are indexed by name and id.
+
+    :return: (dict) Flattened notifications in list order, by name and by id
+    """
+
+    notification_list = get_event_data(ioevents.notification_list)
+    if notification_index["source"] is not notification_list:
+        items = []
+        by_name = {}
+        by_id = {}
+        for notification in notification_list:
+            flat_notification = {key: value for key, value in notification.items() if key != "config"}
+            flat_notification.update(json.loads(notification["config"]))
+            items.append(flat_notification)
+            by_name.setdefault(notification["name"], flat_notification)
+            by_id.setdefault(notification["id"], flat_notification)
+        notification_index.update({"source": notification_list, "items": items, "by_name": by_name, "by_id": by_id})
+    return notification_index
+
+
+def _get_notification_by_name_or_id(notification_title=None, notification_id=None, logger=None):
     """
     Get notification process details by name or id
 
-    :param response: (list) List of dictionaries with notification data.
     :param notification_title: (str) The name of the notification process.
     :param notification_id: (int) id of the notification process.
     :param logger: (object) Logger object instance.
-    :return: (dict) notification details.
+    :return: (list) notification details or None if the notification doesn't exist.
     """
 
-    for _notification in response:
-        logger.debug(f"Notification id: {notification_id}")
-        logger.debug(f"Notification name: {notification_title}")
-        if _notification["name"] == notification_title or _notification["id"] == notification_id:
-            response = [_notification]
-            return response
+    logger.debug(f"Notification id: {notification_id}")
+    logger.debug(f"Notification name: {notification_title}")
+    index = _get_notification_index()
+    notification = index["by_name"].get(notification_title) or index["by_id"].get(notification_id)
+    return [notification] if notification is not None else None
 
 
 def _get_notification_id_by_name(notification_title=None, logger=None):
@@ -52,12 +76,9 @@ def _get_notification_id_by_name(notification_title=None, logger=None):
     :return: (int) Notification id.
     """
 
-    response = get_event_data(ioevents.notification_list)
-    logger.debug(f"Notification List: {response}")
-    for _notification in response:
-        if _notification["name"] == notification_title:
-            return _notification["id"]
-    return -1
+    notification = _get_notification_index()["by_name"].get(notification_title)
+    logger.debug(f"Notification: {notification}")
+    return notification["id"] if notification is not None else -1
 
 
 def add_notification(notifications_file_path=None, interactive=None, logger=None, verbose=None):
@@ -73,7 +94,7 @@ def add_notification(notifications_file_path=None, interactive=None, logger=None
 
     if notifications_file_path is not None and Path(notifications_file_path).is_file():
         with open(notifications_file_path) as notification_config_file:
-            notification_configs = yaml.safe_load(notification_config_file)["notifications"]
+            notification_configs = load_yaml(notification_config_file)["notifications"]
         logger.debug(notification_configs)
     for notification_config in notification_configs:
         required_args = ["name", "type", "isDefault", "applyExisting"]
@@ -96,8 +117,10 @@ def add_notification(notifications_file_path=None, interactive=None, logger=None
                 notification_title=payload["name"], logger=logger, check_existence=True
             )
             if not notification_provider_exists:
-                with wait_for_event(ioevents.notification_list):
+                with wait_for_event(ioevents.notification_list) as notification_list_waiter:
                     response = _sio_call("addNotification", (payload, None))
+                    if not response["ok"]:
+                        notification_list_waiter.cancel()
                     if verbose:
                         print(f"{payload['type']}: {response}")
                     else:
@@ -127,23 +150,13 @@ def list_notifications(verbose=None, notification_title=None, notification_id=No
     :return: None
     """
 
-    response = get_event_data(ioevents.notification_list)
-    logger.debug(json.dumps(response, indent=4, sort_keys=True))
-    # pretty print information
-    pretty_response = []
-    for notification in response:
-        flat_notification = notification.copy()
-        config = json.loads(flat_notification["config"])
-        del flat_notification["config"]
-        flat_notification.update(config)
-        pretty_response.append(flat_notification)
     if notification_title is not None or notification_id is not None:
         pretty_response = _get_notification_by_name_or_id(
-            response=pretty_response,
-            notification_title=notification_title,
-            notification_id=notification_id,
-            logger=logger,
+            notification_title=notification_title, notification_id=notification_id, logger=logger
         )
+    else:
+        pretty_response = _get_notification_index()["items"]
+        logger.debug(json.dumps(pretty_response, indent=4, sort_keys=True))
     if pretty_response:
         if check_existence:
             return True
@@ -212,7 +225,7 @@ def delete_notification(notifications_file_path=None, notification_title=None, l
     notification_provider_to_delete = []
     if notifications_file_path is not None and Path(notifications_file_path).is_file():
         with open(notifications_file_path, "r") as notification_config_file:
-            notification_configs = yaml.safe_load(notification_config_file)["notifications"]
+            notification_configs = load_yaml(notification_config_file)["notifications"]
         logger.debug(notification_configs)
         for notification_config in notification_configs:
             for _notification in notification_config.values():
@@ -226,8 +239,10 @@ def delete_notification(notifications_file_path=None, notification_title=None, l
     logger.debug(f"Notification provider IDs to delete: {notification_provider_to_delete}")
     if notification_provider_to_delete:
         for _notification_id in notification_provider_to_delete:
-            with wait_for_event(ioevents.notification_list):
+            with wait_for_event(ioevents.notification_list) as notification_list_waiter:
                 delete_event_response = _sio_call("deleteNotification", _notification_id)
+                if not delete_event_response["ok"]:
+                    notification_list_waiter.cancel()
                 if delete_event_response["ok"]:
                     console.print(
                         f":ghost: Notification provider with id: '{_notification_id}' has been deleted.",
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+"""Operations module for kumaone"""
+
+# Import custom (local) python packages
+from .apply import apply_monitors
+from .apply_cache import load_apply_cache
+from .beat_export import export_beats
+from .monitors import add_monitor, delete_monitor, list_monitors
+from .notifications import add_notification, delete_notification, list_notifications
+from .status_pages import add_status_page, delete_status_page, get_all_status_pages, get_satus_page, list_status_pages
+from .utils import _check_data_path
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+
+def _apply(logger=None, data_path=None, prune=False, dry_run=False, window=1, include=None, exclude=None):
+    monitor_file_paths = _check_data_path(
+        data_path=data_path, logger=logger, key_to_check_for="monitors", include=include, exclude=exclude
+    )
+    apply_monitors(monitor_data_files=monitor_file_paths, logger=logger, prune=prune, dry_run=dry_run, window=window)
+
+
+def _monitor_add(logger=None, data_path=None, window=1, include=None, exclude=None, use_cache=True):
+    monitor_file_paths = _check_data_path(
+        data_path=data_path,
+        logger=logger,
+        key_to_check_for="monitors",
+        include=include,
+        exclude=exclude,
+        known_hashes=set(load_apply_cache()) if use_cache else None,
+    )
+    add_monitor(monitor_data_files=monitor_file_paths, logger=logger, window=window, use_cache=use_cache)
+
+
+def _monitor_delete(logger=None, data_path=None, monitor_name=None, monitor_id=None, include=None, exclude=None):
+    if data_path:
+        monitor_file_paths = _check_data_path(
+            data_path=data_path, logger=logger, key_to_check_for="monitors", include=include, exclude=exclude
+        )
+        delete_monitor(monitor_data_files=monitor_file_paths, logger=logger)
+    elif monitor_id:
+        delete_monitor(monitor_id=monitor_id, logger=logger)
+    elif monitor_name:
+        delete_monitor(monitor_name=monitor_name, logger=logger)
+
+
+def _monitor_export_beats(logger=None, output=None, output_format="csv", monitor_ids=None, hours=24, window=8):
+    export_beats(
+        output=output, output_format=output_format, monitor_ids=monitor_ids, hours=hours, window=window, logger=logger
+    )
+
+
+def _monitor_list(logger=None, groups=False, processes=False, verbose=False):
+    list_monitors(show_groups=groups, show_processes=processes, verbose=verbose, logger=logger)
+
+
+def _monitor_show(logger=None, monitor_id=None):
+    list_monitors(monitor_id=monitor_id, logger=logger)
+
+
+def _monitor_stats(logger=None, monitor_ids=None, hours=24, window=8):
+    # NumPy is only imported when statistics are requested.
+    from .stats import show_monitor_stats
+
+    show_monitor_stats(monitor_ids=monitor_ids, hours=hours, window=window, logger=logger)
+
+
+def _status_page_add(logger=None, data_path=None, title=None, slug=None, url=None, save=False):
+    if data_path:
+        status_page_file_paths = _check_data_path(data_path=data_path, logger=logger, key_to_check_for="status_pages")
+        add_status_page(status_page_data_files=status_page_file_paths, logger=logger, url=url, save=save)
+    else:
+        add_status_page(status_page_title=title, status_page_slug=slug, logger=logger)
+
+
+def _status_page_delete(logger=None, data_path=None, slug=None):
+    if data_path:
+        status_page_file_paths = _check_data_path(data_path=data_path, logger=logger, key_to_check_for="status_pages")
+        delete_status_page(status_page_data_files=status_page_file_paths, logger=logger)
+    else:
+        delete_status_page(status_page_slug=slug, logger=logger)
+
+
+def _status_page_list(logger=None, verbose=False):
+    list_status_pages(verbose=verbose, logger=logger)
+
+
+def _status_page_show(logger=None, slug=None, url=None):
+    get_satus_page(slug=slug, logger=logger, url=url, show_details=True)
+
+
+def _status_page_show_all(logger=None, url=None, window=None, verbose=False):
+    get_all_status_pages(url=url, window=window, verbose=verbose, logger=logger)
+
+
+def _notification_add(logger=None, data_path=None, interactive=False, verbose=False):
+    add_notification(notifications_file_path=data_path, interactive=interactive, verbose=verbose, logger=logger)
+
+
+def _notification_list(logger=None, verbose=False):
+    list_notifications(verbose=verbose, logger=logger)
+
+
+def _notification_show(logger=None, notification_title=None, notification_id=None, verbose=False):
+    list_notifications(
+        verbose=verbose, notification_title=notification_title, notification_id=notification_id, logger=logger
+    )
+
+
+def _notification_delete(logger=None, data_path=None, notification_title=None, verbose=None):
+    delete_notification(
+        notifications_file_path=data_path, notification_title=notification_title, verbose=verbose, logger=logger
+    )
+
+
+# Operations that need a logged-in server connection. Keyword arguments must be JSON serializable,
+# so that the operation can be forwarded to a running kumaone agent.
+operations = {
+    "apply": _apply,
+    "monitor.add": _monitor_add,
+    "monitor.delete": _monitor_delete,
+    "monitor.export_beats": _monitor_export_beats,
+    "monitor.list": _monitor_list,
+    "monitor.show": _monitor_show,
+    "monitor.stats": _monitor_stats,
+    "notification.add": _notification_add,
+    "notification.delete": _notification_delete,
+    "notification.list": _notification_list,
+    "notification.show": _notification_show,
+    "status_page.add": _status_page_add,
+    "status_page.delete": _status_page_delete,
+    "status_page.list": _status_page_list,
+    "status_page.show": _status_page_show,
+    "status_page.show_all": _status_page_show_all,
+}
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+
+"""Recorder module for kumaone"""
+
+# Import builtin python libraries
+import atexit
+from collections import deque
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Import external python libraries
+from rich.console import Console
+import socketio
+
+# Import custom (local) python packages
+from .__about__ import __version__ as version
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+record_file_env = "KUMAONE_RECORD"
+replay_file_env = "KUMAONE_REPLAY"
+# Events that are triggered by the socketIO client itself, not sent by the server
+client_events = ["connect", "connect_error", "disconnect", "__disconnect_final"]
+login_events = ["login", "loginByToken"]
+redacted = "<redacted>"
+
+
+def _get_args(data=None):
+    # Tuple data is sent as multiple arguments.
+    return list(data) if isinstance(data, tuple) else [data]
+
+
+def _redact_emit_args(event=None, args=None):
+    """
+    Redacts credentials from the arguments of an emitted event. Recordings are shared to reproduce issues, so
+    passwords and login tokens must not be written to them. Replays match emits by event name, not by arguments.
+
+    :param event: (str) Event name.
+    :param args: (list) Event arguments.
+    :return: (list) Arguments safe to record
+    """
+
+    if event in login_events:
+        return [redacted for _ in args]
+    return args
+
+
+def _redact_ack_args(event=None, args=None):
+    """
+    Redacts the login token from the acknowledgement of a login event
+
+    :param event: (str) Event name.
+    :param args: (list) Acknowledgement arguments.
+    :return: (list) Arguments safe to record
+    """
+
+    if event in login_events:
+        return [{**arg, "token": redacted} if isinstance(arg, dict) and "token" in arg else arg for arg in args]
+    return args
+
+
+class _RecordWriter:
+    """
+    Writes records to a gzip compressed NDJSON file. Every record has a 'type', the seconds since the recording
+    started in 't' and its event data.
+    """
+
+    def __init__(self, record_file=None):
+        # Recorded events hold monitor and notification configs, so the file is only readable by the current user.
+        self.raw_file = os.fdopen(os.open(record_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb")
+        self.record_file = gzip.open(self.raw_file, "wt", encoding="utf-8")
+        self.started_at = time.monotonic()
+        self.lock = threading.Lock()
+        self.sequence = 0
+        self.write({"type": "header", "version": version, "started_at": time.time()})
+        atexit.register(self.close)
+
+    def next_sequence(self):
+        with self.lock:
+            self.sequence += 1
+            return self.sequence
+
+    def write(self, record=None):
+        line = json.dumps({**record, "t": round(time.monotonic() - self.started_at, 6)}, default=str)
+        with self.lock:
+            if not self.record_file.closed:
+                self.record_file.write(line + "\n")
+
+    def close(self):
+        with self.lock:
+            self.record_file.close()
+            self.raw_file.close()
+
+
+class RecordingClient(socketio.Client):
+    """
+    SocketIO client that records every emitted event, its acknowledgement and every server event.
+    """
+
+    def __init__(self, record_file=None, **kwargs):
+        super().__init__(**kwargs)
+        self.record_writer = _RecordWriter(record_file=record_file)
+
+    def emit(self, event, data=None, namespace=None, callback=None):
+        sequence = self.record_writer.next_sequence()
+        self.record_writer.write(
+            {"type": "emit", "seq": sequence, "event": event, "args": _redact_emit_args(event, _get_args(data))}
+        )
+        if callback is not None:
+            original_callback = callback
+
+            def callback(*args):
+                self.record_writer.write(
+                    {"type": "ack", "seq": sequence, "event": event, "args": _redact_ack_args(event, list(args))}
+                )
+                return original_callback(*args)
+
+        return super().emit(event, data=data, namespace=namespace, callback=callback)
+
+    def _trigger_event(self, event, namespace, *args):
+        if event not in client_events:
+            self.record_writer.write({"type": "event", "event": event, "args": list(args)})
+        return super()._trigger_event(event, namespace, *args)
+
+    def record_http(self, url=None, response=None):
+        self.record_writer.write({"type": "http", "url": url, "response": response})
+
+
+class ReplayClient:
+    """
+    Stand-in for the socketIO client that plays a recording back without a server. Emitted events are matched to
+    recorded ones by event name and in order, and are answered with the recorded acknowledgement. Server events
+    are delivered in recorded order, everything the server sent before the next recorded emit is delivered
+    before an emit returns. Nothing waits, so a replay shows the client side cost of a run.
+    """
+
+    def __init__(self, replay_file=None):
+        with gzip.open(replay_file, "rt", encoding="utf-8") as records:
+            self.records = [json.loads(line) for line in records]
+        self.handlers = {}
+        self.position = 0
+        self.acks = {}
+        self.answered = set()
+        self.callbacks = {}
+        self.http_responses = {}
+        self.emits = {}
+        for record in self.records:
+            if record["type"] == "emit":
+                self.emits.setdefault(record["event"], deque()).append(record["seq"])
+        self.connected = False
+        self.lock = threading.RLock()
+
+    def on(self, event, handler=None):
+        if handler is None:
+            return lambda decorated_handler: self.on(event, decorated_handler)
+        self.handlers[event] = handler
+        return handler
+
+    def event(self, handler=None):
+        self.handlers[handler.__name__] = handler
+        return handler
+
+    def connect(self, url=None, **kwargs):
+        self.connected = True
+        self._play()
+
+    def disconnect(self):
+        self.connected = False
+
+    def start_background_task(self, target, *args, **kwargs):
+        thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=True)
+        thread.start()
+        return thread
+
+    def sleep(self, seconds=0):
+        time.sleep(seconds)
+
+    def _get_sequence(self, event=None):
+        if not self.emits.get(event) and event in login_events:
+            # The login method depends on the token cache, any recorded login answers it.
+            event = next((login_event for login_event in login_events if self.emits.get(login_event)), event)
+        if not self.emits.get(event):
+            console.print(f":x:  Recording has no more '{event}' events to replay.", style="logging.level.error")
+            sys.exit(1)
+        return self.emits[event].popleft()
+
+    def _deliver_ack(self, sequence=None):
+        callback = self.callbacks.pop(sequence, None)
+        if callback is not None:
+            callback(*self.acks.pop(sequence))
+
+    def _play(self, until_sequence=None):
+        """
+        Delivers recorded server events and acknowledgements until the acknowledgement of 'until_sequence' and
+        the server events that follow it up to the next recorded emit
+
+        :param until_sequence: (int) Sequence of an emitted event.
+        :return: None
+        """
+
+        while self.position < len(self.records):
+            record = self.records[self.position]
+            if record["type"] == "emit" and (until_sequence is None or until_sequence in self.answered):
+                break
+            self.position += 1
+            if record["type"] == "event" and record["event"] in self.handlers:
+                self.handlers[record["event"]](*record["args"])
+            elif record["type"] == "ack":
+                self.acks[record["seq"]] = record["args"]
+                self.answered.add(record["seq"])
+                self._deliver_ack(sequence=record["seq"])
+            elif record["type"] == "http":
+                # Responses are matched by path, so a recording can be replayed with another server URL.
+                self.http_responses.setdefault(urlsplit(record["url"]).path, deque()).append(record["response"])
+
+    def emit(self, event, data=None, namespace=None, callback=None):
+        with self.lock:
+            sequence = self._get_sequence(event=event)
+            if callback is not None:
+                self.callbacks[sequence] = callback
+            if sequence in self.acks:
+                self._deliver_ack(sequence=sequence)
+            self._play(until_sequence=sequence)
+
+    def call(self, event, data=None, namespace=None, timeout=None):
+        response = []
+        self.emit(event, data=data, namespace=namespace, callback=lambda *args: response.append(args))
+        if not response:
+            console.print(f":x:  Recording has no answer to '{event}' event.", style="logging.level.error")
+            sys.exit(1)
+        return response[0][0] if len(response[0]) == 1 else (response[0] or None)
+
+    def http_response(self, url=None):
+        with self.lock:
+            path = urlsplit(url).path
+            if not self.http_responses.get(path):
+                console.print(f":x:  Recording has no response of '{url}'.", style="logging.level.error")
+                sys.exit(1)
+            return self.http_responses[path].popleft()
+
+
+def get_client(**kwargs):
+    """
+    Get the socketIO client. Recording and replay are enabled with the 'KUMAONE_RECORD' and 'KUMAONE_REPLAY'
+    environment variables, which hold the path of the recording file.
+
+    :return: (object) SocketIO client
+    """
+
+    if os.environ.get(replay_file_env):
+        return ReplayClient(replay_file=os.environ[replay_file_env])
+    if os.environ.get(record_file_env):
+        return RecordingClient(record_file=os.environ[record_file_env], **kwargs)
+    return socketio.Client(**kwargs)
+
+
+def http_get_json(client=None, url=None, timeout=None):
+    """
+    Gets a json response from the uptime kuma http API. Responses are recorded and replayed like socketIO events.
+
+    :param client: (object) SocketIO client, see 'get_client()'.
+    :param url: (str) Request URL.
+    :param timeout: (float) Request timeout in seconds.
+    :return: (any) Decoded json response
+    """
+
+    if isinstance(client, ReplayClient):
+        return client.http_response(url=url)
+    from .http_pool import get_json
+
+    response = get_json(url=url, timeout=timeout)
+    if isinstance(client, RecordingClient):
+        client.record_http(url=url, response=response)
+    return response
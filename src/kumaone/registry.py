@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+"""Registry module for kumaone"""
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+monitor_registry = {"by_id": {}, "by_name": {}, "children": {}}
+
+
+def _build_monitor_indexes(monitor_list=None):
+    """
+    Builds monitor indexes by id, by name and by parent from a 'monitorList' event payload
+
+    :param monitor_list: (dict) Monitor list event data, keyed by monitor id.
+    :return: (dict) Monitor indexes
+    """
+
+    by_id = {}
+    by_name = {}
+    children = {}
+    if monitor_list:
+        for monitor in monitor_list.values():
+            by_id[monitor["id"]] = monitor
+            by_name[monitor["name"]] = monitor
+            children.setdefault(monitor.get("parent"), []).append(monitor["id"])
+    return {"by_id": by_id, "by_name": by_name, "children": children}
+
+
+def rebuild_monitor_registry(monitor_list=None):
+    """
+    Rebuilds monitor registry indexes from a 'monitorList' event payload
+
+    :param monitor_list: (dict) Monitor list event data, keyed by monitor id.
+    :return: None
+    """
+
+    monitor_registry.update(_build_monitor_indexes(monitor_list))
+
+
+def register_monitor(monitor_id=None, name=None, monitor_type=None, parent=None):
+    """
+    Registers a newly created monitor before the server re-broadcasts the monitor list
+
+    :param monitor_id: (int) Monitor ID returned by the 'add' event.
+    :param name: (str) Monitor name.
+    :param monitor_type: (str) Monitor type.
+    :param parent: (int) Parent (group) monitor ID.
+    :return: (dict) Registered monitor info
+    """
+
+    monitor = {"id": monitor_id, "name": name, "type": monitor_type, "parent": parent}
+    monitor_registry["by_id"][monitor_id] = monitor
+    monitor_registry["by_name"][name] = monitor
+    monitor_registry["children"].setdefault(parent, []).append(monitor_id)
+    return monitor
+
+
+def forget_monitor(monitor_id=None):
+    """
+    Removes a deleted monitor from the registry
+
+    :param monitor_id: (int) Monitor ID.
+    :return: None
+    """
+
+    monitor = monitor_registry["by_id"].pop(monitor_id, None)
+    if monitor is None:
+        return
+    if monitor_registry["by_name"].get(monitor["name"], {}).get("id") == monitor_id:
+        monitor_registry["by_name"].pop(monitor["name"])
+    siblings = monitor_registry["children"].get(monitor.get("parent"), [])
+    if monitor_id in siblings:
+        siblings.remove(monitor_id)
+    monitor_registry["children"].pop(monitor_id, None)
+
+
+def get_monitor_by_name(name=None):
+    """
+    Get monitor by name
+
+    :param name: (str) Monitor name.
+    :return: (dict) Monitor data or None if the monitor doesn't exist
+    """
+
+    return monitor_registry["by_name"].get(name)
+
+
+def resolve_monitor_names(names=None):
+    """
+    Resolves monitor names to monitor ids in one pass over the name index
+
+    :param names: (list) Monitor names.
+    :return: (tuple) Monitor id by name of the existing monitors and the list of unknown names
+    """
+
+    by_name = monitor_registry["by_name"]
+    monitor_ids = {}
+    unknown_names = {}
+    for name in names:
+        monitor = by_name.get(name)
+        if monitor is None:
+            unknown_names[name] = None
+        else:
+            monitor_ids[name] = monitor["id"]
+    return monitor_ids, list(unknown_names)
+
+
+def get_monitor_by_id(monitor_id=None):
+    """
+    Get monitor by id
+
+    :param monitor_id: (int) Monitor ID.
+    :return: (dict) Monitor data or None if the monitor doesn't exist
+    """
+
+    return monitor_registry["by_id"].get(monitor_id)
+
+
+def get_monitor_children(parent_id=None):
+    """
+    Get child monitor IDs of a monitor group
+
+    :param parent_id: (int) Parent (group) monitor ID. None for monitors at the root.
+    :return: (list) Child monitor IDs
+    """
+
+    return list(monitor_registry["children"].get(parent_id, []))
+
+
+def get_monitor_depth(monitor_id=None):
+    """
+    Get nesting depth of a monitor by walking its parents
+
+    :param monitor_id: (int) Monitor ID.
+    :return: (int) Number of parent groups, 0 for monitors at the root
+    """
+
+    depth = 0
+    seen_ids = {monitor_id}
+    monitor = monitor_registry["by_id"].get(monitor_id)
+    while monitor is not None and monitor.get("parent") is not None and monitor["parent"] not in seen_ids:
+        depth += 1
+        seen_ids.add(monitor["parent"])
+        monitor = monitor_registry["by_id"].get(monitor["parent"])
+    return depth
@@ -2,6 +2,9 @@
 
 """Settings module for kumaone"""
 
+# Import builtin python libraries
+from pathlib import Path
+
 # Import custom (local) python packages
 from . import ioevents as event
 
@@ -11,6 +14,12 @@ __email__ = "dalwar23@pm.me"
 
 accepted_status_codes = ["200-299"]
 
+agent_connect_timeout = 1
+
+agent_socket_file = Path.home().joinpath(".cache/kumaone/agent.sock")
+
+apply_cache_file = Path.home().joinpath(".cache/kumaone/apply-cache.json")
+
 authentication_methods = [
     "basic",
     "mtls",
@@ -21,6 +30,8 @@ authentication_methods = [
 
 docker_engine_connection_types = ["socket", "tcp"]
 
+event_timeout = 30
+
 event_data = {
     event.api_key_list: None,
     event.auto_login: None,
@@ -42,6 +53,14 @@ event_data = {
     event.uptime: None,
 }
 
+# Number of heartbeats kept per monitor
+heartbeat_buffer_size = 1000
+
+http_cache_file = Path.home().joinpath(".cache/kumaone/http-cache.db")
+
+# Number of kept-alive connections to the uptime kuma HTTP API, also the limit of concurrent HTTP requests
+http_pool_size = 16
+
 incident_styles = [
     "danger",
     "dark",
@@ -89,10 +108,22 @@ monitor_types = [
     "tailscale-ping",
 ]
 
+parallel_parsing_min_files = 32
+
 proxy_protocols = ["http", "https", "socks", "socks4", "socks5", "socks5h"]
 
+# 'user@url' of the logged-in uptime kuma server, set by 'connect_login'
+server_key = None
+
+state_cache_file = Path.home().joinpath(".cache/kumaone/state.db")
+
+# Seconds without a new list broadcast before the lists are written to the state cache
+state_cache_write_delay = 1
+
 timeout = 10
 
+token_cache_file = Path.home().joinpath(".cache/kumaone/tokens.json")
+
 
 def required_arguments_by_type(monitor_type=None):
     """
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""Snapshots module for kumaone"""
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+
+class FrozenDict(dict):
+    """
+    Read-only dictionary used to share event data between readers without copying it.
+    'copy()' returns a mutable shallow copy, 'thaw()' a fully mutable deep copy.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Event data snapshots are read-only. Use 'copy()' or 'thaw()' to get a mutable copy.")
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return thaw(self)
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def freeze(data=None):
+    """
+    Converts event data into a read-only snapshot. Dictionaries become FrozenDict and lists become tuples.
+
+    :param data: (any) Event data.
+    :return: (any) Read-only snapshot of the event data
+    """
+
+    if isinstance(data, FrozenDict):
+        return data
+    if isinstance(data, dict):
+        return FrozenDict((key, freeze(value)) for key, value in data.items())
+    if isinstance(data, (list, tuple)):
+        return tuple(freeze(item) for item in data)
+    return data
+
+
+def thaw(data=None):
+    """
+    Converts a read-only snapshot back into mutable python objects.
+
+    :param data: (any) Read-only snapshot.
+    :return: (any) Mutable copy of the snapshot
+    """
+
+    if isinstance(data, dict):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [thaw(item) for item in data]
+    return data
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+"""State cache module for kumaone"""
+
+# Import builtin python libraries
+import atexit
+import json
+import os
+from pathlib import Path
+import sqlite3
+import threading
+import time
+
+# Import external python libraries
+from rich.console import Console
+
+# Import custom (local) python packages
+from . import ioevents
+from . import settings
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+# Cached list events with their table and indexed columns
+cached_events = {
+    ioevents.monitor_list: ("monitors", ["name", "type", "parent"]),
+    ioevents.status_page_list: ("status_pages", ["slug", "title"]),
+    ioevents.notification_list: ("notifications", ["name"]),
+}
+# Last persisted row data by event and item id, to write only changed rows
+persisted_rows = {"server_key": None, "rows": {}}
+# Latest unwritten list data by event, see 'persist_event_data()'
+pending_event_data = {}
+state_cache_writer = {"connection": None, "file": None, "changed_at": 0.0, "timer": None}
+state_cache_lock = threading.RLock()
+
+
+def _connect_state_cache():
+    """
+    Get the state cache database connection. The database is opened and its tables and indexes are created once,
+    the connection is shared by all threads and used with 'state_cache_lock' held.
+
+    :return: (Connection) SQLite connection
+    """
+
+    state_cache_file = Path(settings.state_cache_file)
+    if state_cache_writer["connection"] is not None and state_cache_writer["file"] == state_cache_file:
+        return state_cache_writer["connection"]
+    if state_cache_writer["connection"] is not None:
+        state_cache_writer["connection"].close()
+        state_cache_writer["connection"] = None
+    state_cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # Cached lists hold monitor and notification configs with their credentials, so the database is only readable
+    # by the current user, also if it was created with a wider mode before.
+    os.close(os.open(state_cache_file, os.O_WRONLY | os.O_CREAT, 0o600))
+    os.chmod(state_cache_file, 0o600)
+    state_cache = sqlite3.connect(state_cache_file, timeout=settings.timeout, check_same_thread=False)
+    state_cache.execute(
+        "CREATE TABLE IF NOT EXISTS cached_events "
+        "(server_key TEXT NOT NULL, event TEXT NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (server_key, event))"
+    )
+    for table, columns in cached_events.values():
+        column_definitions = "".join(f", {column}" for column in columns)
+        state_cache.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"(server_key TEXT NOT NULL, id INTEGER NOT NULL{column_definitions}, data TEXT NOT NULL, "
+            f"PRIMARY KEY (server_key, id))"
+        )
+        for column in columns:
+            state_cache.execute(f"CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} (server_key, {column})")
+    state_cache.commit()
+    state_cache_writer["connection"] = state_cache
+    state_cache_writer["file"] = state_cache_file
+    return state_cache
+
+
+def _get_event_items(data=None):
+    """
+    Get items of a list event. Monitor and status page lists are keyed by id, notification list is a list.
+
+    :param data: (dict|list) Event data.
+    :return: (list) Items
+    """
+
+    return list(data.values()) if isinstance(data, dict) else list(data)
+
+
+def _write_event_data(server_key=None, event=None, data=None, updated_at=None):
+    """
+    Writes changes of a list event to the state cache. Only added, changed and removed items are written.
+
+    :param server_key: (str) 'user@url' of the uptime kuma server.
+    :param event: (str) SocketIO event name, one of 'cached_events'.
+    :param data: (dict|list) Event data.
+    :param updated_at: (float) Time the event data was received.
+    :return: None
+    """
+
+    table, columns = cached_events[event]
+    state_cache = _connect_state_cache()
+    if persisted_rows["server_key"] != server_key:
+        persisted_rows["server_key"] = server_key
+        persisted_rows["rows"] = {}
+    if event not in persisted_rows["rows"]:
+        persisted_rows["rows"][event] = dict(
+            state_cache.execute(f"SELECT id, data FROM {table} WHERE server_key = ?", (server_key,))
+        )
+    rows = persisted_rows["rows"][event]
+    items = {}
+    changed_items = []
+    for item in _get_event_items(data=data):
+        items[item["id"]] = json.dumps(item, sort_keys=True)
+        if rows.get(item["id"]) != items[item["id"]]:
+            column_values = [item.get(column) for column in columns]
+            changed_items.append((server_key, item["id"], *column_values, items[item["id"]]))
+    removed_ids = [(server_key, item_id) for item_id in rows if item_id not in items]
+    placeholders = ", ".join("?" for _ in range(len(columns) + 3))
+    with state_cache:
+        state_cache.executemany(
+            f"INSERT OR REPLACE INTO {table} (server_key, id, {', '.join(columns)}, data) VALUES ({placeholders})",
+            changed_items,
+        )
+        state_cache.executemany(f"DELETE FROM {table} WHERE server_key = ? AND id = ?", removed_ids)
+        state_cache.execute(
+            "INSERT OR REPLACE INTO cached_events (server_key, event, updated_at) VALUES (?, ?, ?)",
+            (server_key, event, updated_at),
+        )
+    persisted_rows["rows"][event] = items
+
+
+def _start_flush_timer(delay=None):
+    timer = threading.Timer(delay, _flush_when_idle)
+    timer.daemon = True
+    state_cache_writer["timer"] = timer
+    timer.start()
+
+
+def _flush_when_idle():
+    with state_cache_lock:
+        remaining = state_cache_writer["changed_at"] + settings.state_cache_write_delay - time.monotonic()
+        if remaining > 0:
+            _start_flush_timer(delay=remaining)
+            return
+        state_cache_writer["timer"] = None
+        flush_event_data()
+
+
+def persist_event_data(event=None, data=None):
+    """
+    Queues a list event for the state cache. Uptime kuma sends the full list after every change, so lists are
+    written once no new list arrived for 'settings.state_cache_write_delay' seconds, on disconnect and at exit.
+
+    :param event: (str) SocketIO event name, one of 'cached_events'.
+    :param data: (dict|list) Event data.
+    :return: None
+    """
+
+    if settings.server_key is None or event not in cached_events:
+        return
+    with state_cache_lock:
+        pending_event_data[event] = (settings.server_key, data, time.time())
+        state_cache_writer["changed_at"] = time.monotonic()
+        if state_cache_writer["timer"] is None:
+            _start_flush_timer(delay=settings.state_cache_write_delay)
+
+
+def flush_event_data():
+    """
+    Writes queued list events to the state cache
+
+    :return: None
+    """
+
+    with state_cache_lock:
+        if state_cache_writer["timer"] is not None:
+            state_cache_writer["timer"].cancel()
+            state_cache_writer["timer"] = None
+        pending_events = list(pending_event_data.items())
+        pending_event_data.clear()
+        try:
+            for event, (server_key, data, updated_at) in pending_events:
+                _write_event_data(server_key=server_key, event=event, data=data, updated_at=updated_at)
+        except (OSError, sqlite3.Error) as err:
+            console.print(f":orange_circle: Could not update state cache. Error: {err}", style="logging.level.warning")
+
+
+atexit.register(flush_event_data)
+
+
+def load_cached_event_data(server_key=None):
+    """
+    Reads cached list events of an uptime kuma server
+
+    :param server_key: (str) 'user@url' of the uptime kuma server.
+    :return: (dict) Event data and update time by event name. Events that were never cached are missing.
+    """
+
+    cached_event_data = {}
+    try:
+        with state_cache_lock:
+            state_cache = _connect_state_cache()
+            updated_at = dict(
+                state_cache.execute("SELECT event, updated_at FROM cached_events WHERE server_key = ?", (server_key,))
+            )
+            for event, (table, _) in cached_events.items():
+                if event not in updated_at:
+                    continue
+                items = [
+                    json.loads(item)
+                    for (item,) in state_cache.execute(
+                        f"SELECT data FROM {table} WHERE server_key = ? ORDER BY id", (server_key,)
+                    )
+                ]
+                if event == ioevents.notification_list:
+                    cached_event_data[event] = (items, updated_at[event])
+                else:
+                    cached_event_data[event] = ({str(item["id"]): item for item in items}, updated_at[event])
+    except (OSError, sqlite3.Error) as err:
+        console.print(f":x:  Could not read state cache. Error: {err}", style="logging.level.error")
+    return cached_event_data
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+
+"""Statistics module for kumaone"""
+
+# Import builtin python libraries
+import sys
+
+# Import external python libraries
+from rich.console import Console
+from rich.table import Table
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Import custom (local) python packages
+from .event_handlers import get_event_data
+from .heartbeats import heartbeat_buffers, heartbeat_lock
+from . import ioevents
+from .registry import get_monitor_by_id
+from . import settings
+from .utils import _sio_call_pipelined
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+percentiles = [50, 95, 99]
+
+
+def _check_numpy():
+    """
+    Checks if NumPy is installed
+
+    :return: None
+    """
+
+    if np is None:
+        console.print(
+            f":x:  Monitor statistics require NumPy. Install it with 'pip install kumaone\\[stats]'.",
+            style="logging.level.error",
+        )
+        sys.exit(1)
+
+
+def _build_history(monitor_ids=None, time=None, status=None, ping=None):
+    """
+    Builds heartbeat history of many monitors as flat arrays, sorted by monitor and time
+
+    :param monitor_ids: (ndarray) Monitor ID of every heartbeat.
+    :param time: (ndarray) Heartbeat times in epoch seconds.
+    :param status: (ndarray) Heartbeat statuses.
+    :param ping: (ndarray) Heartbeat pings in milliseconds, NaN if unknown.
+    :return: (dict) Heartbeat history
+    """
+
+    unique_monitor_ids, monitor_index = np.unique(monitor_ids, return_inverse=True)
+    order = np.argsort(time, kind="stable")
+    order = order[np.argsort(monitor_index[order], kind="stable")]
+    return {
+        "monitor_ids": unique_monitor_ids,
+        "monitor_index": monitor_index[order],
+        "time": time[order],
+        "status": status[order],
+        "ping": ping[order],
+    }
+
+
+def _parse_beat_times(beats=None):
+    """
+    Parses heartbeat times. Times are parsed in one vectorized call, one by one only if that fails.
+
+    :param beats: (list) Heartbeat dictionaries.
+    :return: (ndarray) Heartbeat times, NaT for times that can't be parsed
+    """
+
+    try:
+        return np.array([str(beat.get("time")).rstrip("Z") for beat in beats], dtype="datetime64[ms]")
+    except ValueError:
+        pass
+    times = np.full(len(beats), np.datetime64("NaT"), dtype="datetime64[ms]")
+    for index, beat in enumerate(beats):
+        try:
+            times[index] = np.datetime64(str(beat.get("time")).rstrip("Z"), "ms")
+        except ValueError:
+            pass
+    return times
+
+
+def history_from_beats(beats_by_monitor=None):
+    """
+    Builds heartbeat history from heartbeat dictionaries, e.g. 'getMonitorBeats' responses. Heartbeats whose time
+    can't be parsed are skipped.
+
+    :param beats_by_monitor: (dict) Heartbeat lists by monitor ID.
+    :return: (dict) Heartbeat history
+    """
+
+    _check_numpy()
+    beats = [beat for monitor_beats in beats_by_monitor.values() for beat in monitor_beats]
+    time = _parse_beat_times(beats=beats)
+    parsed = ~np.isnat(time)
+    if not parsed.all():
+        console.print(
+            f":orange_circle: Skipped {np.count_nonzero(~parsed)} heartbeats with an unknown time.",
+            style="logging.level.warning",
+        )
+    monitor_ids = np.repeat(
+        np.array(list(beats_by_monitor.keys()), dtype=np.int64),
+        [len(monitor_beats) for monitor_beats in beats_by_monitor.values()],
+    )
+    return _build_history(
+        monitor_ids=monitor_ids[parsed],
+        time=time[parsed].astype(np.int64) / 1000.0,
+        status=np.array([beat["status"] for beat in beats], dtype=np.int8)[parsed],
+        ping=np.array([beat.get("ping") for beat in beats], dtype=np.float64)[parsed],
+    )
+
+
+def history_from_heartbeat_buffers():
+    """
+    Builds heartbeat history from live heartbeats collected by the heartbeat event handlers
+
+    :return: (dict) Heartbeat history
+    """
+
+    _check_numpy()
+    monitor_ids, times, statuses, pings = [], [], [], []
+    with heartbeat_lock:
+        for monitor_id, heartbeat_buffer in heartbeat_buffers.items():
+            status, ping, time = heartbeat_buffer.arrays()
+            monitor_ids.append(np.full(len(time), monitor_id, dtype=np.int64))
+            times.append(np.frombuffer(time, dtype=np.float64))
+            statuses.append(np.frombuffer(status, dtype=np.int8))
+            pings.append(np.frombuffer(ping, dtype=np.float32).astype(np.float64))
+    if not monitor_ids:
+        return _build_history(
+            monitor_ids=np.empty(0, dtype=np.int64),
+            time=np.empty(0, dtype=np.float64),
+            status=np.empty(0, dtype=np.int8),
+            ping=np.empty(0, dtype=np.float64),
+        )
+    return _build_history(
+        monitor_ids=np.concatenate(monitor_ids),
+        time=np.concatenate(times),
+        status=np.concatenate(statuses),
+        ping=np.concatenate(pings),
+    )
+
+
+def _get_percentiles(monitor_index=None, ping=None, monitor_count=None, quantiles=None):
+    """
+    Computes latency percentiles of every monitor with linear interpolation
+
+    :param monitor_index: (ndarray) Monitor index of every heartbeat.
+    :param ping: (ndarray) Heartbeat pings.
+    :param monitor_count: (int) Number of monitors.
+    :param quantiles: (list) Quantiles between 0 and 1.
+    :return: (ndarray) Percentiles, one row per monitor, NaN for monitors without ping
+    """
+
+    valid = ~np.isnan(ping)
+    monitor_index, ping = monitor_index[valid], ping[valid]
+    # Pings are non-negative, so one sort of 'monitor index * (max ping + 1) + ping' groups pings by monitor.
+    ping_range = ping.max() + 1 if len(ping) else 1
+    ping = ping[np.argsort(monitor_index * ping_range + ping)]
+    counts = np.bincount(monitor_index, minlength=monitor_count)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result = np.full((monitor_count, len(quantiles)), np.nan)
+    has_ping = counts > 0
+    for column, quantile in enumerate(quantiles):
+        position = quantile * (counts[has_ping] - 1)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        lower_ping = ping[offsets[has_ping] + lower]
+        upper_ping = ping[offsets[has_ping] + upper]
+        result[has_ping, column] = lower_ping + (upper_ping - lower_ping) * (position - lower)
+    return result
+
+
+def compute_monitor_stats(history=None, start=None, end=None):
+    """
+    Computes uptime, latency percentiles, incidents and MTTR of every monitor in one vectorized pass.
+    Down heartbeats count as downtime, every other status counts as uptime.
+
+    :param history: (dict) Heartbeat history.
+    :param start: (float) Window start in epoch seconds. Defaults to the first heartbeat.
+    :param end: (float) Window end (exclusive) in epoch seconds. Defaults to after the last heartbeat.
+    :return: (dict) Statistic arrays, one item per monitor in 'monitor_ids'
+    """
+
+    _check_numpy()
+    monitor_count = len(history["monitor_ids"])
+    window = np.ones(len(history["time"]), dtype=bool)
+    if start is not None:
+        window &= history["time"] >= start
+    if end is not None:
+        window &= history["time"] < end
+    monitor_index = history["monitor_index"][window]
+    time = history["time"][window]
+    down = history["status"][window] == settings.monitor_status_mapping["down"]
+
+    beats = np.bincount(monitor_index, minlength=monitor_count)
+    down_beats = np.bincount(monitor_index, weights=down, minlength=monitor_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        uptime = np.where(beats > 0, 100.0 * (beats - down_beats) / beats, np.nan)
+
+    # An incident starts at the first down heartbeat of a monitor after an up heartbeat and is resolved by the
+    # next up heartbeat of the same monitor. Starts and resolutions alternate, because history is sorted.
+    same_monitor = np.concatenate(([False], monitor_index[1:] == monitor_index[:-1]))
+    previous_down = np.concatenate(([False], down[:-1])) & same_monitor
+    incident_starts = np.flatnonzero(down & ~previous_down)
+    incident_ends = np.flatnonzero(~down & previous_down)
+    incidents = np.bincount(monitor_index[incident_starts], minlength=monitor_count)
+    next_end = np.searchsorted(incident_ends, incident_starts)
+    resolved = next_end < len(incident_ends)
+    resolved[resolved] = (
+        monitor_index[incident_ends[next_end[resolved]]] == monitor_index[incident_starts[resolved]]
+    )
+    resolved_starts = incident_starts[resolved]
+    repair_time = time[incident_ends[next_end[resolved]]] - time[resolved_starts]
+    resolved_incidents = np.bincount(monitor_index[resolved_starts], minlength=monitor_count)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mttr = (
+            np.bincount(monitor_index[resolved_starts], weights=repair_time, minlength=monitor_count)
+            / resolved_incidents
+        )
+
+    latency = _get_percentiles(
+        monitor_index=monitor_index,
+        ping=history["ping"][window],
+        monitor_count=monitor_count,
+        quantiles=[percentile / 100 for percentile in percentiles],
+    )
+    monitor_stats = {
+        "monitor_ids": history["monitor_ids"],
+        "beats": beats,
+        "uptime": uptime,
+        "incidents": incidents,
+        "mttr": mttr,
+    }
+    for column, percentile in enumerate(percentiles):
+        monitor_stats[f"p{percentile}"] = latency[:, column]
+    return monitor_stats
+
+
+def _fetch_monitor_beats(monitor_ids=None, hours=None, window=None):
+    """
+    Fetches heartbeats of monitors with pipelined 'getMonitorBeats' calls
+
+    :param monitor_ids: (list) Monitor IDs.
+    :param hours: (float) Period in hours.
+    :param window: (int) Maximum number of calls in flight.
+    :return: (dict) Heartbeat lists by monitor ID
+    """
+
+    responses = _sio_call_pipelined(
+        "getMonitorBeats", [(monitor_id, hours) for monitor_id in monitor_ids], window=window
+    )
+    beats_by_monitor = {}
+    for monitor_id, response in zip(monitor_ids, responses):
+        if isinstance(response, dict) and response.get("ok"):
+            beats_by_monitor[monitor_id] = response["data"]
+        else:
+            message = response.get("msg") if isinstance(response, dict) else response
+            console.print(
+                f":orange_circle: Couldn't get heartbeats of monitor '{monitor_id}'. {message}",
+                style="logging.level.warning",
+            )
+    return beats_by_monitor
+
+
+def _format_stat(value=None, unit=""):
+    if np.isnan(value):
+        return "-"
+    return f"{value:.2f}{unit}"
+
+
+def show_monitor_stats(monitor_ids=None, hours=24, window=8, logger=None):
+    """
+    Shows uptime, latency percentiles, incidents and MTTR of process monitors
+
+    :param monitor_ids: (list) Monitor IDs. Defaults to all process monitors.
+    :param hours: (float) Period in hours.
+    :param window: (int) Maximum number of 'getMonitorBeats' calls in flight.
+    :param logger: (object) Logger object
+    :return: None
+    """
+
+    _check_numpy()
+    if not monitor_ids:
+        monitor_ids = [
+            monitor["id"] for monitor in get_event_data(ioevents.monitor_list).values() if monitor["type"] != "group"
+        ]
+    beats_by_monitor = _fetch_monitor_beats(monitor_ids=monitor_ids, hours=hours, window=window)
+    logger.debug(f"Fetched {sum(len(beats) for beats in beats_by_monitor.values())} heartbeats.")
+    monitor_stats = compute_monitor_stats(history=history_from_beats(beats_by_monitor=beats_by_monitor))
+
+    table = Table("id", "name", "beats", "uptime", "p50", "p95", "p99", "incidents", "mttr", title=f"Last {hours:g}h")
+    for index, monitor_id in enumerate(monitor_stats["monitor_ids"].tolist()):
+        monitor = get_monitor_by_id(monitor_id) or {}
+        table.add_row(
+            str(monitor_id),
+            monitor.get("name", ""),
+            str(monitor_stats["beats"][index]),
+            _format_stat(monitor_stats["uptime"][index], "%"),
+            _format_stat(monitor_stats["p50"][index], "ms"),
+            _format_stat(monitor_stats["p95"][index], "ms"),
+            _format_stat(monitor_stats["p99"][index], "ms"),
+            str(monitor_stats["incidents"][index]),
+            _format_stat(monitor_stats["mttr"][index], "s"),
+        )
+    console.print(table)
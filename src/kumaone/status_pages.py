@@ -5,21 +5,22 @@
 # Import builtin python libraries
 import json
 import sys
-import yaml
 
 # Import external python libraries
 from rich.console import Console
 from rich.table import Table
-import requests
 
 
 # Import custom (local) python packages
-from .event_handlers import get_event_data, wait_for_event
+from .apply_cache import _get_payload_fingerprint
+from .event_handlers import _wait_for_event_data, get_event_data
+from .http_pool import run_concurrently
 from . import ioevents
-from .monitors import _check_monitor
 from .payload_handler import _get_status_page_data_payload
+from .registry import resolve_monitor_names
 from .settings import timeout
-from .utils import _sio_call
+from .snapshots import thaw
+from .utils import _read_data_file, _sio_call
 
 # Source code meta data
 __author__ = "Dalwar Hossain"
@@ -27,12 +28,34 @@ __email__ = "dalwar23@pm.me"
 
 console = Console()
 
+# Keys of a status page config that are sent with 'saveStatusPage'
+status_page_config_keys = [
+    "customCSS",
+    "description",
+    "domainNameList",
+    "footerText",
+    "googleAnalyticsId",
+    "icon",
+    "id",
+    "published",
+    "showCertificateExpiry",
+    "showPoweredBy",
+    "showTags",
+    "slug",
+    "theme",
+    "title",
+]
+# Status pages of the last status page list by slug
+status_page_index = {"source": None, "by_slug": {}}
 
-def _get_status_page_public_group_list(public_group_list=None):
+
+def _get_status_page_public_group_list(public_group_list=None, status_page_slug=None):
     """
-    Generate public group list from monitor names
+    Generate public group list from monitor names. All monitor names are resolved in one pass, unknown names are
+    reported together and left out.
 
     :param public_group_list: (dict) Public group list dictionary
+    :param status_page_slug: (str) Slug of the status page, used in messages.
     :return: (list) Public group list of dictionary
     """
 
@@ -47,16 +70,22 @@ def _get_status_page_public_group_list(public_group_list=None):
     # ]
     public_group_monitor_list = []
     if public_group_list is not None:
+        _wait_for_event_data(ioevents.monitor_list)
+        monitor_ids, unknown_names = resolve_monitor_names(
+            names=[name for public_group in public_group_list for name in public_group["monitorList"]]
+        )
+        if unknown_names:
+            console.print(
+                f":orange_circle: Status page '{status_page_slug}' refers to monitors that don't exist: "
+                f"{', '.join(unknown_names)}",
+                style="logging.level.warning",
+            )
         for index, public_group in enumerate(public_group_list):
             public_group_monitor_item = {
                 "name": public_group["name"],
                 "weight": index + 1,
             }
-            monitor_id_list = []
-            for name in public_group["monitorList"]:
-                monitor = _check_monitor(monitor_name_to_check=name)
-                if monitor["exists"]:
-                    monitor_id_list.append({"id": monitor["id"]})
+            monitor_id_list = [{"id": monitor_ids[name]} for name in public_group["monitorList"] if name in monitor_ids]
             if monitor_id_list:
                 public_group_monitor_item["monitorList"] = monitor_id_list
             public_group_monitor_list.append(public_group_monitor_item)
@@ -88,36 +117,90 @@ def list_status_pages(verbose=None, logger=None):
         console.print(json.dumps(response, indent=4, sort_keys=True), style="green")
 
 
-def get_satus_page(slug=None, url=None, logger=None, show_details=False):
+def _get_listed_status_page(slug=None):
     """
-    Get a status page by slug.
+    Get the config of a status page from the status page list, falls back to 'getStatusPage' if the slug isn't listed
 
     :param slug: (str) Status page slug.
-    :param url: (str) URL for uptime kuma server
-    :param logger: (object) Logger object.
-    :param show_details: (bool) Show details of the status page.
-    :return: (dict) Python dictionary with status page info
+    :return: (dict) Status page config or None if the status page doesn't exist
     """
 
+    status_page_list = get_event_data(ioevents.status_page_list)
+    if status_page_index["source"] is not status_page_list:
+        # Every broadcast is a new snapshot, so the index is rebuilt once per broadcast.
+        status_page_index["source"] = status_page_list
+        status_page_index["by_slug"] = {status_page["slug"]: status_page for status_page in status_page_list.values()}
+    status_page = status_page_index["by_slug"].get(slug)
+    if status_page is not None:
+        return thaw(status_page)
     event_response = _sio_call("getStatusPage", slug)
+    return event_response["config"] if event_response["ok"] else None
 
-    try:
-        http_response = requests.get(f"{url}/api/status-page/{slug}", timeout=timeout).json()
-    except requests.exceptions.JSONDecodeError:
-        console.print(f":cyclone: Response is not valid JSON.", style="logging.level.error")
-        sys.exit(1)
-    except requests.exceptions.Timeout:
-        console.print(f":poodle: Response timed out.", style="logging.level.error")
-        sys.exit(1)
 
-    config = event_response["config"]
+def _merge_status_page(config=None, http_response=None):
     config.update(http_response["config"])
-    status_page_data = {
+    return {
         **config,
         "incident": http_response["incident"],
         "publicGroupList": http_response["publicGroupList"],
         "maintenanceList": http_response["maintenanceList"],
     }
+
+
+def _fetch_status_page(slug=None, url=None):
+    """
+    Fetch a status page from the uptime kuma status page API
+
+    :param slug: (str) Status page slug.
+    :param url: (str) URL for uptime kuma server
+    :return: (tuple) Decoded json response and error message, one of them is None
+    """
+
+    # The connection pulls in the networking stack, read-only '--cached' runs never fetch status pages.
+    import requests
+
+    from . import connection
+    from .recorder import http_get_json
+
+    try:
+        http_response = http_get_json(client=connection.sio, url=f"{url}/api/status-page/{slug}", timeout=timeout)
+    except requests.exceptions.JSONDecodeError:
+        return None, "Response is not valid JSON."
+    except requests.exceptions.Timeout:
+        return None, "Response timed out."
+    except requests.exceptions.ConnectionError as error:
+        return None, f"Connection failed. {error}"
+    except requests.exceptions.RequestException as error:
+        # Any other request error only fails this status page, not every page fetched with it.
+        return None, f"Request failed. {error}"
+    if "config" not in http_response:
+        return None, http_response.get("msg", "Status page not found.")
+    return http_response, None
+
+
+def get_satus_page(slug=None, url=None, logger=None, show_details=False, config=None):
+    """
+    Get a status page by slug.
+
+    :param slug: (str) Status page slug.
+    :param url: (str) URL for uptime kuma server
+    :param logger: (object) Logger object.
+    :param show_details: (bool) Show details of the status page.
+    :param config: (dict) Status page config, looked up in the status page list if not provided.
+    :return: (dict) Python dictionary with status page info
+    """
+
+    if config is None:
+        config = _get_listed_status_page(slug=slug)
+    if config is None:
+        console.print(f":orange_circle: Status page '{slug}' does not exist.", style="logging.level.error")
+        sys.exit(1)
+    http_response, error = _fetch_status_page(slug=slug, url=url)
+    if error:
+        console.print(f":cyclone: Status page '{slug}' couldn't be fetched. {error}", style="logging.level.error")
+        sys.exit(1)
+
+    status_page_data = _merge_status_page(config=config, http_response=http_response)
     # TODO: Check if we need to convert 'sendUrl' to boolean
     if show_details:
         console.print(f":page_facing_up: '{slug}' status page details", style="logging.level.info")
@@ -125,6 +208,82 @@ def get_satus_page(slug=None, url=None, logger=None, show_details=False):
     return status_page_data
 
 
+def get_all_status_pages(url=None, window=None, verbose=False, logger=None):
+    """
+    Get every status page of the status page list. Pages are fetched concurrently over the shared HTTP session.
+
+    :param url: (str) URL for uptime kuma server
+    :param window: (int) Number of status pages fetched concurrently.
+    :param verbose: (bool) Show details of every status page.
+    :param logger: (object) Logger object.
+    :return: (list) Status page info of every fetched status page
+    """
+
+    configs = [thaw(status_page) for status_page in get_event_data(ioevents.status_page_list).values()]
+    responses = run_concurrently(
+        function=lambda config: _fetch_status_page(slug=config["slug"], url=url), items=configs, window=window
+    )
+    status_pages = []
+    failed = 0
+    table = Table("id", "slug", "Title", "Published", "Groups", "Monitors", "Incident")
+    for config, (http_response, error) in zip(configs, responses):
+        if error:
+            failed += 1
+            console.print(
+                f":cyclone: Status page '{config['slug']}' couldn't be fetched. {error}", style="logging.level.error"
+            )
+            continue
+        status_page_data = _merge_status_page(config=config, http_response=http_response)
+        logger.debug(status_page_data)
+        status_pages.append(status_page_data)
+        table.add_row(
+            str(status_page_data["id"]),
+            status_page_data["slug"],
+            status_page_data["title"],
+            str(status_page_data.get("published", "")),
+            str(len(status_page_data["publicGroupList"])),
+            str(sum(len(group.get("monitorList", [])) for group in status_page_data["publicGroupList"])),
+            status_page_data["incident"]["title"] if status_page_data["incident"] else "",
+        )
+    if verbose:
+        console.print(json.dumps(status_pages, indent=4, sort_keys=True), style="green")
+    elif table.rows:
+        console.print(f":hamburger: Fetched {len(status_pages)} status pages.", style="green")
+        console.print(table, style="green")
+    elif not failed:
+        console.print(f":four_leaf_clover: No data available.")
+    if failed:
+        sys.exit(1)
+    return status_pages
+
+
+def _get_status_page_fingerprint(status_page_payload=None):
+    """
+    Get fingerprint of a status page 'saveStatusPage' payload. Public groups are compared by name, order and
+    monitor ids only, as the status page API adds monitor details to them.
+
+    :param status_page_payload: (tuple) Payload, see 'payload_handler._get_status_page_data_payload()'.
+    :return: (str) Fingerprint of the payload
+    """
+
+    slug, config, icon, public_group_list = status_page_payload
+    config = {
+        key: bool(value) if key in ("published", "showTags", "showPoweredBy", "showCertificateExpiry") else value
+        for key, value in config.items()
+    }
+    public_groups = [
+        [public_group["name"], [monitor["id"] for monitor in public_group.get("monitorList", [])]]
+        for public_group in public_group_list
+    ]
+    return _get_payload_fingerprint([slug, config, icon, public_groups])
+
+
+def _get_status_page_save_payload(status_page_info=None):
+    payload_keys = status_page_config_keys + ["publicGroupList"]
+    payload_data = {key: value for key, value in status_page_info.items() if key in payload_keys}
+    return _get_status_page_data_payload(**payload_data)
+
+
 def add_status_page(
     status_page_data_files=None, status_page_title=None, status_page_slug=None, logger=None, url=None, save=None
 ):
@@ -142,39 +301,52 @@ def add_status_page(
     if status_page_data_files:
         # console.print(Rule(style="purple"))
         for status_page_data_file in status_page_data_files:
-            with open(status_page_data_file, "r") as tmp_data_file_read:
-                status_pages = yaml.safe_load(tmp_data_file_read)["status_pages"]
-                for status_page in status_pages:
-                    logger.debug(status_page)
-                    status_page_info = add_status_page(
-                        status_page_title=status_page["title"].title(),
-                        status_page_slug=status_page["slug"],
-                        logger=logger,
-                        url=url,
+            status_pages = _read_data_file(status_page_data_file)["status_pages"]
+            for status_page in status_pages:
+                logger.debug(status_page)
+                status_page_info = add_status_page(
+                    status_page_title=status_page["title"].title(),
+                    status_page_slug=status_page["slug"],
+                    logger=logger,
+                    url=url,
+                )
+                logger.debug(status_page_info)
+                if save:
+                    # Pages that already exist come with their live config and public groups.
+                    live_fingerprint = None
+                    if "ok" in status_page_info:
+                        status_page_info.pop("ok")
+                    else:
+                        live_fingerprint = _get_status_page_fingerprint(_get_status_page_save_payload(status_page_info))
+                    if "msg" in status_page_info:
+                        status_page_info.pop("msg")
+                    status_page_info.update(status_page)
+                    public_group_list = _get_status_page_public_group_list(
+                        public_group_list=status_page["publicGroupList"], status_page_slug=status_page["slug"]
                     )
-                    logger.debug(status_page_info)
-                    if save:
-                        if "ok" in status_page_info:
-                            status_page_info.pop("ok")
-                        if "msg" in status_page_info:
-                            status_page_info.pop("msg")
-                        status_page_info.update(status_page)
-                        public_group_list = _get_status_page_public_group_list(status_page["publicGroupList"])
-                        status_page_info["publicGroupList"] = public_group_list
-                        status_page_data_to_save = _get_status_page_data_payload(**status_page_info)
-                        logger.debug(status_page_data_to_save)
-                        status_page_save_response = _sio_call("saveStatusPage", status_page_data_to_save)
-                        if status_page_save_response["ok"]:
-                            console.print(f":floppy_disk: Status page saved successfully!", style="logging.level.info")
-                        else:
-                            console.print(
-                                f":cyclone: Status page ({status_page['slug']}) couldn't be saved. Error: {status_page_save_response.get('msg')}",
-                                style="logging.level.error",
-                            )
+                    status_page_info["publicGroupList"] = public_group_list
+                    status_page_data_to_save = _get_status_page_save_payload(status_page_info)
+                    logger.debug(status_page_data_to_save)
+                    if live_fingerprint == _get_status_page_fingerprint(status_page_data_to_save):
+                        console.print(
+                            f":sunflower: Status page '{status_page['slug']}' is unchanged, nothing to save.",
+                            style="logging.level.info",
+                        )
+                        continue
+                    status_page_save_response = _sio_call("saveStatusPage", status_page_data_to_save)
+                    if status_page_save_response["ok"]:
+                        console.print(f":floppy_disk: Status page saved successfully!", style="logging.level.info")
+                    else:
+                        console.print(
+                            f":cyclone: Status page ({status_page['slug']}) couldn't be saved. Error: {status_page_save_response.get('msg')}",
+                            style="logging.level.error",
+                        )
     else:
-        status_page_info = _sio_call("getStatusPage", status_page_slug)
-        if status_page_info["ok"]:
-            status_page_details = get_satus_page(slug=status_page_slug, url=url, logger=logger)
+        status_page_config = _get_listed_status_page(slug=status_page_slug)
+        if status_page_config is not None:
+            status_page_details = get_satus_page(
+                slug=status_page_slug, url=url, logger=logger, config=status_page_config
+            )
             status_page_id = status_page_details["id"]
             console.print(
                 f":sunflower: Status page '{status_page_id} - {status_page_title} ({status_page_slug})' already exists.",
@@ -185,18 +357,19 @@ def add_status_page(
             status_page_details.pop("maintenanceList")
             return status_page_details
         else:
-            with wait_for_event(ioevents.status_page_list):
-                response = _sio_call("addStatusPage", (status_page_title.title(), status_page_slug))
-                if response["ok"]:
-                    console.print(
-                        f":hatching_chick: Status page '{status_page_title.title()} ({status_page_slug})' has been created.",
-                        style="logging.level.info",
-                    )
-                    return response
-                    logger.debug(f"Status page creation response: {response}")
-                else:
-                    console.print(f":red_circle: Error: {response['msg']}")
-                    sys.exit(1)
+            # Uptime kuma doesn't broadcast the status page list after 'addStatusPage', so there is no broadcast to
+            # wait for. Pages missing from the list are looked up with 'getStatusPage', see '_get_listed_status_page()'.
+            response = _sio_call("addStatusPage", (status_page_title.title(), status_page_slug))
+            if response["ok"]:
+                console.print(
+                    f":hatching_chick: Status page '{status_page_title.title()} ({status_page_slug})' has been created.",
+                    style="logging.level.info",
+                )
+                logger.debug(f"Status page creation response: {response}")
+                return response
+            else:
+                console.print(f":red_circle: Error: {response['msg']}")
+                sys.exit(1)
     # console.print(Rule(style="purple"))
 
 
@@ -213,10 +386,9 @@ def delete_status_page(status_page_data_files=None, status_page_slug=None, logge
     # console.print(Rule(title="Delete Status Page", style="purple"))
     if status_page_data_files:
         for status_page_data_file in status_page_data_files:
-            with open(status_page_data_file, "r") as tmp_data_file_read:
-                status_pages = yaml.safe_load(tmp_data_file_read)["status_pages"]
-                for status_page in status_pages:
-                    delete_status_page(status_page_slug=status_page["slug"], logger=logger)
+            status_pages = _read_data_file(status_page_data_file)["status_pages"]
+            for status_page in status_pages:
+                delete_status_page(status_page_slug=status_page["slug"], logger=logger)
     elif status_page_slug:
         status_page_info = _sio_call("getStatusPage", status_page_slug)
         if status_page_info["ok"]:
@@ -3,11 +3,15 @@
 """Utility module for kumaone"""
 
 # Import builtin python libraries
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatch
+import hashlib
 import logging
+import multiprocessing
 import os
 from pathlib import Path
 import sys
-import yaml
+import threading
 
 # Import external python libraries
 from rich import print
@@ -16,7 +20,7 @@ from rich.logging import RichHandler
 import typer
 
 # Import custom (local) python packages
-from .connection import sio
+from . import settings
 from src.kumaone.__about__ import __author__ as author
 from src.kumaone.__about__ import __copyright__ as app_copy_right
 from src.kumaone.__about__ import __home_page__ as homepage
@@ -28,6 +32,8 @@ __author__ = "Dalwar Hossain"
 __email__ = "dalwar23@pm.me"
 
 console = Console()
+data_documents = {}
+file_hashes = {}
 
 
 def version_callback(value: bool):
@@ -72,6 +78,8 @@ def app_info(log_level=None):
     :return: application information
     """
 
+    from .yaml_handler import yaml_backend
+
     logger = log_manager(log_level=log_level)
 
     logger.info(f"Please check github repository for updated info.")
@@ -81,6 +89,7 @@ def app_info(log_level=None):
     print(f":memo: License: {app_license}")
     print(f":link: Home: {homepage}")
     print(f":copyright: Copyright: {app_copy_right}")
+    print(f":gear: YAML backend: {yaml_backend}")
     # console.print(Rule(style="purple"))
 
 
@@ -93,6 +102,9 @@ def _sio_call(event=None, data=None):
     :return: (any)
     """
 
+    # The connection is imported on first use, so that commands without a server connection stay fast to start.
+    from .connection import sio
+
     try:
         response = sio.call(event, data=data)
     except TimeoutError:
@@ -113,14 +125,181 @@ def _sio_call(event=None, data=None):
     #     console.print(f":red_circle: Error: {err}")
 
 
-def _check_data_path(data_path=None, logger=None, key_to_check_for=None):
+def _sio_call_pipelined(event=None, data_list=None, window=1, timeout=None):
+    """
+    Calls socketIO event for every item of a data list, keeping up to 'window' calls in flight at once
+
+    :param event: (str) Event name.
+    :param data_list: (list) Event related data, one item per call.
+    :param window: (int) Maximum number of calls waiting for a response.
+    :param timeout: (float) Seconds to wait for a response. Defaults to 'settings.event_timeout'.
+    :return: (list) Responses in the same order as the data list
+    """
+
+    from .connection import sio
+
+    if timeout is None:
+        timeout = settings.event_timeout
+    slots = threading.BoundedSemaphore(max(window, 1))
+    responses = [None] * len(data_list)
+    answered = [threading.Event() for _ in data_list]
+
+    def _get_callback(index):
+        def _callback(*args):
+            responses[index] = args[0] if len(args) == 1 else args
+            answered[index].set()
+            slots.release()
+
+        return _callback
+
+    for index, data in enumerate(data_list):
+        if not slots.acquire(timeout=timeout):
+            console.print(f":hourglass:  Request timed out while waiting for '{event}' event.", style="logging.level.info")
+            sys.exit(1)
+        sio.emit(event, data=data, callback=_get_callback(index))
+    for item in answered:
+        if not item.wait(timeout=timeout):
+            console.print(f":hourglass:  Request timed out while waiting for '{event}' event.", style="logging.level.info")
+            sys.exit(1)
+    return responses
+
+
+def _read_data_file(data_file=None):
+    """
+    Reads and parses a yaml data file. The parsed document is memoized, so that checking the data path and
+    processing the data reads every file only once. Modified files are parsed again.
+
+    :param data_file: (Path) yaml data file path.
+    :return: (dict) Parsed yaml document
+    """
+
+    from .yaml_handler import _parse_yaml_file
+
+    data_file_path = Path(data_file).resolve()
+    data_file_stat = data_file_path.stat()
+    file_signature = (data_file_stat.st_mtime_ns, data_file_stat.st_size)
+    cached_document = data_documents.get(data_file_path)
+    if cached_document is not None and cached_document[0] == file_signature:
+        return cached_document[1]
+    data_documents[data_file_path] = _parse_yaml_file(data_file_path)
+    return data_documents[data_file_path][1]
+
+
+def _get_file_hash(data_file=None):
+    """
+    Get content hash of a data file. Hashes are memoized like parsed documents.
+
+    :param data_file: (Path) Data file path.
+    :return: (str) sha256 hex digest of the file content
+    """
+
+    data_file_path = Path(data_file).resolve()
+    data_file_stat = data_file_path.stat()
+    file_signature = (data_file_stat.st_mtime_ns, data_file_stat.st_size)
+    cached_hash = file_hashes.get(data_file_path)
+    if cached_hash is None or cached_hash[0] != file_signature:
+        with open(data_file_path, "rb") as data_file_content:
+            cached_hash = (file_signature, hashlib.sha256(data_file_content.read()).hexdigest())
+        file_hashes[data_file_path] = cached_hash
+    return cached_hash[1]
+
+
+def _find_data_files(data_path=None, include=None, exclude=None, logger=None):
+    """
+    Finds yaml files in a directory and its sub-directories, in sorted order
+
+    :param data_path: (Path) Data directory.
+    :param include: (list) Glob patterns, relative to the data directory. Only matching files are considered.
+    :param exclude: (list) Glob patterns, relative to the data directory. Matching files are skipped.
+    :param logger: (object) logger object.
+    :return: (list) yaml file paths
+    """
+
+    data_files = []
+    for root, directories, files in os.walk(data_path):
+        directories.sort()
+        for file_name in sorted(files):
+            file_path = Path(root).joinpath(file_name)
+            relative_path = file_path.relative_to(data_path).as_posix()
+            file_type = file_name.split(".")[-1]
+            if file_type not in ["yaml", "yml"]:
+                console.print(
+                    f":bulb: '.{file_type}' file type is not supported. Skipping '{relative_path}'. ",
+                    style="logging.level.info",
+                )
+            elif include and not any(fnmatch(relative_path, pattern) for pattern in include):
+                logger.info(f"{relative_path} doesn't match include patterns, skipped.")
+            elif exclude and any(fnmatch(relative_path, pattern) for pattern in exclude):
+                logger.info(f"{relative_path} matches exclude patterns, skipped.")
+            else:
+                data_files.append(file_path.resolve())
+    return data_files
+
+
+def _parse_data_files(data_files=None, workers=None):
     """
-    Checks data path for monitor input file or directory
+    Parses yaml data files, in parallel worker processes for large directories, and memoizes the documents. Every
+    file is yielded as soon as it's parsed, so callers can work on the first files while later ones are still being
+    parsed. Worker processes are spawned, not forked, as forking a process with running socketIO threads can
+    deadlock. The worker processes are shut down when the generator is closed, even if it wasn't consumed.
+
+    :param data_files: (list) yaml file paths.
+    :param workers: (int) Number of worker processes. Defaults to the number of CPUs.
+    :return: (generator) File path and parsed document, in the same order as the data files
+    """
+
+    files_to_parse = []
+    for data_file in data_files:
+        data_file_stat = data_file.stat()
+        cached_document = data_documents.get(data_file)
+        if cached_document is None or cached_document[0] != (data_file_stat.st_mtime_ns, data_file_stat.st_size):
+            files_to_parse.append(data_file)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(files_to_parse) < settings.parallel_parsing_min_files:
+        for data_file in data_files:
+            yield data_file, _read_data_file(data_file)
+        return
+
+    from .yaml_handler import _parse_yaml_files
+
+    chunk_size = max(1, min(16, len(files_to_parse) // (workers * 4)))
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    chunk_futures = []
+    try:
+        parsed_chunks = {}
+        for chunk_start in range(0, len(files_to_parse), chunk_size):
+            chunk = files_to_parse[chunk_start : chunk_start + chunk_size]
+            chunk_future = executor.submit(_parse_yaml_files, chunk)
+            chunk_futures.append(chunk_future)
+            for position, data_file in enumerate(chunk):
+                parsed_chunks[data_file] = (chunk_future, position)
+        for data_file in data_files:
+            if data_file in parsed_chunks:
+                chunk_future, position = parsed_chunks[data_file]
+                data_documents[data_file] = chunk_future.result()[position]
+            yield data_file, data_documents[data_file][1]
+    finally:
+        for chunk_future in chunk_futures:
+            chunk_future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _check_data_path(
+    data_path=None, logger=None, key_to_check_for=None, include=None, exclude=None, workers=None, known_hashes=None
+):
+    """
+    Checks data path for input file or directory. Directories are searched recursively and files are parsed in
+    parallel, every file is yielded as soon as it's parsed. Their documents can be read with '_read_data_file'.
 
     :param data_path: (Path) uptime kuma input data.
     :param logger: (object) logger object.
     :param key_to_check_for: (str) What type of data should be checked.
-    :return: (int) Monitor ID.
+    :param include: (list) Glob patterns for files to consider in a directory.
+    :param exclude: (list) Glob patterns for files to skip in a directory.
+    :param workers: (int) Number of worker processes for parsing.
+    :param known_hashes: (set) Content hashes of files that are known to be valid. These files are not parsed.
+    :return: (generator) Data file paths
     """
 
     # console.print(Rule(style="purple"))
@@ -132,57 +311,49 @@ def _check_data_path(data_path=None, logger=None, key_to_check_for=None):
                 f":file_folder: Directory input detected. Input file directory: '{data_path}'.",
                 style="logging.level.info",
             )
-            with os.scandir(Path(data_path)) as items:
-                data_files = []
-                skipped_files = []
-                for item in items:
-                    if item.is_file():
-                        file_type = item.name.split(".")[-1]
-                        if file_type in ["yaml", "yml"]:
-                            logger.info(f"{item.name} - {item.stat().st_size} bytes.")
-                            with open(item) as tmp_read_file:
-                                raw_data = yaml.safe_load(tmp_read_file)
-                                logger.debug(raw_data)
-                                if key_to_check_for in raw_data:
-                                    data_files.append(Path(data_path).joinpath(item.name))
-                                else:
-                                    logger.info(f"{item.name} did not have {key_to_check_for}, skipped.")
-                                    pass
-                        else:
-                            console.print(
-                                f":bulb: '.{file_type}' file type is not supported. Skipping '{item.name}'. ",
-                                style="logging.level.info",
-                            )
-                            skipped_files.append(Path(data_path).joinpath(item.name))
-                    else:
-                        console.print(
-                            f":card_index_dividers: Nested directories are not supported. Skipping '{item.name}'.",
-                            style="logging.level.info",
-                        )
+            data_files = _find_data_files(data_path=Path(data_path), include=include, exclude=exclude, logger=logger)
             console.print(
                 f":high_brightness: {len(data_files)} files found in supported format.",
                 style="logging.level.info",
             )
-            logger.debug(f"{data_files}")
-            logger.debug(f"{skipped_files}")
-            return sorted(data_files)
+            known_files = set()
+            if known_hashes:
+                known_files = {data_file for data_file in data_files if _get_file_hash(data_file) in known_hashes}
+            files_to_parse = [data_file for data_file in data_files if data_file not in known_files]
+            parsed_files = _parse_data_files(data_files=files_to_parse, workers=workers)
+            try:
+                for data_file in data_files:
+                    if data_file in known_files:
+                        yield data_file
+                        continue
+                    _, raw_data = next(parsed_files)
+                    logger.debug(raw_data)
+                    if isinstance(raw_data, dict) and key_to_check_for in raw_data:
+                        yield data_file
+                    else:
+                        logger.info(f"{data_file} did not have {key_to_check_for}, skipped.")
+            finally:
+                # Stops the worker processes if the caller stops early.
+                parsed_files.close()
         elif Path(data_path).is_file():
             logger.info(f"'{data_path}' is a file.")
             console.print(
                 f":high_brightness: Single file input detected. Input file: '{data_path}'.", style="logging.level.info"
             )
-            with open(data_path) as tmp_read_file:
-                raw_data = yaml.safe_load(tmp_read_file)
-                logger.debug(raw_data)
-                logger.debug(key_to_check_for)
-                if key_to_check_for in raw_data:
-                    return sorted([data_path])
-                else:
-                    console.print(
-                        f":orange_circle: Provided data file is missing necessary data. Missing {key_to_check_for} key.",
-                        style="logging.level.warning",
-                    )
-                    sys.exit(1)
+            if known_hashes and _get_file_hash(data_path) in known_hashes:
+                yield Path(data_path)
+                return
+            raw_data = _read_data_file(data_path)
+            logger.debug(raw_data)
+            logger.debug(key_to_check_for)
+            if isinstance(raw_data, dict) and key_to_check_for in raw_data:
+                yield Path(data_path)
+            else:
+                console.print(
+                    f":orange_circle: Provided data file is missing necessary data. Missing {key_to_check_for} key.",
+                    style="logging.level.warning",
+                )
+                sys.exit(1)
     else:
         console.print(f":x:  Data path: '{data_path}', does not exists!", style="logging.level.error")
         sys.exit(1)
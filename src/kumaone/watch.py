@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+"""Watch module for kumaone"""
+
+# Import builtin python libraries
+from bisect import bisect_left, insort
+from datetime import datetime
+import math
+import threading
+import time
+
+# Import external python libraries
+from rich.console import Console, Group
+from rich.live import Live
+from rich.table import Table
+from rich.text import Text
+
+# Import custom (local) python packages
+from .event_handlers import get_event_data
+from .heartbeats import get_latest_heartbeat, get_uptime, subscribe_heartbeats, unsubscribe_heartbeats
+from . import ioevents
+from .registry import get_monitor_by_name, get_monitor_children
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+console = Console()
+
+# Heartbeat status, sorting order and style. Down monitors are shown first.
+status_styles = {
+    0: ("DOWN", 0, "bold red"),
+    2: ("PENDING", 1, "yellow"),
+    3: ("MAINTENANCE", 2, "blue"),
+    1: ("UP", 3, "green"),
+    None: ("-", 4, "dim"),
+}
+
+
+def _get_watched_monitors(group=None, monitor_type=None):
+    """
+    Get process monitors matching the watch filters
+
+    :param group: (str) Only monitors in this group, including nested groups.
+    :param monitor_type: (str) Only monitors of this type.
+    :return: (dict) Monitor data by monitor ID
+    """
+
+    group_ids = None
+    if group is not None:
+        group_monitor = get_monitor_by_name(group)
+        group_ids = set()
+        parent_ids = [group_monitor["id"]] if group_monitor is not None else []
+        while parent_ids:
+            parent_id = parent_ids.pop()
+            group_ids.add(parent_id)
+            parent_ids.extend(get_monitor_children(parent_id))
+    watched_monitors = {}
+    for monitor in get_event_data(ioevents.monitor_list).values():
+        if monitor["type"] == "group":
+            continue
+        if monitor_type is not None and monitor["type"] != monitor_type:
+            continue
+        if group_ids is not None and monitor.get("parent") not in group_ids:
+            continue
+        watched_monitors[monitor["id"]] = monitor
+    return watched_monitors
+
+
+def _get_monitor_row(monitor=None):
+    """
+    Get the table row of a monitor from its latest heartbeat
+
+    :param monitor: (dict) Monitor data.
+    :return: (tuple) Status, sort key and table cells
+    """
+
+    latest_heartbeat = get_latest_heartbeat(monitor_id=monitor["id"])
+    uptime = get_uptime(monitor_id=monitor["id"])
+    beat_time, status, ping = latest_heartbeat if latest_heartbeat is not None else (None, None, None)
+    status_name, status_order, status_style = status_styles.get(status, status_styles[None])
+    cells = (
+        str(monitor["id"]),
+        monitor["name"],
+        monitor["type"],
+        Text(status_name, style=status_style),
+        "-" if ping is None else f"{ping:.0f} ms",
+        "-" if uptime is None else f"{uptime:.2f}%",
+        "-" if beat_time is None or math.isnan(beat_time) else datetime.fromtimestamp(beat_time).strftime("%H:%M:%S"),
+    )
+    return status, (status_order, monitor["name"].lower(), monitor["id"]), cells
+
+
+def _remove_monitor_row(rows=None, monitor_id=None):
+    """
+    Removes the row of a monitor from the sorted rows
+
+    :param rows: (dict) Sorted rows, see 'watch_monitors()'.
+    :param monitor_id: (int) Monitor ID.
+    :return: None
+    """
+
+    row = rows["by_id"].pop(monitor_id, None)
+    if row is None:
+        return
+    status, sort_key, _ = row
+    del rows["order"][bisect_left(rows["order"], sort_key)]
+    rows["status_counts"][status] -= 1
+
+
+def _set_monitor_row(rows=None, monitor_id=None, row=None):
+    """
+    Replaces the row of a monitor and moves it to its sorted position
+
+    :param rows: (dict) Sorted rows, see 'watch_monitors()'.
+    :param monitor_id: (int) Monitor ID.
+    :param row: (tuple) Status, sort key and table cells, see '_get_monitor_row()'.
+    :return: None
+    """
+
+    _remove_monitor_row(rows=rows, monitor_id=monitor_id)
+    status, sort_key, _ = row
+    rows["by_id"][monitor_id] = row
+    insort(rows["order"], sort_key)
+    rows["status_counts"][status] = rows["status_counts"].get(status, 0) + 1
+
+
+def _render_monitor_rows(rows=None, height=None):
+    """
+    Renders monitor rows. Only as many rows as fit on the screen are rendered.
+
+    :param rows: (dict) Sorted rows, see 'watch_monitors()'.
+    :param height: (int) Available screen height.
+    :return: (Group) Renderable
+    """
+
+    summary = Text.from_markup(f":eyes: Watching {len(rows['by_id'])} monitors. ")
+    for status, (status_name, _, status_style) in status_styles.items():
+        if rows["status_counts"].get(status):
+            summary.append(f"{status_name}: {rows['status_counts'][status]}  ", style=status_style)
+    table = Table("id", "name", "type", "status", "ping", "uptime", "last beat", expand=True)
+    visible_rows = max(height - 6, 1)
+    for sort_key in rows["order"][:visible_rows]:
+        # The monitor ID is the last part of the sort key.
+        table.add_row(*rows["by_id"][sort_key[-1]][2])
+    if len(rows["order"]) > visible_rows:
+        table.caption = f"{len(rows['order']) - visible_rows} more monitors not shown"
+    return Group(summary, table)
+
+
+def watch_monitors(group=None, monitor_type=None, refresh_rate=4, logger=None):
+    """
+    Shows a live view of process monitors until interrupted. Heartbeats only mark their monitor for an update,
+    changed rows are updated at most 'refresh_rate' times per second.
+
+    :param group: (str) Only monitors in this group, including nested groups.
+    :param monitor_type: (str) Only monitors of this type.
+    :param refresh_rate: (float) Maximum number of redraws per second.
+    :param logger: (object) Logger object
+    :return: None
+    """
+
+    dirty_monitor_ids = set()
+    dirty_lock = threading.Lock()
+
+    def _mark_dirty(monitor_id):
+        with dirty_lock:
+            dirty_monitor_ids.add(monitor_id)
+
+    subscribe_heartbeats(_mark_dirty)
+    monitor_list = None
+    watched_monitors = {}
+    # Rows by monitor ID and their sort keys in display order, only changed rows are re-sorted
+    rows = {"by_id": {}, "order": [], "status_counts": {}}
+    try:
+        with Live(console=console, auto_refresh=False) as live:
+            while True:
+                changed_monitor_ids = set()
+                if get_event_data(ioevents.monitor_list) is not monitor_list:
+                    monitor_list = get_event_data(ioevents.monitor_list)
+                    watched_monitors = _get_watched_monitors(group=group, monitor_type=monitor_type)
+                    removed_monitor_ids = [monitor_id for monitor_id in rows["by_id"] if monitor_id not in watched_monitors]
+                    for monitor_id in removed_monitor_ids:
+                        _remove_monitor_row(rows=rows, monitor_id=monitor_id)
+                    changed_monitor_ids.update(watched_monitors)
+                    logger.debug(f"Watching {len(watched_monitors)} monitors.")
+                with dirty_lock:
+                    changed_monitor_ids.update(dirty_monitor_ids & watched_monitors.keys())
+                    dirty_monitor_ids.clear()
+                if changed_monitor_ids:
+                    for monitor_id in changed_monitor_ids:
+                        _set_monitor_row(
+                            rows=rows, monitor_id=monitor_id, row=_get_monitor_row(monitor=watched_monitors[monitor_id])
+                        )
+                    live.update(_render_monitor_rows(rows=rows, height=console.size.height), refresh=True)
+                time.sleep(1 / refresh_rate)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        unsubscribe_heartbeats(_mark_dirty)
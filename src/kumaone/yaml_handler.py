@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+"""YAML handler module for kumaone"""
+
+# Import builtin python libraries
+import os
+
+# Import external python libraries
+import yaml
+
+# Use libyaml based loader and dumper if PyYAML was built with libyaml
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+
+    yaml_backend = "libyaml"
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+    yaml_backend = "pure python"
+
+# Source code meta data
+__author__ = "Dalwar Hossain"
+__email__ = "dalwar23@pm.me"
+
+
+def load_yaml(stream=None):
+    """
+    Parses a yaml document with the fastest available safe loader
+
+    :param stream: (str/file) yaml document or file object.
+    :return: (any) Parsed yaml document
+    """
+
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def dump_yaml(data=None, stream=None):
+    """
+    Serializes data to yaml with the fastest available safe dumper
+
+    :param data: (any) Data to serialize.
+    :param stream: (file) File object to write to. If None, yaml is returned as string.
+    :return: (str) yaml document if stream is None
+    """
+
+    return yaml.dump(data, stream, Dumper=SafeDumper)
+
+
+def _parse_yaml_file(file_path=None):
+    """
+    Parses a yaml file. Used by data path scanning, also from worker processes.
+
+    :param file_path: (Path) yaml file path.
+    :return: (tuple) File signature (mtime, size) and parsed yaml document
+    """
+
+    file_stat = os.stat(file_path)
+    with open(file_path) as yaml_file:
+        document = load_yaml(yaml_file)
+    return (file_stat.st_mtime_ns, file_stat.st_size), document
+
+
+def _parse_yaml_files(file_paths=None):
+    """
+    Parses a chunk of yaml files in a worker process
+
+    :param file_paths: (list) yaml file paths.
+    :return: (list) File signature and parsed yaml document of every file, see '_parse_yaml_file()'
+    """
+
+    return [_parse_yaml_file(file_path) for file_path in file_paths]
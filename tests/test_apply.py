@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2023-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+# Import external python libraries
+import pytest
+
+# Import custom (local) python packages
+from src.kumaone import apply, ioevents
+from src.kumaone.apply import _apply_monitor_plan, _get_monitor_plan
+from src.kumaone.event_handlers import monitor_list_event
+from src.kumaone.registry import rebuild_monitor_registry
+from src.kumaone.settings import event_data
+
+site = {"name": "site", "type": "http", "url": "https://example.com", "interval": 60}
+
+
+class FakeServer:
+    """
+    Answers the socketIO calls of 'apply' and records them
+    """
+
+    def __init__(self, failing_names=()):
+        self.calls = []
+        self.failing_names = failing_names
+        self.next_id = 100
+
+    def call(self, event=None, data=None):
+        self.calls.append((event, data))
+        return {"ok": True}
+
+    def call_pipelined(self, event=None, data_list=None, window=1):
+        responses = []
+        for data in data_list:
+            self.calls.append((event, data))
+            if data["name"] in self.failing_names:
+                responses.append({"ok": False, "msg": "Failed."})
+            else:
+                self.next_id += 1
+                responses.append({"ok": True, "monitorID": self.next_id})
+        return responses
+
+
+def _live_monitors(*monitors):
+    monitor_list_event({str(monitor["id"]): monitor for monitor in monitors})
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakeServer()
+    monkeypatch.setattr(apply, "_sio_call", server.call)
+    monkeypatch.setattr(apply, "_sio_call_pipelined", server.call_pipelined)
+    yield server
+    event_data[ioevents.monitor_list] = None
+    rebuild_monitor_registry()
+
+
+def test_create_group_and_monitor(server):
+    _live_monitors()
+    plan = _get_monitor_plan(groups=["web"], process_monitors={"site": {**site, "group": "web"}})
+    assert [item["name"] for item in plan["create"]] == ["web", "site"]
+    assert _apply_monitor_plan(plan=plan)
+    added = {data["name"]: data for event, data in server.calls if event == "add"}
+    assert added["site"]["parent"] == server.next_id - 1
+
+
+def test_update_changed_field_only(server):
+    _live_monitors({**site, "id": 1, "parent": None})
+    plan = _get_monitor_plan(groups=[], process_monitors={"site": {**site, "interval": 30, "group": None}})
+    assert plan["create"] == []
+    assert plan["update"][0]["changes"] == {"interval": (60, 30)}
+    assert _apply_monitor_plan(plan=plan)
+    assert [(event, data["id"], data["interval"]) for event, data in server.calls] == [("editMonitor", 1, 30)]
+
+
+def test_move_monitor_into_new_group(server):
+    _live_monitors({**site, "id": 1, "parent": None})
+    plan = _get_monitor_plan(groups=["web"], process_monitors={"site": {**site, "group": "web"}})
+    assert [item["name"] for item in plan["create"]] == ["web"]
+    assert plan["update"][0]["changes"] == {"parent": (None, "web")}
+    assert _apply_monitor_plan(plan=plan)
+    edited = [data for event, data in server.calls if event == "editMonitor"]
+    assert edited[0]["parent"] == server.next_id
+
+
+def test_prune_deletes_deepest_monitors_first(server):
+    _live_monitors(
+        {"id": 1, "name": "outer", "type": "group", "parent": None},
+        {"id": 2, "name": "inner", "type": "group", "parent": 1},
+        {"id": 3, "name": "leaf", "type": "http", "parent": 2},
+        {"id": 4, "name": "sibling", "type": "http", "parent": 1},
+        {"id": 5, "name": "root", "type": "http", "parent": None},
+    )
+    plan = _get_monitor_plan(groups=[], process_monitors={}, prune=True)
+    deleted_ids = [item["id"] for item in plan["delete"]]
+    assert deleted_ids[0] == 3
+    assert deleted_ids.index(2) < deleted_ids.index(1)
+    assert deleted_ids.index(4) < deleted_ids.index(1)
+
+
+def test_children_of_failed_group_are_skipped(server):
+    server.failing_names = ["web"]
+    _live_monitors()
+    plan = _get_monitor_plan(groups=["web"], process_monitors={"site": {**site, "group": "web"}})
+    assert not _apply_monitor_plan(plan=plan)
+    assert [data["name"] for event, data in server.calls] == ["web"]
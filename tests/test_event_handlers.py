@@ -0,0 +1,49 @@
+# SPDX-FileCopyrightText: 2023-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+# Import builtin python libraries
+import threading
+import time
+
+# Import external python libraries
+import pytest
+from socketio.exceptions import TimeoutError
+
+# Import custom (local) python packages
+from src.kumaone import ioevents
+from src.kumaone.event_handlers import _set_event_data, get_event_data, wait_for_event
+from src.kumaone.settings import event_data
+
+event = ioevents.notification_list
+
+
+@pytest.fixture(autouse=True)
+def received_list():
+    # The first list has been received, like after login.
+    _set_event_data(event, [])
+    yield
+    event_data[event] = None
+
+
+def test_wait_for_event_blocks_until_next_broadcast():
+    broadcast = threading.Timer(0.2, _set_event_data, args=(event, [{"id": 1, "name": "new"}]))
+    started_at = time.monotonic()
+    with wait_for_event(event, timeout=5):
+        broadcast.start()
+    assert time.monotonic() - started_at >= 0.15
+    assert get_event_data(event)[0]["name"] == "new"
+
+
+def test_wait_for_event_ignores_broadcast_before_block():
+    _set_event_data(event, [{"id": 1, "name": "old"}])
+    with pytest.raises(TimeoutError):
+        with wait_for_event(event, timeout=0.1):
+            pass
+
+
+def test_cancelled_wait_for_event_returns_immediately():
+    started_at = time.monotonic()
+    with wait_for_event(event, timeout=5) as waiter:
+        waiter.cancel()
+    assert time.monotonic() - started_at < 1
@@ -0,0 +1,67 @@
+# SPDX-FileCopyrightText: 2023-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+# Import builtin python libraries
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+# Import external python libraries
+import pytest
+
+repository_root = Path(__file__).resolve().parent.parent
+
+# Modules that light commands must not import
+networking_modules = ["socketio", "engineio", "requests"]
+
+# CLI import time budget in milliseconds, only checked when set
+import_budget = os.environ.get("KUMAONE_IMPORT_BUDGET_MS")
+
+driver = """
+import json
+import sys
+import time
+
+start = time.perf_counter()
+from src.kumaone.main import app
+import_time = time.perf_counter() - start
+try:
+    app(args=sys.argv[2:], prog_name="kumaone")
+except SystemExit:
+    pass
+with open(sys.argv[1], "w") as report:
+    json.dump({"import_ms": import_time * 1000, "modules": sorted(sys.modules)}, report)
+"""
+
+
+def _run_kumaone(report_file, arguments, environment):
+    subprocess.run(
+        [sys.executable, "-c", driver, str(report_file), *arguments],
+        cwd=repository_root,
+        env={**os.environ, **environment},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=60,
+        check=False,
+    )
+    with open(report_file, "r") as report:
+        return json.load(report)
+
+
+@pytest.mark.parametrize(
+    "arguments, environment",
+    [
+        (["--version"], {}),
+        ([], {"_KUMAONE_COMPLETE": "complete_bash", "COMP_WORDS": "kumaone monitor add --", "COMP_CWORD": "3"}),
+    ],
+    ids=["version", "completion"],
+)
+def test_light_commands_skip_networking_imports(tmp_path, arguments, environment):
+    report = _run_kumaone(tmp_path.joinpath("report.json"), arguments, environment)
+    imported_modules = {module.split(".")[0] for module in report["modules"]}
+    assert [module for module in networking_modules if module in imported_modules] == []
+    if import_budget:
+        assert report["import_ms"] <= float(import_budget)
@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2023-present U.N. Owen <void@some.where>
+#
+# SPDX-License-Identifier: MIT
+
+# Import external python libraries
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Import custom (local) python packages
+from src.kumaone.stats import compute_monitor_stats, history_from_beats  # noqa: E402
+
+
+def _beats(statuses=None, pings=None):
+    return [
+        {"time": f"2026-10-18 10:{minute:02d}:00", "status": status, "ping": ping}
+        for minute, (status, ping) in enumerate(zip(statuses, pings))
+    ]
+
+
+def test_compute_monitor_stats():
+    history = history_from_beats(
+        beats_by_monitor={
+            1: _beats(statuses=[1, 1, 0, 0, 1, 1, 0, 1, 1, 1], pings=[10, 20, 30, 40, 50, 60, 70, 80, 90, 100]),
+            2: _beats(statuses=[1, 0, 0], pings=[5, None, None]),
+        }
+    )
+    monitor_stats = compute_monitor_stats(history=history)
+    assert monitor_stats["monitor_ids"].tolist() == [1, 2]
+    assert monitor_stats["beats"].tolist() == [10, 3]
+    assert monitor_stats["uptime"][0] == pytest.approx(70.0)
+    assert monitor_stats["incidents"].tolist() == [2, 1]
+    # Incidents lasted 120 and 60 seconds, the incident of monitor 2 isn't resolved.
+    assert monitor_stats["mttr"][0] == pytest.approx(90.0)
+    assert np.isnan(monitor_stats["mttr"][1])
+    assert monitor_stats["p50"][0] == pytest.approx(55.0)
+    assert monitor_stats["p95"][0] == pytest.approx(95.5)
+    assert monitor_stats["p99"][0] == pytest.approx(99.1)
+    assert monitor_stats["p50"][1] == pytest.approx(5.0)
+
+
+def test_history_from_beats_skips_unparsable_times():
+    beats = _beats(statuses=[1, 0, 1], pings=[10, 20, 30])
+    beats[1]["time"] = "not a time"
+    history = history_from_beats(beats_by_monitor={1: beats, 2: [{"time": None, "status": 1, "ping": 5}]})
+    assert history["monitor_ids"].tolist() == [1]
+    assert history["status"].tolist() == [1, 1]
+    assert history["ping"].tolist() == [10, 30]